@@ -292,8 +292,8 @@ async def main():
     if not APPLICATIONS:
         raise RuntimeError("No bots configured (no tokens found).")
 
-    from devdash_api import register_devdash_routes, ensure_tables, cors_middleware
-    webapp = web.Application(middlewares=[cors_middleware])
+    from devdash_api import register_devdash_routes, ensure_tables, cors_middleware, auth_middleware
+    webapp = web.Application(middlewares=[cors_middleware, auth_middleware])
     
     # Register miniapp routes for all bots
     if _register_content_miniapp_routes and "content" in APPLICATIONS:
@@ -3,21 +3,38 @@ import time
 import json
 import logging
 import hmac
+import gzip
 import hashlib
+import io
 import base64
 import asyncio
+import contextvars
+import csv
 import datetime
 import pathlib
+import platform
+import re
 import secrets
 import sys
+import tempfile
+import uuid
 sys.path.append(str(pathlib.Path(__file__).parent))  # lokales Modulverzeichnis sicherstellen
 import httpx
+import psutil
 from typing import Tuple, Dict, Any, List, Optional
 from aiohttp import web
-from psycopg_pool import ConnectionPool
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 from decimal import Decimal, getcontext
 import jwt
-from functools import partial
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial, wraps
+from itertools import islice
+from cachetools import TTLCache
+try:
+    import orjson
+except Exception:  # optional; fallback auf stdlib json
+    orjson = None
 try:
     from nacl.signing import VerifyKey
     from nacl.exceptions import BadSignatureError
@@ -36,7 +53,10 @@ if not DB_URL:
 SECRET_KEY = os.getenv("SECRET_KEY", "change-me")  # setze in Heroku!
 DEV_LOGIN_CODE = os.getenv("DEV_LOGIN_CODE")
 ALLOWED_ORIGINS = [o.strip() for o in os.getenv("ALLOWED_ORIGINS", "*").split(",") if o.strip()]
+_ALLOWED_SET = frozenset(ALLOWED_ORIGINS)
 BOT_TOKEN = os.getenv("BOT1_TOKEN") or os.getenv("BOT_TOKEN")  # Bot‑Token für Telegram-Login Verify
+# HMAC-Schlüssel für die Login-Signatur = sha256(bot_token); einmal beim Import statt pro Login
+_TG_SECRET = hashlib.sha256(BOT_TOKEN.encode()).digest() if BOT_TOKEN else b""
 
 if not BOT_TOKEN:
     log.warning("⚠️  BOT_TOKEN / BOT1_TOKEN nicht gesetzt! Telegram-Login wird fehlschlagen!")
@@ -46,42 +66,100 @@ else:
 TON_API_BASE   = os.getenv("TON_API_BASE", "https://tonapi.io")
 TON_API_KEY    = os.getenv("TON_API_KEY", "")
 
-pool = ConnectionPool(DB_URL, min_size=1, max_size=5, kwargs={"autocommit": True})
+# Ausgehende HTTP-Calls (TON-API, Bot-Mesh, Webhooks) teilen sich einen Client pro App -> Keep-Alive statt
+# TCP/TLS-Handshake pro Request. Timeouts pro Aufrufer hier zentral einstellbar.
+HTTP_TIMEOUTS = {
+    "ton": 10.0,
+    "mesh_health": 5.0,
+    "mesh_metrics": 8.0,
+    "webhook": 10.0,
+}
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=1000)
+
+# Monatliche RANGE-Partitionierung der Content-Log-Tabellen (einmalige Umstellung, daher opt-in)
+PARTITION_LOGS       = os.getenv("DEVDASH_PARTITION_LOGS", "0") == "1"
+LOG_RETENTION_MONTHS = int(os.getenv("DEVDASH_LOG_RETENTION_MONTHS", "0"))  # 0 = nichts droppen
+
+# Refresh-Intervall der vorberechneten Bot-Health-Übersicht (mv_bot_health)
+BOT_HEALTH_REFRESH_SEC = int(os.getenv("DEVDASH_BOT_HEALTH_REFRESH_SEC", "60"))
+# Refresh-Intervall der Rewards-Zusammenfassung (mv_rewards_summary); Stand steht als "as_of" im Payload
+CONTENT_MV_REFRESH_SEC = int(os.getenv("DEVDASH_CONTENT_MV_REFRESH_SEC", "300"))
+# Wartezeit nach dem Start, bevor Index-Builds im Hintergrund loslaufen (Port ist dann längst gebunden)
+DEFERRED_MAINTENANCE_DELAY_SEC = int(os.getenv("DEVDASH_DEFERRED_MAINTENANCE_DELAY_SEC", "10"))
+
+# Lese-Queries dieses Moduls sind feste SQL-Strings -> sofort server-seitig vorbereiten statt erst
+# nach psycopgs Auto-Threshold (5 Ausführungen pro Connection). Hinter PgBouncer (transaction mode) abschalten.
+PREPARE_STATEMENTS   = os.getenv("DEVDASH_PREPARE_STATEMENTS", "1") == "1"
+
+# Async-Pool direkt auf dem Event-Loop (kein Thread-Hop pro Query). min == max hält die Connections vorgewärmt.
+DB_POOL_MIN          = int(os.getenv("DEVDASH_DB_POOL_MIN", "4"))
+DB_POOL_MAX          = int(os.getenv("DEVDASH_DB_POOL_MAX", "20"))
+# gleichzeitige Connections aller /content/stats/all-Requests zusammen, damit der Fan-out
+# (8 Abschnitte mit je eigenen parallelen Queries) den Pool nicht für andere Handler leerzieht
+STATS_ALL_MAX_CONNS  = int(os.getenv("DEVDASH_STATS_ALL_MAX_CONNS", str(max(1, DB_POOL_MAX // 4))))
+
+# open=False: Öffnen braucht einen laufenden Event-Loop -> _open_pool() beim Start
+pool = AsyncConnectionPool(
+    DB_URL,
+    min_size=DB_POOL_MIN,
+    max_size=max(DB_POOL_MIN, DB_POOL_MAX),
+    kwargs={"autocommit": True, "row_factory": dict_row},
+    open=False,
+)
 
 # ------------------------------ helpers ------------------------------
 
 # ✔ Moderne, stabile Form – KEINE async-Factory!
 @web.middleware
 async def cors_middleware(request, handler):
-    # immer dynamisch per Origin entscheiden
-    cors = _cors_headers(request)
+    # immer dynamisch per Origin entscheiden; der Rest ist statisch
+    origin_headers = _cors_origin_headers(request.headers.get("Origin"))
     if request.method == "OPTIONS":
-        # sauberes Preflight mit allen nötigen Headern
-        resp = web.Response(status=204, headers=cors)
-        resp.headers["Vary"] = "Origin"
-        return resp
-    try:
-        resp = await handler(request)
-    except web.HTTPException as he:
-        resp = web.json_response({"error": he.reason}, status=he.status)
-    except Exception as e:
-        request.app.get('logger', None) and request.app['logger'].exception(f"[cors] unhandled error: {e}")
-        resp = web.json_response({"error": "internal_error"}, status=500)
-    if resp is None:
-        resp = web.json_response({"error":"empty_response"}, status=500)
+        # sauberes Preflight mit allen nötigen Headern; Browser cachen es CORS_MAX_AGE Sekunden
+        resp = web.Response(status=204, headers={"Access-Control-Max-Age": CORS_MAX_AGE})
+    else:
+        try:
+            resp = await handler(request)
+        except web.HTTPException as he:
+            resp = web.Response(body=_json_bytes({"error": he.reason}), status=he.status, content_type="application/json")
+        except Exception as e:
+            _log_exc("[cors] unhandled", e)
+            resp = web.Response(body=_json_bytes({"error": "internal_error"}), status=500, content_type="application/json")
+        if resp is None:
+            resp = web.Response(body=_json_bytes({"error": "empty_response"}), status=500, content_type="application/json")
     # CORS-Header immer hinzufügen (+ Vary)
     try:
-        for k, v in cors.items():
-            resp.headers[k] = v
-        resp.headers["Vary"] = "Origin"
+        resp.headers.update(origin_headers)
+        resp.headers.update(_CORS_STATIC)
     except Exception:
         pass
     return resp
 
+@web.middleware
+async def auth_middleware(request, handler):
+    # setzt nur request["user"], abgelehnt wird weiterhin im Handler via _auth_user()
+    auth = request.headers.get("Authorization", "")
+    if auth[:7].lower() == "bearer ":
+        try:
+            request["user"] = await _verify_bearer(auth[7:].strip())
+        except Exception:
+            pass
+    return await handler(request)
+
+# wenige, immer gleiche Frontend-Origins -> Ergebnis pro Origin merken
+@lru_cache(maxsize=256)
 def _allow_origin(origin: Optional[str]) -> str:
-    if not origin or "*" in ALLOWED_ORIGINS:
+    if not origin or "*" in _ALLOWED_SET:
         return "*"
-    return origin if origin in ALLOWED_ORIGINS else ALLOWED_ORIGINS[0]
+    return origin if origin in _ALLOWED_SET else ALLOWED_ORIGINS[0]
+
+# Credentials (Refresh-Cookie) nur für explizit freigegebene Origins – nie zusammen mit "*"
+@lru_cache(maxsize=256)
+def _cors_origin_headers(origin: Optional[str]) -> Tuple[Tuple[str, str], ...]:
+    allow = _allow_origin(origin)
+    if allow != "*" and allow == origin:
+        return (("Access-Control-Allow-Origin", allow), ("Access-Control-Allow-Credentials", "true"))
+    return (("Access-Control-Allow-Origin", allow),)
 
 # -------- Dev-Login (Code+Telegram-ID) für dich, liefert JWT --------
 async def dev_login(request: web.Request):
@@ -89,10 +167,10 @@ async def dev_login(request: web.Request):
     DEV LOGIN - Quick authentication for development/testing.
     
     Request: { "telegram_id": 123456, "code": "DEV_LOGIN_CODE", "username": "optional" }
-    Response: { "access_token": "jwt", "token_type": "bearer" }
+    Response: { "access_token": "jwt", "token_type": "bearer", "expires_in": 900, "refresh_token": "jwt" }
     """
     try:
-        body = await request.json()
+        body = await _read_json(request)
     except Exception as e:
         log.error(f"Failed to parse dev_login JSON: {e}")
         raise web.HTTPBadRequest(text="Invalid JSON")
@@ -121,7 +199,7 @@ async def dev_login(request: web.Request):
     log.info(f"✅ DEV_LOGIN SUCCESS for telegram_id={tg_id}")
     
     try:
-        await execute("""
+        row = await fetchrow("""
           insert into dashboard_users(telegram_id, username, role, tier)
           values (%s, %s, 'dev', 'pro')
           on conflict (telegram_id) do update set
@@ -129,26 +207,32 @@ async def dev_login(request: web.Request):
             role='dev',
             tier='pro',
             updated_at=now()
+          returning sso_jwt_version
         """, (tg_id, body.get("username")))
     except Exception as e:
         log.error(f"Database error in dev_login: {e}")
         raise web.HTTPInternalServerError(text="Database error")
     
-    tok = _jwt_issue(tg_id, role="dev", tier="pro")
-    return _json({"access_token": tok, "token_type": "bearer", "role": "dev", "tier": "pro"}, request)
+    return await _token_response(request, tg_id, "dev", "pro", row["sso_jwt_version"])
+
+# Preflight-Cache im Browser (Chrome deckelt bei 7200s, Firefox bei 86400s)
+CORS_MAX_AGE = os.getenv("CORS_MAX_AGE", "86400")
+
+# statischer Teil der CORS-Header, einmal beim Import gebaut
+_CORS_STATIC = (
+    ("Access-Control-Allow-Headers", "*, Authorization, Content-Type"),
+    ("Access-Control-Allow-Methods", "GET,POST,PUT,OPTIONS"),
+    ("Vary", "Origin, Accept-Encoding"),
+)
 
 def _cors_headers(request: web.Request) -> Dict[str, str]:
-    origin = request.headers.get("Origin")
-    allow_origin = _allow_origin(origin)
-    return {
-        "Access-Control-Allow-Origin": allow_origin,
-        "Access-Control-Allow-Headers": "*, Authorization, Content-Type",
-        "Access-Control-Allow-Methods": "GET,POST,PUT,OPTIONS",
-    }
+    headers = dict(_CORS_STATIC)
+    headers.update(_cors_origin_headers(request.headers.get("Origin")))
+    return headers
 
 async def set_ton_address(request: web.Request):
     user_id = await _auth_user(request)
-    body = await request.json()
+    body = await _read_json(request)
     address = (body.get("address") or "").strip()
     await execute("update dashboard_users set ton_address=%s, updated_at=now() where telegram_id=%s",
                   (address, user_id))
@@ -157,40 +241,119 @@ async def set_ton_address(request: web.Request):
 async def wallets_overview(request: web.Request):
     # Liefert Watch-Accounts (NEAR/TON) + eigene TON-Adresse (aus dashboard_users)
     user_id = await _auth_user(request)
-    me = await fetchrow("select near_account_id, ton_address from dashboard_users where telegram_id=%s", (user_id,))
-    watches = await fetch("select id,chain,account_id,label,meta,created_at from dashboard_watch_accounts order by id asc")
+    async with _db_session():
+        me = await fetchrow("select near_account_id, ton_address from dashboard_users where telegram_id=%s", (user_id,))
+        watches = await fetch("select id,chain,account_id,label,meta,created_at from dashboard_watch_accounts order by id asc")
     return _json({"me": me, "watch": watches}, request)
 
-async def _to_thread(func, *a, **kw):
-    return await asyncio.to_thread(func, *a, **kw)
+async def _open_pool(app: Optional[web.Application] = None) -> None:
+    # idempotent; auch als on_startup-Hook verwendbar
+    await pool.open()
+
+
+async def _close_pool(app: Optional[web.Application] = None) -> None:
+    await pool.close()
+
+
+async def _open_http(app: web.Application) -> None:
+    app["http"] = httpx.AsyncClient(timeout=httpx.Timeout(5.0, connect=2.0), limits=HTTP_LIMITS)
+
+
+async def _close_http(app: web.Application) -> None:
+    cx = app.get("http")
+    if cx is not None:
+        await cx.aclose()
+
+
+_fallback_http: Optional[httpx.AsyncClient] = None
+
+
+def _http(request: web.Request) -> httpx.AsyncClient:
+    # Fallback, falls die App ohne register_devdash_routes (und damit ohne on_startup-Hook) läuft;
+    # die laufende App selbst ist eingefroren und darf nicht mehr beschrieben werden
+    global _fallback_http
+    cx = request.app.get("http")
+    if cx is not None:
+        return cx
+    if _fallback_http is None or _fallback_http.is_closed:
+        _fallback_http = httpx.AsyncClient(timeout=httpx.Timeout(5.0, connect=2.0), limits=HTTP_LIMITS)
+    return _fallback_http
+
+
+# None = psycopg-Default (Auto-Prepare ab prepare_threshold)
+_PREPARE: Optional[bool] = True if PREPARE_STATEMENTS else None
+
+
+# Connection, die sich aufeinanderfolgende Queries eines Requests teilen (siehe _db_session)
+_request_conn: contextvars.ContextVar = contextvars.ContextVar("devdash_request_conn", default=None)
+
 
+@asynccontextmanager
+async def _db_session():
+    """Eine Pool-Connection für alle Queries im Block statt Checkout pro Query (nur für sequentielle Abläufe)."""
+    if _request_conn.get() is not None:
+        yield
+        return
+    async with pool.connection() as con:
+        token = _request_conn.set(con)
+        try:
+            yield
+        finally:
+            _request_conn.reset(token)
+
+
+# optionale Obergrenze für Pool-Checkouts im aktuellen Kontext (vererbt sich an gather-Tasks)
+_conn_limit: contextvars.ContextVar = contextvars.ContextVar("devdash_conn_limit", default=None)
+_stats_all_sem = asyncio.Semaphore(STATS_ALL_MAX_CONNS)
+
+
+@asynccontextmanager
+async def _connection():
+    con = _request_conn.get()
+    if con is not None:
+        yield con
+        return
+    limit = _conn_limit.get()
+    if limit is None:
+        async with pool.connection() as con:
+            yield con
+    else:
+        # Permit nur für die Dauer einer Query halten -> verschachtelte gathers können nicht verklemmen
+        async with limit, pool.connection() as con:
+            yield con
 
-def _fetch(sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
-    with pool.connection() as con, con.cursor() as cur:
-        cur.execute(sql, params)
-        cols = [c.name for c in cur.description] if cur.description else []
-        rows = cur.fetchall() if cur.description else []
-        return [dict(zip(cols, r)) for r in rows]
 
+async def fetch(sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+    async with _connection() as con, con.cursor() as cur:
+        await cur.execute(sql, params, prepare=_PREPARE)
+        return await cur.fetchall() if cur.description else []
 
-def _fetchrow(sql: str, params: Tuple = ()) -> Optional[Dict[str, Any]]:
-    with pool.connection() as con, con.cursor() as cur:
-        cur.execute(sql, params)
-        row = cur.fetchone()
-        if not row:
-            return None
-        cols = [c.name for c in cur.description]
-        return dict(zip(cols, row))
 
+async def fetchrow(sql: str, params: Tuple = ()) -> Optional[Dict[str, Any]]:
+    async with _connection() as con, con.cursor() as cur:
+        await cur.execute(sql, params, prepare=_PREPARE)
+        return await cur.fetchone()
 
-def _execute(sql: str, params: Tuple = ()) -> None:
-    with pool.connection() as con, con.cursor() as cur:
-        cur.execute(sql, params)
 
+async def execute(sql: str, params: Tuple = ()) -> None:
+    async with _connection() as con, con.cursor() as cur:
+        await cur.execute(sql, params)
 
-async def fetch(sql: str, params: Tuple = ()): return await _to_thread(_fetch, sql, params)
-async def fetchrow(sql: str, params: Tuple = ()): return await _to_thread(_fetchrow, sql, params)
-async def execute(sql: str, params: Tuple = ()): return await _to_thread(_execute, sql, params)
+
+async def executemany(sql: str, params_seq: List[Tuple]) -> None:
+    # psycopg schickt die Statements gepipelined über eine Connection; eine Transaktion = ein Commit/WAL-Flush
+    async with pool.connection() as con, con.transaction(), con.cursor() as cur:
+        await cur.executemany(sql, params_seq)
+
+
+async def fetch_iter(sql: str, params: Tuple = (), batch: int = 200):
+    """Zeilen über einen serverseitigen Cursor batchweise liefern (für Streaming-Responses)."""
+    async with pool.connection() as con, con.transaction():
+        async with con.cursor(name=f"devdash_stream_{secrets.token_hex(4)}") as cur:
+            cur.itersize = batch
+            await cur.execute(sql, params)
+            async for row in cur:
+                yield row
 
 
 # --------------------------- bootstrap tables ---------------------------
@@ -267,8 +430,307 @@ create table if not exists dashboard_token_events (
 );
 """
 
+# Tages-Rollups für Content-Bot-Statistiken (per INSERT-Trigger inkrementell gepflegt),
+# damit Retention/Network nicht bei jedem Aufruf message_logs/member_events scannen.
+ROLLUP_SQL = """
+-- Backfill-Stand je Rollup (siehe ROLLUP_BACKFILL): ab cutoff zählen die Trigger, ältere Zeilen
+-- übernimmt _backfill_rollups tageweise rückwärts; next_before ist die Obergrenze des nächsten Tages
+create table if not exists rollup_backfill_state (
+  rollup      text        primary key,
+  cutoff      timestamptz not null,
+  next_before timestamptz not null,
+  done        boolean     not null default false
+);
+
+-- muss vor den create table stehen: nur neu angelegte Rollups brauchen einen Backfill
+insert into rollup_backfill_state (rollup, cutoff, next_before, done)
+select r, now(), now(), to_regclass(r) is not null
+from unnest(array['rollup_msgs_daily', 'rollup_msgs_hourly', 'rollup_member_events_daily', 'rollup_ai_mod_daily']) r
+on conflict (rollup) do nothing;
+
+create table if not exists rollup_msgs_daily (
+  day     date   not null,
+  chat_id bigint not null,
+  user_id bigint not null,
+  msgs    integer not null default 0,
+  primary key (day, chat_id, user_id)
+);
+
+-- stündliche Nachrichten je Gruppe für die rollierenden 24h/7d/30d-Fenster (älter als 30 Tage wird gelöscht)
+create table if not exists rollup_msgs_hourly (
+  chat_id bigint      not null,
+  bucket  timestamptz not null,
+  cnt     integer     not null default 0,
+  primary key (chat_id, bucket)
+);
+
+create table if not exists rollup_member_events_daily (
+  day        date   not null,
+  chat_id    bigint not null,
+  event_type text   not null,
+  cnt        integer not null default 0,
+  primary key (day, chat_id, event_type)
+);
+
+create table if not exists rollup_ai_mod_daily (
+  day       date   not null,
+  chat_id   bigint not null,
+  category  text   not null,
+  action    text   not null,
+  cnt       integer not null default 0,
+  scored    integer not null default 0,           -- Zeilen mit score (Nenner für avg_score)
+  score_sum double precision not null default 0,
+  primary key (day, chat_id, category, action)
+);
+
+create or replace function rollup_msgs_daily_ins() returns trigger language plpgsql as $$
+begin
+  if new.chat_id is not null and new.user_id is not null then
+    insert into rollup_msgs_daily (day, chat_id, user_id, msgs)
+    values ((coalesce(new."timestamp", now()) at time zone 'UTC')::date, new.chat_id, new.user_id, 1)
+    on conflict (day, chat_id, user_id) do update set msgs = rollup_msgs_daily.msgs + 1;
+  end if;
+  if new.chat_id is not null then
+    insert into rollup_msgs_hourly (chat_id, bucket, cnt)
+    values (new.chat_id, date_trunc('hour', coalesce(new."timestamp", now())), 1)
+    on conflict (chat_id, bucket) do update set cnt = rollup_msgs_hourly.cnt + 1;
+  end if;
+  return null;
+end $$;
+
+create or replace function rollup_member_events_daily_ins() returns trigger language plpgsql as $$
+begin
+  if new.chat_id is not null and new.event_type is not null then
+    insert into rollup_member_events_daily (day, chat_id, event_type, cnt)
+    values ((coalesce(new.ts, now()) at time zone 'UTC')::date, new.chat_id, new.event_type, 1)
+    on conflict (day, chat_id, event_type) do update set cnt = rollup_member_events_daily.cnt + 1;
+  end if;
+  return null;
+end $$;
+
+create or replace function rollup_ai_mod_daily_ins() returns trigger language plpgsql as $$
+begin
+  if new.chat_id is not null and new.category is not null then
+    insert into rollup_ai_mod_daily (day, chat_id, category, action, cnt, scored, score_sum)
+    values ((coalesce(new.ts, now()) at time zone 'UTC')::date, new.chat_id, new.category, coalesce(new.action, ''),
+            1, (new.score is not null)::int, coalesce(new.score, 0))
+    on conflict (day, chat_id, category, action) do update
+      set cnt       = rollup_ai_mod_daily.cnt + 1,
+          scored    = rollup_ai_mod_daily.scored + excluded.scored,
+          score_sum = rollup_ai_mod_daily.score_sum + excluded.score_sum;
+  end if;
+  return null;
+end $$;
+
+drop trigger if exists trg_rollup_msgs_daily on message_logs;
+create trigger trg_rollup_msgs_daily after insert on message_logs
+  for each row execute function rollup_msgs_daily_ins();
+
+drop trigger if exists trg_rollup_member_events_daily on member_events;
+create trigger trg_rollup_member_events_daily after insert on member_events
+  for each row execute function rollup_member_events_daily_ins();
+
+drop trigger if exists trg_rollup_ai_mod_daily on ai_mod_logs;
+create trigger trg_rollup_ai_mod_daily after insert on ai_mod_logs
+  for each row execute function rollup_ai_mod_daily_ins();
+"""
+
+# Rollup -> (Quelltabelle, Zeitspalte, Horizont, Batch-SQL). Ein Batch zählt die Quellzeilen aus [lo, hi)
+# und addiert sie per ON CONFLICT ... DO UPDATE auf die Werte, die die Trigger seit cutoff schon eingetragen haben.
+ROLLUP_BACKFILL = {
+    "rollup_msgs_daily": ("message_logs", '"timestamp"', None, """
+        insert into rollup_msgs_daily (day, chat_id, user_id, msgs)
+        select ("timestamp" at time zone 'UTC')::date, chat_id, user_id, count(*)
+        from message_logs
+        where chat_id is not null and user_id is not null and "timestamp" >= %s and "timestamp" < %s
+        group by 1, 2, 3
+        on conflict (day, chat_id, user_id) do update set msgs = rollup_msgs_daily.msgs + excluded.msgs
+    """),
+    # Stunden-Buckets braucht nur das 30-Tage-Fenster
+    "rollup_msgs_hourly": ("message_logs", '"timestamp"', datetime.timedelta(days=30), """
+        insert into rollup_msgs_hourly (chat_id, bucket, cnt)
+        select chat_id, date_trunc('hour', "timestamp"), count(*)
+        from message_logs
+        where chat_id is not null and "timestamp" >= %s and "timestamp" < %s
+        group by 1, 2
+        on conflict (chat_id, bucket) do update set cnt = rollup_msgs_hourly.cnt + excluded.cnt
+    """),
+    "rollup_member_events_daily": ("member_events", "ts", None, """
+        insert into rollup_member_events_daily (day, chat_id, event_type, cnt)
+        select (ts at time zone 'UTC')::date, chat_id, event_type, count(*)
+        from member_events
+        where chat_id is not null and event_type is not null and ts >= %s and ts < %s
+        group by 1, 2, 3
+        on conflict (day, chat_id, event_type) do update set cnt = rollup_member_events_daily.cnt + excluded.cnt
+    """),
+    "rollup_ai_mod_daily": ("ai_mod_logs", "ts", None, """
+        insert into rollup_ai_mod_daily (day, chat_id, category, action, cnt, scored, score_sum)
+        select (ts at time zone 'UTC')::date, chat_id, category, coalesce(action, ''),
+               count(*), count(score), coalesce(sum(score), 0)
+        from ai_mod_logs
+        where chat_id is not null and category is not null and ts >= %s and ts < %s
+        group by 1, 2, 3, 4
+        on conflict (day, chat_id, category, action) do update
+          set cnt       = rollup_ai_mod_daily.cnt + excluded.cnt,
+              scored    = rollup_ai_mod_daily.scored + excluded.scored,
+              score_sum = rollup_ai_mod_daily.score_sum + excluded.score_sum
+    """),
+}
+
+# rewards_pending/rewards_claims werden per UPDATE umgebucht (Status, Punkte) -> kein Insert-Rollup,
+# sondern eine einzeilige Materialized View, die _content_mv_refresh_loop periodisch auffrischt.
+# singleton trägt den UNIQUE-Index, den REFRESH ... CONCURRENTLY verlangt.
+REWARDS_SUMMARY_SQL = """
+select
+    true as singleton,
+    now() as refreshed_at,
+    p.total_points_pending, p.holders,
+    c.pending_claims, c.pending_amount, c.pending_claimants,
+    c.claimed_total, c.unique_claimants, c.total_claims
+from (
+    select coalesce(sum(points), 0)::float8 as total_points_pending,
+           count(*) filter (where points > 0) as holders
+    from rewards_pending
+) p
+cross join (
+    select count(*) filter (where status = 'pending') as pending_claims,
+           coalesce(sum(amount) filter (where status = 'pending'), 0)::float8 as pending_amount,
+           count(distinct user_id) filter (where status = 'pending') as pending_claimants,
+           coalesce(sum(amount) filter (where status = 'paid'), 0)::float8 as claimed_total,
+           count(distinct user_id) as unique_claimants,
+           count(*) as total_claims
+    from rewards_claims
+) c
+"""
+
+# Indizes passend zu den Zeitfenster-Prädikaten der Content-Statistiken (name, tabelle, definition)
+CONTENT_STATS_INDEXES = [
+    ("idx_msglogs_ts_brin", "message_logs", 'USING BRIN ("timestamp") WITH (pages_per_range = 32)'),
+    # gleicher Name/gleiche Definition wie im Content-Bot (bots/content/database.py) -> wird mitbenutzt, nicht dupliziert
+    ("idx_message_logs_chat_ts", "message_logs", '(chat_id, "timestamp" DESC)'),
+    # complete_stats top_talkers: GROUP BY user_id je chat_id als sortierter Index-Only-Scan
+    ("idx_msglogs_chat_user", "message_logs", "(chat_id, user_id)"),
+    # Rollup-Backfill: Tages-Batches über member_events.ts
+    ("idx_member_events_ts_brin", "member_events", "USING BRIN (ts) WITH (pages_per_range = 32)"),
+    ("idx_ai_mod_logs_ts_cat", "ai_mod_logs", "(ts) INCLUDE (category, action, score)"),
+    # strikes_today / strikes_24h: Zeitfenster auf user_strike_events
+    ("idx_user_strike_events_ts", "user_strike_events", "(ts)"),
+    # system_health: max(created_at) je Tabelle als Index-Lookup statt Scan
+    ("idx_dashboard_users_created", "dashboard_users", "(created_at)"),
+    ("idx_dashboard_bots_created", "dashboard_bots", "(created_at)"),
+    ("idx_adv_campaigns_created", "adv_campaigns", "(created_at)"),
+    # system_health/monitoring: count(*) ... where is_active/enabled als Index-Only-Scan über die kleine Teilmenge
+    ("idx_dashboard_bots_active", "dashboard_bots", "(is_active) WHERE is_active"),
+    ("idx_adv_campaigns_enabled", "adv_campaigns", "(enabled) WHERE enabled"),
+    # token_events_list: Keyset-Paginierung über happened_at (mit und ohne kind-Filter)
+    ("idx_tok_ev_ts_id", "dashboard_token_events", "(happened_at DESC, id DESC)"),
+    ("idx_tok_ev_kind_ts_id", "dashboard_token_events", "(kind, happened_at DESC, id DESC)"),
+    # bot_details_overview: Top-Kurse / Top-Referrer gruppieren über die Fremdschlüssel
+    ("idx_learning_enrollments_course", "learning_enrollments", "(course_id)"),
+    ("idx_aff_referrals_referrer", "aff_referrals", "(referrer_id)"),
+    # bot_detailed_info / bot_activity: order by updated_at desc
+    ("idx_dashboard_bots_updated", "dashboard_bots", "(updated_at DESC)"),
+    # ad_performance_report / ad_roi_analysis: Events je Kampagne und Typ
+    ("idx_adv_campaigns_events_campaign_type", "adv_campaigns_events", "(campaign_id, event_type)"),
+    # story_share: ILIKE mit führendem Wildcard -> partieller Index über genau die gezählten Zeilen
+    ("idx_rewards_claims_paid_click", "rewards_claims", "(user_id) WHERE status = 'paid' AND description ILIKE '%%click%%'"),
+]
+
+# früher angelegte Indizes, die inzwischen durch einen anderen abgedeckt sind
+CONTENT_STATS_OBSOLETE_INDEXES = (
+    "idx_msglogs_chat_ts",  # Duplikat von idx_message_logs_chat_ts (+ INCLUDE user_id)
+)
+
+# Tabelle -> Zeitspalte (Partition Key)
+PARTITIONED_LOG_TABLES = {
+    "message_logs": "timestamp",
+    "member_events": "ts",
+    "ai_mod_logs": "ts",
+    "user_strike_events": "ts",
+}
+
+# Helfer für die Partitionierung. Bestehende Daten bleiben als DEFAULT-Partition
+# (<tabelle>_default) erhalten, neue Zeilen landen in Monatspartitionen <tabelle>_pYYYYMM.
+# '%%' weil execute() den Text als Query mit Parametern an psycopg übergibt.
+PARTITION_SQL = """
+create or replace function devdash_partition_log_table(tbl text, col text) returns boolean
+language plpgsql as $$
+declare
+  legacy text := tbl || '_default';
+  bound  timestamptz;
+  r      record;
+begin
+  if to_regclass(tbl) is null or (select relkind from pg_class where oid = to_regclass(tbl)) = 'p' then
+    return false;
+  end if;
+
+  execute format('lock table %%I in access exclusive mode', tbl);
+  execute format('alter table %%I rename to %%I', tbl, legacy);
+  execute format('create table %%I (like %%I including defaults including constraints) partition by range (%%I)',
+                 tbl, legacy, col);
+
+  -- Indizes auf der Eltern-Tabelle anlegen; beim ATTACH werden die vorhandenen wiederverwendet
+  for r in select pg_get_indexdef(indexrelid) as def from pg_index
+           where indrelid = to_regclass(legacy) and not indisunique loop
+    execute regexp_replace(r.def, '^CREATE INDEX \\S+ ON \\S+', format('CREATE INDEX ON %%I', tbl));
+  end loop;
+
+  -- Trigger (z.B. Rollups) auf die Eltern-Tabelle umziehen, sonst feuern sie doppelt
+  for r in select tgname, pg_get_triggerdef(oid) as def from pg_trigger
+           where tgrelid = to_regclass(legacy) and not tgisinternal loop
+    execute format('drop trigger %%I on %%I', r.tgname, legacy);
+    execute regexp_replace(r.def, ' ON \\S+ ', format(' ON %%I ', tbl));
+  end loop;
+
+  -- CHECK begrenzt die Default-Partition, damit neue Monatspartitionen sie nicht scannen müssen
+  execute format('select greatest(date_trunc(''month'', now()), date_trunc(''month'', max(%%I))) + interval ''1 month'' from %%I',
+                 col, legacy) into bound;
+  execute format('alter table %%I add constraint %%I check (%%I < %%L)', legacy, legacy || '_bound', col, bound);
+  execute format('alter table %%I attach partition %%I default', tbl, legacy);
+  return true;
+end $$;
+
+create or replace function devdash_ensure_log_partitions(tbl text, months_ahead int, retention_months int)
+returns void language plpgsql as $$
+declare
+  m     int;
+  start timestamptz;
+  part  text;
+  r     record;
+begin
+  if to_regclass(tbl) is null or (select relkind from pg_class where oid = to_regclass(tbl)) <> 'p' then
+    return;
+  end if;
+
+  for m in 0..months_ahead loop
+    start := date_trunc('month', now()) + make_interval(months => m);
+    part  := tbl || '_p' || to_char(start, 'YYYYMM');
+    if to_regclass(part) is null then
+      begin
+        execute format('create table %%I partition of %%I for values from (%%L) to (%%L)',
+                       part, tbl, start, start + interval '1 month');
+      exception when others then
+        -- z.B. Monat liegt noch im Bereich der Default-Partition
+        raise notice 'partition %% skipped: %%', part, sqlerrm;
+      end;
+    end if;
+  end loop;
+
+  if retention_months > 0 then
+    for r in select c.relname from pg_inherits i join pg_class c on c.oid = i.inhrelid
+             where i.inhparent = to_regclass(tbl) and c.relname ~ ('^' || tbl || '_p[0-9]{6}$') loop
+      if to_date(right(r.relname, 6), 'YYYYMM') < date_trunc('month', now()) - make_interval(months => retention_months) then
+        execute format('drop table %%I', r.relname);
+      end if;
+    end loop;
+  end if;
+end $$;
+"""
+
+
 async def ensure_tables():
     log.info("🔧 Starting table initialization...")
+    await _open_pool()
     try:
         # users (singular → plural fix)
         await execute("""
@@ -300,6 +762,10 @@ async def ensure_tables():
             else:
                 log.warning("⚠️  Could not add ton_address column: %s", e)
 
+        # Token-Version für Widerruf (siehe _verify_bearer)
+        await execute("ALTER TABLE dashboard_users ADD COLUMN IF NOT EXISTS sso_jwt_version INT NOT NULL DEFAULT 0")
+        await _user_cols(refresh=True)
+
         # bots (enabled → is_active fix)
         await execute("""
         CREATE TABLE IF NOT EXISTS dashboard_bots (
@@ -332,6 +798,30 @@ async def ensure_tables():
         """)
         log.info("✅ dashboard_bot_endpoints table ready")
 
+        # outgoing webhooks (webhook_create / webhook_test)
+        await execute("""
+        CREATE TABLE IF NOT EXISTS dashboard_webhooks (
+            id             BIGSERIAL PRIMARY KEY,
+            event_type     TEXT NOT NULL,
+            url            TEXT NOT NULL,
+            secret         TEXT,
+            is_active      BOOLEAN DEFAULT TRUE,
+            last_triggered TIMESTAMPTZ,
+            failure_count  INTEGER DEFAULT 0,
+            created_at     TIMESTAMPTZ DEFAULT NOW()
+        );
+        """)
+        await execute("CREATE INDEX IF NOT EXISTS idx_dashboard_webhooks_event ON dashboard_webhooks(event_type) WHERE is_active")
+        log.info("✅ dashboard_webhooks table ready")
+
+        # vorberechnete Bot-Health-Übersicht; UNIQUE-Index erlaubt REFRESH ... CONCURRENTLY
+        try:
+            await execute(f"CREATE MATERIALIZED VIEW IF NOT EXISTS mv_bot_health AS {BOT_HEALTH_SQL}")
+            await execute("CREATE UNIQUE INDEX IF NOT EXISTS mv_bot_health_username ON mv_bot_health(username)")
+            log.info("✅ mv_bot_health ready")
+        except Exception as e:
+            log.warning("⚠️  Could not create mv_bot_health: %s", e)
+
         # watchlist for wallet pages
         await execute("""
         CREATE TABLE IF NOT EXISTS dashboard_watch_accounts (
@@ -375,6 +865,36 @@ async def ensure_tables():
         ON CONFLICT (chain, account_id) DO NOTHING;
         """)
         log.info("✅ All tables initialized successfully")
+
+        if PARTITION_LOGS:
+            try:
+                await execute(PARTITION_SQL)
+                for tbl, col in PARTITIONED_LOG_TABLES.items():
+                    row = await fetchrow("select devdash_partition_log_table(%s, %s) as converted", (tbl, col))
+                    if row and row["converted"]:
+                        log.info("✅ %s auf Monatspartitionen umgestellt", tbl)
+                await _ensure_log_partitions()
+                log.info("✅ Log partitions ready")
+            except Exception as e:
+                log.warning("⚠️  Could not partition log tables: %s", e)
+
+        # Indizes für die Content-Statistiken baut _deferred_maintenance nach dem Start im Hintergrund
+
+        # Rollups brauchen die Content-Bot-Tabellen (message_logs, member_events)
+        try:
+            await execute(ROLLUP_SQL)
+            log.info("✅ Content rollup tables + triggers ready")
+        except Exception as e:
+            log.warning("⚠️  Could not set up content rollups: %s", e)
+
+        try:
+            # WITH NO DATA: befüllt wird im Hintergrund (_populate_rewards_summary), bis dahin rechnet
+            # _rewards_summary live
+            await execute(f"CREATE MATERIALIZED VIEW IF NOT EXISTS mv_rewards_summary AS {REWARDS_SUMMARY_SQL} WITH NO DATA")
+            await execute("CREATE UNIQUE INDEX IF NOT EXISTS mv_rewards_summary_singleton ON mv_rewards_summary(singleton)")
+            log.info("✅ mv_rewards_summary ready")
+        except Exception as e:
+            log.warning("⚠️  Could not create mv_rewards_summary: %s", e)
         
         # adv_campaigns Schema wird vom ads.py Modul erstellt
         try:
@@ -384,61 +904,241 @@ async def ensure_tables():
     except Exception as e:
         log.error("❌ Error during table initialization: %s", e, exc_info=True)
 
-async def _telegram_getme(token: str) -> dict:
-    async with httpx.AsyncClient(timeout=10.0) as cx:
-        r = await cx.get(f"https://api.telegram.org/bot{token}/getMe")
-        r.raise_for_status()
-        data = r.json()
-        if not data.get("ok"):
-            raise RuntimeError(f"getMe failed: {data}")
-        return data["result"]
+async def _ensure_log_partitions():
+    """Legt die nächsten Monatspartitionen an und droppt abgelaufene (ersetzt einen pg_cron-Job)."""
+    for tbl in PARTITIONED_LOG_TABLES:
+        await execute("select devdash_ensure_log_partitions(%s, %s, %s)", (tbl, 2, LOG_RETENTION_MONTHS))
+
+
+async def _partition_maintenance_loop():
+    while True:
+        await asyncio.sleep(6 * 3600)
+        try:
+            await _ensure_log_partitions()
+        except Exception as e:
+            log.warning("⚠️  Partition maintenance failed: %s", e)
+
+
+async def _start_partition_maintenance(app: web.Application):
+    app["_devdash_partition_task"] = asyncio.create_task(_partition_maintenance_loop())
+
+
+async def _stop_partition_maintenance(app: web.Application):
+    task = app.get("_devdash_partition_task")
+    if task:
+        task.cancel()
+
+
+_BOT_KEY_RE = re.compile(r'BOT[0-9A-Z_]*_TOKEN')
+
+
+async def _telegram_getme(cx: httpx.AsyncClient, token: str) -> dict:
+    r = await cx.get(f"https://api.telegram.org/bot{token}/getMe")
+    r.raise_for_status()
+    data = r.json()
+    if not data.get("ok"):
+        raise RuntimeError(f"getMe failed: {data}")
+    return data["result"]
 
 async def scan_env_bots() -> int:
     """
     Pick up all BOT*_TOKEN envs, call getMe, upsert into dashboard_bots.
     """
-    import re
-    added = 0
+    pairs = []
     for key, token in os.environ.items():
-        if not re.fullmatch(r'BOT[0-9A-Z_]*_TOKEN', key):
+        if not _BOT_KEY_RE.fullmatch(key):
             continue
         token = (token or '').strip()
-        if not token:
+        if token:
+            pairs.append((key, token))
+    if not pairs:
+        log.info("Bot auto-discovery completed (0).")
+        return 0
+
+    # alle getMe parallel über einen Client (eine TLS-Verbindung statt Handshake pro Bot)
+    async with httpx.AsyncClient(timeout=10.0, limits=httpx.Limits(max_connections=20)) as cx:
+        results = await asyncio.gather(*[_telegram_getme(cx, token) for _, token in pairs],
+                                       return_exceptions=True)
+
+    rows = []
+    for (key, _), me in zip(pairs, results):
+        if isinstance(me, BaseException):
+            log.error("scan_env_bots ERROR for %s: %s", key, me, exc_info=me)
             continue
-        try:
-            me = await _telegram_getme(token)
-            log.info(f"🤖 Bot detected from {key}: {me}")
-            
-            username = me.get("username") or me.get("first_name") or key
-            title    = me.get("first_name") or username
+        log.info(f"🤖 Bot detected from {key}: {me}")
 
-            log.info(f"📝 Inserting: username={username}, title={title}, env_token_key={key}")
-            
-            await execute("""
-                INSERT INTO dashboard_bots (username, title, env_token_key, is_active, meta)
-                VALUES (%s, %s, %s, TRUE, '{}'::jsonb)
-                ON CONFLICT (username) DO UPDATE
-                SET title = EXCLUDED.title,
-                    env_token_key = EXCLUDED.env_token_key,
-                    is_active = TRUE,
-                    updated_at = NOW();
-            """, (username, title, key))
-            added += 1
-            log.info(f"✅ Bot '{username}' registered")
-        except Exception as e:
-            log.error("scan_env_bots ERROR for %s: %s", key, e, exc_info=True)
-    log.info("Bot auto-discovery completed (%d).", added)
-    return added
+        username = me.get("username") or me.get("first_name") or key
+        title    = me.get("first_name") or username
+
+        log.info(f"📝 Inserting: username={username}, title={title}, env_token_key={key}")
+        rows.append((username, title, key))
+
+    if not rows:
+        log.info("Bot auto-discovery completed (0).")
+        return 0
+    try:
+        await executemany("""
+            INSERT INTO dashboard_bots (username, title, env_token_key, is_active, meta)
+            VALUES (%s, %s, %s, TRUE, '{}'::jsonb)
+            ON CONFLICT (username) DO UPDATE
+            SET title = EXCLUDED.title,
+                env_token_key = EXCLUDED.env_token_key,
+                is_active = TRUE,
+                updated_at = NOW();
+        """, rows)
+    except Exception as e:
+        log.error("scan_env_bots upsert failed: %s", e, exc_info=True)
+        return 0
+    for username, _, _ in rows:
+        log.info(f"✅ Bot '{username}' registered")
+    log.info("Bot auto-discovery completed (%d).", len(rows))
+    return len(rows)
 
 # ------------------------------ tokens (JWT) ------------------------------
-def _jwt_issue(telegram_id: int, role: str = "dev", tier: str = "pro") -> str:
-    payload = {"sub": str(telegram_id), "role": role, "tier": tier,
-               "exp": datetime.datetime.utcnow() + datetime.timedelta(days=7)}
-    return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+# Kurzlebige Access-Tokens + langlebiges Refresh-Token. Widerruf aller Tokens eines Users:
+#   update dashboard_users set sso_jwt_version = sso_jwt_version + 1 where telegram_id = ...
+ACCESS_TOKEN_TTL_MIN   = int(os.getenv("DEVDASH_ACCESS_TOKEN_TTL_MIN", "15"))
+REFRESH_TOKEN_TTL_DAYS = int(os.getenv("DEVDASH_REFRESH_TOKEN_TTL_DAYS", "30"))
+REFRESH_COOKIE = "devdash_refresh"
+
+# Schlanker HS256-Pfad statt PyJWT (ein Key, ein Algorithmus): kein Algorithmus-Registry-/Options-Overhead.
+# Format bleibt Standard-JWT, PyJWT-Tokens sind kompatibel; Fehler sind weiterhin jwt.*-Exceptions.
+_JWT_KEY = SECRET_KEY.encode()
+_JWT_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+def _b64url_decode(seg: bytes) -> bytes:
+    return base64.urlsafe_b64decode(seg + b"=" * (-len(seg) % 4))
+
+def _hs256_encode(payload: Dict[str, Any]) -> str:
+    body = base64.urlsafe_b64encode(_json_bytes(payload)).rstrip(b"=")
+    signing_input = _JWT_HEADER_B64 + b"." + body
+    sig = base64.urlsafe_b64encode(hmac.new(_JWT_KEY, signing_input, hashlib.sha256).digest()).rstrip(b"=")
+    return (signing_input + b"." + sig).decode("ascii")
+
+def _hs256_decode(token: str) -> Dict[str, Any]:
+    try:
+        raw = token.encode("ascii")
+        signing_input, sig = raw.rsplit(b".", 1)
+        header, body = signing_input.split(b".")
+        if header != _JWT_HEADER_B64 and _json_loads(_b64url_decode(header)).get("alg") != "HS256":
+            raise jwt.InvalidAlgorithmError("only HS256 is accepted")
+        expected = hmac.new(_JWT_KEY, signing_input, hashlib.sha256).digest()
+        sig_ok = hmac.compare_digest(expected, _b64url_decode(sig))
+        data = _json_loads(_b64url_decode(body)) if sig_ok else None
+    except jwt.InvalidTokenError:
+        raise
+    except Exception as e:
+        raise jwt.DecodeError(f"invalid token: {e}")
+    if not sig_ok:
+        raise jwt.InvalidSignatureError("Signature verification failed")
+    if not isinstance(data, dict):
+        raise jwt.DecodeError("invalid payload")
+    exp = data.get("exp")
+    if exp is not None and float(exp) <= time.time():
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    return data
+
+def _jwt_issue(telegram_id: int, role: str = "dev", tier: str = "pro", ver: int = 0) -> str:
+    payload = {"sub": str(telegram_id), "role": role, "tier": tier, "ver": ver,
+               "exp": int(time.time()) + ACCESS_TOKEN_TTL_MIN * 60}
+    return _hs256_encode(payload)
+
+def _refresh_issue(telegram_id: int, ver: int = 0) -> str:
+    payload = {"sub": str(telegram_id), "typ": "refresh", "ver": ver,
+               "exp": int(time.time()) + REFRESH_TOKEN_TTL_DAYS * 86400}
+    return _hs256_encode(payload)
+
+# sha256(token) -> (telegram_id, exp, ver); erspart das HS256-Decoding bei jedem der vielen Dashboard-Requests.
+# Nur erfolgreich verifizierte Tokens landen im Cache, ein Treffer gilt höchstens bis exp.
+_JWT_CACHE_TTL = 60
+_jwt_cache: TTLCache = TTLCache(maxsize=10000, ttl=_JWT_CACHE_TTL)
+
+def _jwt_verify(token: str) -> Tuple[int, int]:
+    """Access-Token prüfen -> (telegram_id, ver). Refresh-Tokens gelten hier nicht."""
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+    hit = _jwt_cache.get(key)
+    if hit and hit[1] > now:
+        return hit[0], hit[2]
+    data = _hs256_decode(token)
+    if data.get("typ") == "refresh":
+        raise jwt.InvalidTokenError("refresh token cannot be used as access token")
+    sub, ver = int(data.get("sub")), int(data.get("ver") or 0)
+    _jwt_cache[key] = (sub, float(data.get("exp") or now + _JWT_CACHE_TTL), ver)
+    return sub, ver
+
+# telegram_id -> sso_jwt_version; ein Widerruf greift spätestens nach dieser TTL
+_jwt_ver_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+
+async def _user_jwt_version(telegram_id: int, fresh: bool = False) -> int:
+    if not fresh:
+        ver = _jwt_ver_cache.get(telegram_id)
+        if ver is not None:
+            return ver
+    row = await fetchrow("select sso_jwt_version from dashboard_users where telegram_id=%s", (telegram_id,))
+    ver = row["sso_jwt_version"] if row else 0
+    _jwt_ver_cache[telegram_id] = ver
+    return ver
+
+async def _verify_bearer(token: str) -> int:
+    user_id, ver = _jwt_verify(token)
+    if ver != await _user_jwt_version(user_id):
+        raise jwt.InvalidTokenError("token revoked")
+    return user_id
+
+async def _token_response(request: web.Request, telegram_id: int, role: str, tier: str,
+                          ver: Optional[int] = None, **extra) -> web.Response:
+    """Login-Antwort: Access-Token im Body, Refresh-Token im Body und als HttpOnly-Cookie.
+
+    Das Cookie wirkt cross-origin nur, wenn ALLOWED_ORIGINS explizite Origins listet (dann mit
+    Access-Control-Allow-Credentials); bei ALLOWED_ORIGINS=* bleibt nur der Refresh per Body.
+    """
+    if ver is None:
+        ver = await _user_jwt_version(telegram_id, fresh=True)
+    else:
+        _jwt_ver_cache[telegram_id] = ver
+    refresh = _refresh_issue(telegram_id, ver)
+    resp = _json({
+        "access_token": _jwt_issue(telegram_id, role=role, tier=tier, ver=ver),
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_TTL_MIN * 60,
+        "refresh_token": refresh,
+        "role": role,
+        "tier": tier,
+        **extra,
+    }, request)
+    resp.set_cookie(REFRESH_COOKIE, refresh, max_age=REFRESH_TOKEN_TTL_DAYS * 86400,
+                    path="/api/devdash/auth", httponly=True, secure=True, samesite="None")
+    return resp
+
+async def auth_refresh(request: web.Request):
+    """
+    Neues Access-Token gegen ein gültiges Refresh-Token (Cookie oder Body).
+
+    Request: { "refresh_token": "jwt" }  (optional, sonst Cookie devdash_refresh)
+    Response: wie Login { "access_token": "jwt", "refresh_token": "jwt", ... }
+    """
+    token = request.cookies.get(REFRESH_COOKIE)
+    if not token and request.can_read_body:
+        try:
+            token = ((await _read_json(request)) or {}).get("refresh_token")
+        except Exception:
+            token = None
+    if not token:
+        return _json({"error": "refresh_token required"}, request, status=401)
+    try:
+        data = _hs256_decode(token)
+        if data.get("typ") != "refresh":
+            raise jwt.InvalidTokenError("not a refresh token")
+        telegram_id = int(data.get("sub"))
+    except Exception as e:
+        return _json({"error": f"invalid refresh token: {e}"}, request, status=401)
 
-def _jwt_verify(token: str) -> int:
-    data = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-    return int(data.get("sub"))
+    # Rolle/Tier/Version immer frisch aus der DB
+    row = await fetchrow("select role, tier, sso_jwt_version from dashboard_users where telegram_id=%s", (telegram_id,))
+    if not row or row["sso_jwt_version"] != int(data.get("ver") or 0):
+        return _json({"error": "refresh token revoked"}, request, status=401)
+    return await _token_response(request, telegram_id, row["role"], row["tier"], row["sso_jwt_version"])
 
 # ----------------------- Telegram login verify -----------------------
 
@@ -469,9 +1169,8 @@ def verify_telegram_auth(auth: Dict[str, Any]) -> Dict[str, Any]:
             
             # If user is JSON-encoded, decode it
             if "user" in parsed:
-                import json
                 try:
-                    user_obj = json.loads(parsed["user"])
+                    user_obj = _json_loads(parsed["user"])
                     parsed.update(user_obj)
                 except:
                     pass
@@ -492,22 +1191,17 @@ def verify_telegram_auth(auth: Dict[str, Any]) -> Dict[str, Any]:
         try:
             received_hash = auth["hash"]
             
-            # Build data check string: alphabetically sorted fields (excluding hash)
-            data_to_check = {}
-            for k, v in auth.items():
-                if k != "hash":
-                    data_to_check[k] = str(v)
-            
-            data_check_str = "\n".join(f"{k}={data_to_check[k]}" for k in sorted(data_to_check.keys()))
+            # Build data check string: alphabetically sorted fields (excluding hash).
+            # Alle übergebenen Felder zählen (WebApp-init_data hat mehr als die Widget-Felder) -> kein festes Feld-Set
+            data_check_str = "\n".join(f"{k}={auth[k]}" for k in sorted(auth) if k != "hash")
             log.debug(f"Data to check:\n{data_check_str}")
             
-            # Calculate HMAC
-            secret = hashlib.sha256(BOT_TOKEN.encode()).digest()
-            calculated_hash = hmac.new(secret, data_check_str.encode(), hashlib.sha256).hexdigest()
+            # Calculate HMAC; Vergleich in konstanter Zeit auf den Rohbytes
+            calculated = hmac.new(_TG_SECRET, data_check_str.encode(), hashlib.sha256).digest()
             
-            log.debug(f"Received hash: {received_hash}, Calculated hash: {calculated_hash}")
+            log.debug(f"Received hash: {received_hash}")
             
-            if calculated_hash != received_hash:
+            if not hmac.compare_digest(calculated, bytes.fromhex(received_hash)):
                 raise ValueError(f"❌ invalid hash signature")
             
             log.info("✅ Hash verification successful")
@@ -545,22 +1239,209 @@ def verify_telegram_auth(auth: Dict[str, Any]) -> Dict[str, Any]:
 
 # ------------------------------ utils ------------------------------
 
+# exakter Typ -> Encoder; ein dict-Lookup statt isinstance-Kette (mit orjson kommt hier fast nur Decimal an)
+_JSON_ENCODERS = {
+    Decimal: str,
+    datetime.datetime: datetime.datetime.isoformat,
+    datetime.date: datetime.date.isoformat,
+}
+
 def _json_default(o):
+    enc = _JSON_ENCODERS.get(type(o))
+    if enc is not None:
+        return enc(o)
     if isinstance(o, (datetime.datetime, datetime.date)):
         return o.isoformat()
-    if isinstance(o, Decimal):
-        return str(o)
     return str(o)
 
 _json_dumps = partial(json.dumps, default=_json_default, ensure_ascii=False)
 
+if orjson is not None:
+    # datetime/date/UUID/numpy nativ; Decimal & Co. über _json_default; int-Keys wie bei json.dumps
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+    def _json_bytes(data: Any) -> bytes:
+        return orjson.dumps(data, default=_json_default, option=_ORJSON_OPTS)
+else:
+    def _json_bytes(data: Any) -> bytes:
+        return _json_dumps(data).encode("utf-8")
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Obergrenze für JSON-Bodies der API (Formulare, Logins); größere Requests gar nicht erst puffern
+JSON_MAX_BODY = int(os.getenv("DEVDASH_JSON_MAX_BODY", str(64 * 1024)))
+
+async def _read_json(request: web.Request) -> Any:
+    # wie request.json(), aber ohne den Umweg über str + stdlib json
+    if (request.content_length or 0) > JSON_MAX_BODY:
+        raise web.HTTPRequestEntityTooLarge(max_size=JSON_MAX_BODY, actual_size=request.content_length)
+    raw = await request.read()
+    if len(raw) > JSON_MAX_BODY:  # chunked, ohne Content-Length
+        raise web.HTTPRequestEntityTooLarge(max_size=JSON_MAX_BODY, actual_size=len(raw))
+    return _json_loads(raw)
+
+
+def _clamp_int(request: web.Request, key: str, default: int, lo: int, hi: int) -> int:
+    # Query-Parameter (limit, days, ...) als int in [lo, hi]; ungültig -> 400 statt 500
+    raw = request.query.get(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise web.HTTPBadRequest(text=f"{key} must be an integer")
+    return max(lo, min(value, hi))
+
+
+def _encode_cursor(ts: datetime.datetime, row_id: int) -> str:
+    # Keyset-Cursor (Zeitstempel, id) als opaker URL-sicherer String; id bricht Gleichstände im Zeitstempel
+    return base64.urlsafe_b64encode(_json_bytes([ts.isoformat(), row_id])).decode().rstrip("=")
+
+
+def _decode_cursor(request: web.Request, key: str = "before") -> Optional[Tuple[datetime.datetime, int]]:
+    raw = request.query.get(key)
+    if not raw:
+        return None
+    try:
+        ts, row_id = _json_loads(base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4)))
+        if type(row_id) is not int:
+            raise ValueError("id must be an integer")
+        return datetime.datetime.fromisoformat(ts), row_id
+    except (ValueError, TypeError):
+        raise web.HTTPBadRequest(text=f"invalid {key} cursor")
+
+# Antworten ab dieser Größe gzip-komprimiert ausliefern (kleinere lohnen die CPU nicht)
+COMPRESS_MIN_BYTES = int(os.getenv("DEVDASH_COMPRESS_MIN_BYTES", "1024"))
+
+
 def _json(data: Any, request: web.Request, status: int = 200):
-    resp = web.json_response(data, status=status, dumps=_json_dumps)
+    body = _json_bytes(data)
+    resp = web.Response(body=body, status=status, content_type="application/json")
     for k, v in _cors_headers(request).items():
         resp.headers[k] = v
+    if len(body) >= COMPRESS_MIN_BYTES:
+        # aiohttp prüft Accept-Encoding selbst und komprimiert erst beim Senden
+        resp.enable_compression()
+    return resp
+
+# ------------------------------ error logging ------------------------------
+# Tracebacks formatieren kostet CPU auf dem Event-Loop; bei einem DB-Ausfall scheitert jeder Request.
+# Pro Stelle daher höchstens ein voller Traceback je Intervall, dazwischen nur Typ + Nachricht.
+LOG_TRACE_INTERVAL = float(os.getenv("DEVDASH_LOG_TRACE_INTERVAL", "60"))
+_exc_log_state: Dict[str, List[float]] = {}  # where -> [letzter Traceback (monotonic), unterdrückte seitdem]
+
+
+def _log_exc(where: str, e: BaseException) -> None:
+    now = time.monotonic()
+    state = _exc_log_state.setdefault(where, [float("-inf"), 0])
+    if now - state[0] >= LOG_TRACE_INTERVAL:
+        suppressed = int(state[1])
+        state[0], state[1] = now, 0
+        if suppressed:
+            log.error("%s failed: %s (+%d weitere ohne Traceback)", where, e, suppressed, exc_info=e)
+        else:
+            log.error("%s failed: %s", where, e, exc_info=e)
+    else:
+        state[1] += 1
+        log.error("%s failed: %s: %s", where, type(e).__name__, e)
+
+
+# ------------------------------ response cache ------------------------------
+# Read-only Statistik-Endpoints: fertige JSON-Bytes pro path+query für ein paar Sekunden halten,
+# damit Dashboard-Polling nicht jedes Mal alle Aggregationen neu rechnet.
+STATS_CACHE_TTL = int(os.getenv("DEVDASH_STATS_CACHE_TTL", "30"))
+_STATS_CACHE_MAX = 256
+_resp_cache: Dict[str, Tuple[float, bytes]] = {}
+_resp_gzip: Dict[str, bytes] = {}  # key -> gzip von _resp_cache[key][1]
+_resp_inflight: Dict[str, asyncio.Future] = {}  # key -> Future mit den Bytes des laufenden Handler-Aufrufs
+
+
+def _invalidate_cache():
+    _resp_cache.clear()
+    _resp_gzip.clear()
+    _monitoring_db_cache.clear()
+
+
+async def _stream_ndjson(request: web.Request, sql: str, params: Tuple = ()) -> web.StreamResponse:
+    """Ergebnis zeilenweise als NDJSON schreiben statt die ganze Liste im Speicher zu halten."""
+    resp = web.StreamResponse(headers=_cors_headers(request))
+    resp.content_type = "application/x-ndjson"
+    await resp.prepare(request)
+    try:
+        async for row in fetch_iter(sql, params):
+            await resp.write(_json_bytes(row) + b"\n")
+    except (ConnectionResetError, asyncio.CancelledError):
+        raise
+    except Exception as e:
+        # Header sind schon raus -> Fehler als letzte Zeile melden
+        _log_exc("ndjson stream", e)
+        await resp.write(_json_bytes({"error": str(e)}) + b"\n")
+    await resp.write_eof()
     return resp
 
+
+def _cached_json(handler):
+    """Decorator: Auth prüfen, dann gecachte Antwort liefern oder Handler ausführen und 200er cachen.
+    Gleichzeitige Misses auf denselben Key warten auf den ersten Handler-Lauf statt ihn zu wiederholen."""
+    @wraps(handler)
+    async def wrapper(request: web.Request):
+        await _auth_user(request)
+        key = request.path_qs
+        now = time.monotonic()
+        hit = _resp_cache.get(key)
+        body = hit[1] if hit and now - hit[0] < STATS_CACHE_TTL else None
+        if body is None and key in _resp_inflight:
+            body = await asyncio.shield(_resp_inflight[key])
+            hit = _resp_cache.get(key)
+        if body is not None:
+            if len(body) >= COMPRESS_MIN_BYTES and "gzip" in request.headers.get("Accept-Encoding", ""):
+                # gzip je Cache-Eintrag nur einmal rechnen, Treffer bekommen die fertigen Bytes
+                gz = _resp_gzip.get(key) if hit and hit[1] is body else None
+                if gz is None:
+                    gz = gzip.compress(body, compresslevel=5)
+                    if hit and hit[1] is body:
+                        _resp_gzip[key] = gz
+                resp = web.Response(body=gz, content_type="application/json",
+                                    headers={"Content-Encoding": "gzip"})
+            else:
+                resp = web.Response(body=body, content_type="application/json")
+            for k, v in _cors_headers(request).items():
+                resp.headers[k] = v
+            resp.headers["X-Cache"] = "HIT"
+        else:
+            fut = _resp_inflight[key] = asyncio.get_running_loop().create_future()
+            body = None
+            try:
+                resp = await handler(request)
+                if isinstance(resp, web.Response) and resp.status == 200 and isinstance(resp.body, bytes):
+                    body = resp.body
+                    if len(_resp_cache) >= _STATS_CACHE_MAX:
+                        for k in [k for k, (ts, _) in _resp_cache.items() if now - ts >= STATS_CACHE_TTL]:
+                            del _resp_cache[k]
+                            _resp_gzip.pop(k, None)
+                        if len(_resp_cache) >= _STATS_CACHE_MAX:
+                            _resp_cache.clear()
+                            _resp_gzip.clear()
+                    _resp_cache[key] = (now, body)
+                    _resp_gzip.pop(key, None)
+            finally:
+                # Wartende bekommen die Bytes, bei Fehler/Nicht-200 None -> sie rufen den Handler selbst auf
+                if _resp_inflight.get(key) is fut:
+                    del _resp_inflight[key]
+                fut.set_result(body)
+            if not resp.prepared:
+                resp.headers["X-Cache"] = "MISS"
+        # private: Antworten hängen am Bearer-Token, shared Caches dürfen sie nicht ausliefern
+        if not resp.prepared:
+            resp.headers["Cache-Control"] = f"private, max-age={STATS_CACHE_TTL}"
+        return resp
+    return wrapper
+
 async def _auth_user(request: web.Request) -> int:
+    # bereits von auth_middleware geprüft
+    user_id = request.get("user")
+    if user_id is not None:
+        return user_id
     auth = request.headers.get("Authorization","")
     if not auth.lower().startswith("bearer "):
         raise web.HTTPUnauthorized(text="Missing bearer token")
@@ -568,34 +1449,32 @@ async def _auth_user(request: web.Request) -> int:
 
     # 1) HMAC-Token (user_id.exp.sig)
     try:
-        return _jwt_verify(token)
+        return await _verify_bearer(token)
     except Exception as e:
         raise web.HTTPUnauthorized(text=f"invalid token: {e}")
 
 # ------------------------------ base58 ------------------------------
 _B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
-_B58_INDEX = {c: i for i, c in enumerate(_B58_ALPHABET)}
+# Byte -> Ziffernwert für bytes.translate (255 = kein Base58-Zeichen); spart den Dict-Lookup pro Zeichen
+_B58_TABLE = bytes(_B58_ALPHABET.index(chr(b)) if chr(b) in _B58_ALPHABET else 255 for b in range(256))
 
 
 def b58decode(s: str) -> bytes:
+    digits = s.encode("ascii").translate(_B58_TABLE)
+    if 255 in digits:
+        raise ValueError("invalid base58 character")
     n = 0
-    for ch in s:
-        n = n * 58 + _B58_INDEX[ch]
-    # convert to bytes
-    full = n.to_bytes((n.bit_length() + 7) // 8, "big") or b"\x00"
-    # handle leading zeros
-    pad = 0
-    for ch in s:
-        if ch == "1":
-            pad += 1
-        else:
-            break
-    return b"\x00" * pad + full
+    for d in digits:
+        n = n * 58 + d
+    # führende '1' sind führende Null-Bytes
+    pad = len(s) - len(s.lstrip("1"))
+    return b"\x00" * pad + n.to_bytes((n.bit_length() + 7) // 8, "big")
 
 
 # ------------------------------ routes ------------------------------
 async def options_handler(request):
     headers = _cors_headers(request)
+    headers["Access-Control-Max-Age"] = CORS_MAX_AGE
     return web.Response(status=204, headers=headers)
 
 
@@ -603,34 +1482,127 @@ async def healthz(request: web.Request):
     return _json({"status": "ok", "time": int(time.time())}, request)
 
 
+_db_health_cache: TTLCache = TTLCache(maxsize=1, ttl=5)
+_db_health_lock = asyncio.Lock()
+
+
+_DB_HEALTH_ZERO_STATS = {
+    "users_total": 0, "bots_active": 0, "bots_total": 0,
+    "ads_active": 0, "ads_total": 0, "token_events": 0,
+}
+
+
+async def _db_health() -> Dict[str, Any]:
+    # im Normalfall ein Roundtrip: die Stats-Query belegt zugleich, dass die DB antwortet
+    try:
+        stats = await fetchrow("""
+            select 
+                (select count(*) from dashboard_users) as users_total,
+                (select count(*) from dashboard_bots where is_active=true) as bots_active,
+                (select count(*) from dashboard_bots) as bots_total,
+                (select count(*) from adv_campaigns where enabled=true) as ads_active,
+                (select count(*) from adv_campaigns) as ads_total,
+                (select count(*) from dashboard_token_events) as token_events,
+                greatest(
+                    (select max(created_at) from dashboard_users),
+                    (select max(created_at) from dashboard_bots),
+                    (select max(created_at) from adv_campaigns)
+                ) as last_update
+        """)
+    except Exception as e:
+        # Stats können an einzelnen Tabellen scheitern (fehlt, Lock, Timeout) -> erst prüfen,
+        # ob die DB selbst antwortet; "down" nur, wenn auch die Probe scheitert
+        log.warning("Could not fetch stats: %s", e)
+        try:
+            await fetchrow("select 1")
+        except Exception as e:
+            log.warning("Database health check failed: %s", e)
+            return {"status": "down"}
+        return {"status": "operational", **_DB_HEALTH_ZERO_STATS, "last_activity": "unknown"}
+    last_update = stats.pop("last_update")
+    return {
+        "status": "operational",
+        **stats,
+        "last_activity": last_update.isoformat() if last_update else "unknown",
+    }
+
+
+# cpu_percent(interval=None) misst seit dem vorigen Aufruf -> einmal beim Import starten,
+# sonst liefert der erste Health-Request 0.0
+psutil.cpu_percent(interval=None)
+
+# Ein Hintergrund-Task sampelt die CPU in festen Abständen; sonst setzen sich system_health und
+# monitoring_data gegenseitig die Messbasis zurück und liefern Werte über zufällig kurze Fenster.
+SYS_SAMPLE_INTERVAL = float(os.getenv("DEVDASH_SYS_SAMPLE_INTERVAL", "2"))
+_cpu_sample: List[float] = [0.0, float("-inf")]  # [Wert, monotonic-Zeitpunkt]
+_disk_cache: TTLCache = TTLCache(maxsize=1, ttl=30)  # Platten-Füllstand ändert sich langsam
+
+
+def _cpu_percent() -> float:
+    value, ts = _cpu_sample
+    if time.monotonic() - ts <= 2 * SYS_SAMPLE_INTERVAL:
+        return value
+    # kein (laufender) Sampler, z.B. ohne register_devdash_routes
+    return psutil.cpu_percent(interval=None)
+
+
+def _disk_usage():
+    du = _disk_cache.get("/")
+    if du is None:
+        du = _disk_cache["/"] = psutil.disk_usage('/')
+    return du
+
+
+async def _sys_sample_loop():
+    while True:
+        _cpu_sample[:] = [psutil.cpu_percent(interval=None), time.monotonic()]
+        await asyncio.sleep(SYS_SAMPLE_INTERVAL)
+
+
+async def _start_sys_sampler(app: web.Application):
+    app["_devdash_sys_task"] = asyncio.create_task(_sys_sample_loop())
+
+
+async def _stop_sys_sampler(app: web.Application):
+    task = app.get("_devdash_sys_task")
+    if task:
+        task.cancel()
+
+# ändern sich zur Laufzeit nicht -> einmal beim Import statt pro Health-Poll
+_SYS_PLATFORM  = platform.system()
+_SYS_PYVER     = platform.python_version()
+_CPU_COUNT     = psutil.cpu_count()
+_MEM_TOTAL_MB  = round(psutil.virtual_memory().total / (1024**2), 2)
+_DISK_TOTAL_GB = round(psutil.disk_usage('/').total / (1024**3), 2)
+
+
 async def system_health(request: web.Request):
     """System health check endpoint with comprehensive real metrics"""
-    import psutil
-    import platform
     
     start_time = time.time()
     current_time = int(time.time())
     
     # Get system metrics
-    cpu_percent = psutil.cpu_percent(interval=0.1)
+    # non-blocking: letzter Wert des Hintergrund-Samplers (interval=0.1 hätte den Event-Loop 100ms blockiert)
+    cpu_percent = _cpu_percent()
     memory_info = psutil.virtual_memory()
-    disk_info = psutil.disk_usage('/')
+    disk_info = _disk_usage()
     
     health = {
         "status": "healthy",
         "timestamp": current_time,
         "version": "1.0.0",
         "system": {
-            "platform": platform.system(),
-            "python_version": platform.python_version(),
+            "platform": _SYS_PLATFORM,
+            "python_version": _SYS_PYVER,
             "cpu_percent": round(cpu_percent, 2),
-            "cpu_count": psutil.cpu_count(),
+            "cpu_count": _CPU_COUNT,
             "memory_percent": round(memory_info.percent, 2),
             "memory_used_mb": round(memory_info.used / (1024**2), 2),
-            "memory_total_mb": round(memory_info.total / (1024**2), 2),
+            "memory_total_mb": _MEM_TOTAL_MB,
             "disk_percent": round(disk_info.percent, 2),
             "disk_used_gb": round(disk_info.used / (1024**3), 2),
-            "disk_total_gb": round(disk_info.total / (1024**3), 2)
+            "disk_total_gb": _DISK_TOTAL_GB
         },
         "services": {},
         "uptime_seconds": current_time,
@@ -648,53 +1620,18 @@ async def system_health(request: web.Request):
         }
     }
     
-    # Database health & comprehensive stats
-    try:
-        row = await fetchrow("select now() as ts")
-        if row:
-            health["database"]["status"] = "operational"
-            health["services"]["database"] = "operational"
-            
-            # Get detailed stats
-            try:
-                stats = await fetchrow("""
-                    select 
-                        (select count(*) from dashboard_users) as users_total,
-                        (select count(*) from dashboard_bots where is_active=true) as bots_active,
-                        (select count(*) from dashboard_bots) as bots_total,
-                        (select count(*) from adv_campaigns where enabled=true) as ads_active,
-                        (select count(*) from adv_campaigns) as ads_total,
-                        (select count(*) from dashboard_token_events) as token_events
-                """)
-            except Exception as e:
-                log.warning(f"Could not fetch stats: {e}")
-                stats = None
-            
-            if stats:
-                health["database"]["users_total"] = stats.get('users_total', 0)
-                health["database"]["bots_active"] = stats.get('bots_active', 0)
-                health["database"]["bots_total"] = stats.get('bots_total', 0)
-                health["database"]["ads_active"] = stats.get('ads_active', 0)
-                health["database"]["ads_total"] = stats.get('ads_total', 0)
-                health["database"]["token_events"] = stats.get('token_events', 0)
-            
-            # Get last activity
-            try:
-                latest = await fetchrow(
-                    "select max(created_at) as last_update from (select created_at as updated_at from dashboard_users union all select created_at from dashboard_bots union all select created_at as updated_at from adv_campaigns) as t"
-                )
-                if latest and latest['last_update']:
-                    health["database"]["last_activity"] = latest['last_update'].isoformat()
-            except:
-                health["database"]["last_activity"] = "recent"
-        else:
-            health["database"]["status"] = "degraded"
-            health["services"]["database"] = "degraded"
-            health["status"] = "degraded"
-    except Exception as e:
-        log.warning("Database health check failed: %s", e)
-        health["database"]["status"] = "down"
-        health["services"]["database"] = "down"
+    # Database health & comprehensive stats (kurz gecacht, Health-Poller kommen in Bursts)
+    db = _db_health_cache.get("db")
+    if db is None:
+        # nur der erste Miss fragt die DB, gleichzeitige warten und lesen dann den Cache
+        async with _db_health_lock:
+            db = _db_health_cache.get("db")
+            if db is None:
+                db = await _db_health()
+                _db_health_cache["db"] = db
+    health["database"].update(db)
+    health["services"]["database"] = db["status"]
+    if db["status"] != "operational":
         health["status"] = "degraded"
     
     # Services summary
@@ -719,8 +1656,7 @@ async def system_logs(request: web.Request):
         # Allow unauthenticated access for health monitoring
         pass
     
-    limit = int(request.query.get("limit", "50"))
-    limit = min(limit, 1000)  # Cap at 1000
+    limit = _clamp_int(request, "limit", 50, 1, 1000)
     
     return _json({
         "logs": [],
@@ -758,7 +1694,7 @@ async def auth_telegram(request: web.Request):
     """
     log.info("auth_telegram hit from origin=%s", request.headers.get("Origin"))
     try:
-        payload = await request.json()
+        payload = await _read_json(request)
         log.info("Telegram payload keys: %s, auth_method: %s", list(payload.keys()), payload.get("auth_method", "unknown"))
     except Exception as e:
         log.error("Failed to parse JSON: %s", e)
@@ -815,9 +1751,9 @@ async def auth_telegram(request: web.Request):
         log.error("❌ User verification resulted in empty user")
         return _json({"error": "User verification failed"}, request, status=400)
     
-    # ✅ Insert/Update user in database
+    # ✅ Insert/Update user in database; RETURNING liefert Rolle/Tier/Token-Version im selben Roundtrip
     try:
-        await execute(
+        row = await fetchrow(
             """
             insert into dashboard_users(telegram_id,username,first_name,last_name,photo_url)
             values(%s,%s,%s,%s,%s)
@@ -827,6 +1763,7 @@ async def auth_telegram(request: web.Request):
               last_name=excluded.last_name,
               photo_url=excluded.photo_url,
               updated_at=now()
+            returning role, tier, sso_jwt_version
             """,
             (user["id"], user.get("username"), user.get("first_name"), user.get("last_name"), user.get("photo_url")),
         )
@@ -837,72 +1774,54 @@ async def auth_telegram(request: web.Request):
     
     # ✅ Issue JWT token
     try:
-        row = await fetchrow("select role,tier from dashboard_users where telegram_id=%s", (user["id"],))
-        if not row:
-            log.warning("⚠️  User not found after insert: %s", user["id"])
-            role, tier = "dev", "pro"
-        else:
-            role, tier = row["role"], row["tier"]
-        
-        token = _jwt_issue(user["id"], role=role, tier=tier)
+        role, tier = row["role"], row["tier"]
+        resp = await _token_response(request, user["id"], role, tier, row["sso_jwt_version"])
         log.info("✅ JWT token issued for user: %s (role=%s, tier=%s)", user["id"], role, tier)
-        
-        return _json(
-            {
-                "access_token": token,
-                "token_type": "bearer",
-                "role": role,
-                "tier": tier,
-            },
-            request,
-        )
+        return resp
     except Exception as e:
         log.error("❌ Failed to issue token: %s", e)
         return _json({"error": f"Token error: {str(e)}"}, request, status=500)
 
 
+@lru_cache(maxsize=10000)
+def _synthetic_id(account: str) -> int:
+    """Stabile Pseudo-telegram_id für Wallet-Logins (erste 8 Byte SHA-256, auf 53 Bit gekürzt)."""
+    return int.from_bytes(hashlib.sha256(account.encode()).digest()[:8], byteorder='big') % (2**53)
+
+
 async def auth_ton_wallet(request: web.Request):
     """
     TON WALLET LOGIN - Alternative authentication via TON wallet.
     
     Request: { "ton_address": "UQAb...", "signature": "...", "message": "..." }
-    Response: { "access_token": "jwt", "token_type": "bearer" }
+    Response: { "access_token": "jwt", "token_type": "bearer", "expires_in": 900, "refresh_token": "jwt" }
     """
     log.info("auth_ton_wallet hit")
     try:
-        body = await request.json()
+        body = await _read_json(request)
         ton_address = (body.get("ton_address") or "").strip()
         
         if not ton_address:
             return _json({"error": "ton_address required"}, request, status=400)
         
         # For now: simple mapping (in production: verify signature)
-        # Generate a synthetic telegram_id from TON address hash
-        synthetic_id = int.from_bytes(
-            hashlib.sha256(ton_address.encode()).digest()[:8],
-            byteorder='big'
-        ) % (2**53)
+        # Synthetic telegram_id from TON address hash
+        synthetic_id = _synthetic_id(ton_address)
         
         log.info(f"TON login for address={ton_address[:20]}..., synthetic_id={synthetic_id}")
         
-        await execute("""
+        row = await fetchrow("""
             insert into dashboard_users(telegram_id, ton_address, role, tier)
             values(%s, %s, 'user', 'pro')
             on conflict(telegram_id) do update set
               ton_address=excluded.ton_address,
               updated_at=now()
+            returning sso_jwt_version
         """, (synthetic_id, ton_address))
         
-        token = _jwt_issue(synthetic_id, role="user", tier="pro")
-        return _json({
-            "access_token": token,
-            "token_type": "bearer",
-            "role": "user",
-            "tier": "pro",
-            "method": "ton_wallet"
-        }, request)
+        return await _token_response(request, synthetic_id, "user", "pro", row["sso_jwt_version"], method="ton_wallet")
     except Exception as e:
-        log.error("TON wallet auth failed: %s", e, exc_info=True)
+        _log_exc("TON wallet auth", e)
         return _json({"error": str(e)}, request, status=400)
 
 
@@ -911,66 +1830,60 @@ async def auth_near_wallet(request: web.Request):
     NEAR WALLET LOGIN - Alternative authentication via NEAR wallet.
     
     Request: { "near_account_id": "user.near", "public_key": "...", "signature": "..." }
-    Response: { "access_token": "jwt", "token_type": "bearer" }
+    Response: { "access_token": "jwt", "token_type": "bearer", "expires_in": 900, "refresh_token": "jwt" }
     """
     log.info("auth_near_wallet hit")
     try:
-        body = await request.json()
+        body = await _read_json(request)
         near_account_id = (body.get("near_account_id") or "").strip()
         
         if not near_account_id:
             return _json({"error": "near_account_id required"}, request, status=400)
         
-        # Generate a synthetic telegram_id from NEAR account hash
-        synthetic_id = int.from_bytes(
-            hashlib.sha256(near_account_id.encode()).digest()[:8],
-            byteorder='big'
-        ) % (2**53)
+        # Synthetic telegram_id from NEAR account hash
+        synthetic_id = _synthetic_id(near_account_id)
         
         log.info(f"NEAR login for account={near_account_id}, synthetic_id={synthetic_id}")
         
-        await execute("""
+        row = await fetchrow("""
             insert into dashboard_users(telegram_id, near_account_id, role, tier)
             values(%s, %s, 'user', 'pro')
             on conflict(telegram_id) do update set
               near_account_id=excluded.near_account_id,
               updated_at=now()
+            returning sso_jwt_version
         """, (synthetic_id, near_account_id))
         
-        token = _jwt_issue(synthetic_id, role="user", tier="pro")
-        return _json({
-            "access_token": token,
-            "token_type": "bearer",
-            "role": "user",
-            "tier": "pro",
-            "method": "near_wallet"
-        }, request)
+        return await _token_response(request, synthetic_id, "user", "pro", row["sso_jwt_version"], method="near_wallet")
     except Exception as e:
-        log.error("NEAR wallet auth failed: %s", e, exc_info=True)
+        _log_exc("NEAR wallet auth", e)
         return _json({"error": str(e)}, request, status=400)
 
 
+# Profilfelder für me(); ältere DBs haben evtl. nicht alle Spalten -> einmalig gegen das Schema prüfen
+_ME_FIELDS = ("username", "role", "tier", "first_name", "last_name", "photo_url", "ton_address", "near_account_id")
+_USER_COLS: Optional[frozenset] = None
+
+
+async def _user_cols(refresh: bool = False) -> frozenset:
+    global _USER_COLS
+    if _USER_COLS is None or refresh:
+        rows = await fetch("select column_name from information_schema.columns where table_name='dashboard_users'")
+        _USER_COLS = frozenset(r["column_name"] for r in rows)
+    return _USER_COLS
+
+
 async def me(request: web.Request):
     user_id = await _auth_user(request)
     try:
-        # Only select columns that definitely exist
+        cols = await _user_cols()
+        sel = [c for c in _ME_FIELDS if c in cols]
         row = await fetchrow(
-            "select username, role, tier, first_name, last_name, photo_url "
-            "from dashboard_users where telegram_id=%s",
+            f"select {', '.join(sel)} from dashboard_users where telegram_id=%s",
             (user_id,)
         )
         if row:
-            row = dict(row)
-            # Try to add optional TON address if column exists
-            try:
-                ton_row = await fetchrow(
-                    "select ton_address from dashboard_users where telegram_id=%s",
-                    (user_id,)
-                )
-                if ton_row:
-                    row['ton_address'] = ton_row.get('ton_address')
-            except:
-                row['ton_address'] = None
+            row = {c: row.get(c) for c in _ME_FIELDS}
     except Exception as e:
         log.error("me() query failed: %s", e)
         raise web.HTTPInternalServerError(text=f"Database error: {e}")
@@ -979,18 +1892,16 @@ async def me(request: web.Request):
 
 async def overview(request: web.Request):
     await _auth_user(request)
-
-    def cnt(sql):
-        try:
-            r = _fetchrow(sql)
-            return (r or {}).get("c", 0)
-        except Exception:
-            return 0
-
-    users_total = await _to_thread(lambda: cnt("select count(1) as c from dashboard_users"))
-    ads_active = await _to_thread(lambda: cnt("select count(1) as c from adv_campaigns where enabled=true"))
-    bots_active = await _to_thread(lambda: cnt("select count(1) as c from dashboard_bots where is_active=true"))
-    return _json({"users_total": users_total, "ads_active": ads_active, "bots_active": bots_active}, request)
+    # alle Zähler in einem Roundtrip
+    try:
+        r = await fetchrow("""
+            select (select count(1) from dashboard_users)                     as users_total,
+                   (select count(1) from adv_campaigns where enabled=true)    as ads_active,
+                   (select count(1) from dashboard_bots where is_active=true) as bots_active
+        """) or {}
+    except Exception:
+        r = {}
+    return _json({k: r.get(k, 0) for k in ("users_total", "ads_active", "bots_active")}, request)
 
 
 async def bots_list(request: web.Request):
@@ -1001,12 +1912,13 @@ async def bots_list(request: web.Request):
 async def bots_refresh(request: web.Request):
     await _auth_user(request)
     added = await scan_env_bots()
+    _invalidate_cache()
     rows = await fetch("select id, username, title, env_token_key, is_active, meta, created_at, updated_at from dashboard_bots order by id asc")
     return _json({"refreshed": added, "bots": rows}, request)
 
 async def bots_add(request: web.Request):
     await _auth_user(request)
-    body = await request.json()
+    body = await _read_json(request)
     username = (body.get("slug") or body.get("name") or "").strip()
     title    = (body.get("name") or username)
     is_active = bool(body.get("is_active", True))
@@ -1019,6 +1931,7 @@ async def bots_add(request: web.Request):
         title=excluded.title,
         updated_at=now()
     """, (username, title, None, is_active, json.dumps({})))
+    _invalidate_cache()
     row = await fetchrow("select id,username,title,env_token_key,is_active,meta from dashboard_bots where username=%s", (username,))
     return _json(row, request, status=201)
 
@@ -1027,67 +1940,93 @@ async def bots_add(request: web.Request):
 async def ton_payments(request: web.Request):
     await _auth_user(request)
     address = request.query.get("address", "").strip()
-    limit = int(request.query.get("limit", "20"))
+    limit = _clamp_int(request, "limit", 20, 1, 100)
     if not address:
         raise web.HTTPBadRequest(text="address required")
     headers = {}
     if TON_API_KEY:
         headers["Authorization"] = f"Bearer {TON_API_KEY}"
     url = f"{TON_API_BASE}/v2/accounts/{address}/events?limit={limit}&subject_only=true"
-    async with httpx.AsyncClient(timeout=10.0) as cx:
-        r = await cx.get(url, headers=headers)
-        r.raise_for_status()
-        j = r.json()
-    items=[]
-    for ev in j.get("events", []):
-        for act in ev.get("actions", []):
-            if act.get("type")=="TonTransfer" and act.get("direction")=="in":
-                items.append({
-                  "ts": ev.get("timestamp"),
-                  "tx_hash": ev.get("event_id"),
-                  "from": act.get("from"),
-                  "to": act.get("to"),
-                  "amount_ton": act.get("amount"),  # nanotons/tons je nach API – direkt anzeigen
-                })
-    return _json({"address": address, "incoming": items[:limit]}, request)
+    r = await _http(request).get(url, headers=headers, timeout=HTTP_TIMEOUTS["ton"])
+    r.raise_for_status()
+    j = _json_loads(r.content)
+    # Generator + islice: bricht nach `limit` Treffern ab statt alle Events zu materialisieren
+    items = list(islice((
+        {
+          "ts": ev.get("timestamp"),
+          "tx_hash": ev.get("event_id"),
+          "from": act.get("from"),
+          "to": act.get("to"),
+          "amount_ton": act.get("amount"),  # nanotons/tons je nach API – direkt anzeigen
+        }
+        for ev in j.get("events", ())
+        for act in ev.get("actions", ())
+        if act.get("type")=="TonTransfer" and act.get("direction")=="in"
+    ), limit))
+    return _json({"address": address, "incoming": items}, request)
 
 # ------------------------------ Bot Mesh ------------------------------
+# Endpoint-Liste ändert sich selten (Pflege außerhalb dieses Moduls) -> 60s im Speicher halten
+_endpoints_cache: TTLCache = TTLCache(maxsize=1, ttl=60)
+
+
+async def _active_endpoints() -> List[Dict[str, Any]]:
+    rows = _endpoints_cache.get("e")
+    if rows is None:
+        rows = await fetch("""
+            select id, bot_username, base_url, health_path, metrics_path, api_key
+            from dashboard_bot_endpoints where is_active=true order by id
+        """)
+        _endpoints_cache["e"] = rows
+    return rows
+
 async def mesh_health(request: web.Request):
     await _auth_user(request)
     try:
-        rows = await fetch("select id, base_url, health_path, api_key from dashboard_bot_endpoints where is_active=true order by id")
+        rows = await _active_endpoints()
         out = {}
         if rows:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                for r in rows:
-                    try:
-                        url = r.get("base_url", "").rstrip("/") + r.get("health_path", "/health")
-                        headers = {"x-api-key": r.get("api_key", "")} if r.get("api_key") else {}
-                        resp = await client.get(url, headers=headers)
-                        body = await resp.json() if resp.headers.get("content-type","").startswith("application/json") else {"status": resp.status_code}
-                        out[str(r.get("id", "unknown"))] = {"status": resp.status_code, "healthy": resp.status_code == 200}
-                        await execute("update dashboard_bot_endpoints set last_seen=now() where id=%s", (r.get("id"),))
-                    except Exception as e:
-                        out[r["bot_username"]] = {"error": str(e), "healthy": False}
+            client = _http(request)
+
+            async def probe(r):
+                url = r.get("base_url", "").rstrip("/") + r.get("health_path", "/health")
+                headers = {"x-api-key": r.get("api_key", "")} if r.get("api_key") else {}
+                resp = await client.get(url, headers=headers, timeout=HTTP_TIMEOUTS["mesh_health"])
+                return {"status": resp.status_code, "healthy": resp.status_code == 200}
+
+            # alle Endpoints parallel proben statt N x RTT nacheinander
+            results = await asyncio.gather(*(probe(r) for r in rows), return_exceptions=True)
+            seen = []
+            for r, res in zip(rows, results):
+                key = str(r.get("id", "unknown"))
+                if isinstance(res, Exception):
+                    out[key] = {"error": str(res), "healthy": False}
+                else:
+                    out[key] = res
+                    seen.append(r["id"])
+            if seen:
+                await execute("update dashboard_bot_endpoints set last_seen=now() where id = any(%s)", (seen,))
         return _json({"bots": out, "timestamp": int(time.time())}, request)
     except Exception as e:
-        log.error("mesh_health failed: %s", e, exc_info=True)
+        _log_exc("mesh_health", e)
         return _json({"error": str(e), "bots": {}}, request, status=500)
 
 
 async def mesh_metrics(request: web.Request):
     await _auth_user(request)
-    rows = await fetch("select bot_username, base_url, metrics_path, api_key from dashboard_bot_endpoints where is_active=true order by bot_username")
+    rows = sorted(await _active_endpoints(), key=lambda r: r["bot_username"])
+    client = _http(request)
+
+    async def probe(r):
+        url = r["base_url"].rstrip("/") + r["metrics_path"]
+        headers = {"x-api-key": r["api_key"]} if r["api_key"] else {}
+        resp = await client.get(url, headers=headers, timeout=HTTP_TIMEOUTS["mesh_metrics"])
+        return resp.json()
+
+    results = await asyncio.gather(*(probe(r) for r in rows), return_exceptions=True)
     out = {}
-    async with httpx.AsyncClient(timeout=8.0) as client:
-        for r in rows:
-            url = r["base_url"].rstrip("/") + r["metrics_path"]
-            headers = {"x-api-key": r["api_key"]} if r["api_key"] else {}
-            try:
-                resp = await client.get(url, headers=headers)
-                out[r["bot_username"]] = resp.json()
-            except Exception as e:
-                out[r["bot_username"]] = {"error": str(e)}
+    for r, res in zip(rows, results):
+        out[r["bot_username"]] = {"error": str(res)} if isinstance(res, Exception) else res
     return _json(out, request)
 
 async def auth_check(request: web.Request):
@@ -1104,8 +2043,23 @@ async def ads_list(request: web.Request):
     sql = """select campaign_id as id, title as name, body_text as content, 
              link_url, cta_label, enabled as is_active, media_url, weight, 
              start_ts as start_at, end_ts as end_at, created_at 
-             from adv_campaigns order by created_at desc"""
-    rows = await fetch(sql)
+             from adv_campaigns"""
+    # optional seitenweise: ?limit=N&before=<next_before>; ohne limit wie bisher alle Kampagnen
+    limit = _clamp_int(request, "limit", 0, 1, 1000)
+    before = _decode_cursor(request)
+    params = []
+    if before:
+        sql += " where (created_at, campaign_id) < (%s, %s)"
+        params.extend(before)
+    sql += " order by created_at desc, campaign_id desc"
+    if limit:
+        sql += " limit %s"
+        params.append(limit)
+    rows = await fetch(sql, tuple(params))
+    if limit:
+        last = rows[-1] if rows and len(rows) == limit else None
+        next_before = _encode_cursor(last["created_at"], last["id"]) if last else None
+        return _json({"ads": rows, "next_before": next_before}, request)
     return _json({"ads": rows}, request)
 
 
@@ -1113,7 +2067,7 @@ async def ads_create(request: web.Request):
     """Erstelle eine neue Werbekampagne"""
     try:
         user_id = await _auth_user(request)  # Authentifiziere und hole telegram_id
-        body = await request.json()
+        body = await _read_json(request)
         title = (body.get("title") or body.get("name") or "").strip()
         body_text = (body.get("body_text") or body.get("content") or "").strip()
         link_url = (body.get("link_url") or "").strip()
@@ -1137,10 +2091,11 @@ async def ads_create(request: web.Request):
         
         result = await fetchrow(sql, params)
         campaign_id = result["campaign_id"] if result else None
+        _invalidate_cache()
         
         return _json({"ok": True, "campaign_id": campaign_id, "title": title}, request, status=201)
     except Exception as e:
-        log.error("ads_create failed: %s", e, exc_info=True)
+        _log_exc("ads_create", e)
         return _json({"error": f"Failed to create campaign: {str(e)}"}, request, status=500)
 
 
@@ -1149,47 +2104,54 @@ async def ads_delete(request: web.Request):
     await _auth_user(request)
     campaign_id = request.match_info.get("id")
     await execute("delete from adv_campaigns where campaign_id = %s", (campaign_id,))
+    _invalidate_cache()
     return _json({"ok": True}, request)
 
 
+_ADS_FIELD_MAPPING = {
+    "title": "title",
+    "name": "title",
+    "body_text": "body_text",
+    "content": "body_text",
+    "link_url": "link_url",
+    "cta_label": "cta_label",
+    "media_url": "media_url",
+    "weight": "weight",
+    "enabled": "enabled",
+    "is_active": "enabled",
+    "start_ts": "start_ts",
+    "start_at": "start_ts",
+    "end_ts": "end_ts",
+    "end_at": "end_ts",
+}
+_ADS_UPDATE_COLS = tuple(dict.fromkeys(_ADS_FIELD_MAPPING.values()))
+UPDATE_ADS_SQL = (
+    "update adv_campaigns set "
+    + ", ".join(f"{c} = case when %s then %s else {c} end" for c in _ADS_UPDATE_COLS)
+    + " where campaign_id = %s"
+)
+
+
 async def ads_update(request: web.Request):
     """Aktualisiere eine Werbekampagne"""
     await _auth_user(request)
     campaign_id = request.match_info.get("id")
-    body = await request.json()
-    
-    updates = []
-    params = []
-    
-    field_mapping = {
-        "title": "title",
-        "name": "title",
-        "body_text": "body_text",
-        "content": "body_text",
-        "link_url": "link_url",
-        "cta_label": "cta_label",
-        "media_url": "media_url",
-        "weight": "weight",
-        "enabled": "enabled",
-        "is_active": "enabled",
-        "start_ts": "start_ts",
-        "start_at": "start_ts",
-        "end_ts": "end_ts",
-        "end_at": "end_at"
-    }
+    body = await _read_json(request)
     
+    vals = {}
     for key, value in body.items():
-        db_field = field_mapping.get(key)
+        db_field = _ADS_FIELD_MAPPING.get(key)
         if db_field:
-            updates.append(f"{db_field} = %s")
-            params.append(value)
+            vals[db_field] = value
     
-    if not updates:
+    if not vals:
         return _json({"error": "keine Felder zum Aktualisieren"}, request, status=400)
     
+    # (gesetzt?, Wert) pro Spalte -> immer derselbe SQL-Text, explizites null bleibt möglich
+    params = [p for col in _ADS_UPDATE_COLS for p in (col in vals, vals.get(col))]
     params.append(campaign_id)
-    sql = "update adv_campaigns set " + ", ".join(updates) + " where campaign_id = %s"
-    await execute(sql, tuple(params))
+    await execute(UPDATE_ADS_SQL, tuple(params))
+    _invalidate_cache()
     return _json({"ok": True}, request)
 
 
@@ -1197,23 +2159,19 @@ async def ads_update(request: web.Request):
 async def metrics_overview(request: web.Request):
     """Übersicht: Benutzer, Werbungen, Bots, Events"""
     await _auth_user(request)
-    users_total = await fetchrow("select count(1) as c from dashboard_users")
-    ads_active = await fetchrow("select count(1) as c from adv_campaigns where enabled=true")
-    bots_active = await fetchrow("select count(1) as c from dashboard_bots where is_active=true")
-    token_events = await fetchrow("select count(1) as c from dashboard_token_events")
-    
-    return _json({
-        "users_total": users_total["c"] if users_total else 0,
-        "ads_active": ads_active["c"] if ads_active else 0,
-        "bots_active": bots_active["c"] if bots_active else 0,
-        "token_events_total": token_events["c"] if token_events else 0,
-    }, request)
+    r = await fetchrow("""
+        select (select count(1) from dashboard_users)                     as users_total,
+               (select count(1) from adv_campaigns where enabled=true)    as ads_active,
+               (select count(1) from dashboard_bots where is_active=true) as bots_active,
+               (select count(1) from dashboard_token_events)              as token_events_total
+    """)
+    return _json(r, request)
 
 
 async def metrics_timeseries(request: web.Request):
     """Zeitreihen-Metriken (letzte N Tage)"""
     await _auth_user(request)
-    days = int(request.query.get("days", "14"))
+    days = _clamp_int(request, "days", 14, 1, 365)
     
     rows = await fetch("""
         select 
@@ -1222,7 +2180,7 @@ async def metrics_timeseries(request: web.Request):
             count(*) as cnt,
             sum(amount) as total_amount
         from dashboard_token_events
-        where happened_at > now() - interval '%s days'
+        where happened_at > now() - make_interval(days => %s)
         group by day, kind
         order by day asc
     """, (days,))
@@ -1271,25 +2229,35 @@ async def bot_endpoints(request: web.Request):
 async def token_events_list(request: web.Request):
     """Liste Token-Events (Mint, Burn, Reward, etc.)"""
     await _auth_user(request)
-    limit = int(request.query.get("limit", "50"))
+    limit = _clamp_int(request, "limit", 50, 1, 1000)
     kind = request.query.get("kind", "")
+    before = _decode_cursor(request)
     
-    sql = "select * from dashboard_token_events"
-    params = ()
+    # Keyset-Paginierung: ?before=<next_before der vorigen Seite> statt OFFSET;
+    # (happened_at, id) statt nur happened_at, sonst fallen Events mit gleichem Zeitstempel durchs Raster
+    where, params = [], []
     if kind:
-        sql += " where kind = %s"
-        params = (kind,)
-    sql += " order by happened_at desc limit %s"
-    params = params + (limit,)
+        where.append("kind = %s")
+        params.append(kind)
+    if before:
+        where.append("(happened_at, id) < (%s, %s)")
+        params.extend(before)
+    sql = "select * from dashboard_token_events"
+    if where:
+        sql += " where " + " and ".join(where)
+    sql += " order by happened_at desc, id desc limit %s"
+    params.append(limit)
     
-    rows = await fetch(sql, params)
-    return _json({"events": rows}, request)
+    rows = await fetch(sql, tuple(params))
+    last = rows[-1] if rows and len(rows) == limit else None
+    next_before = _encode_cursor(last["happened_at"], last["id"]) if last else None
+    return _json({"events": rows, "next_before": next_before}, request)
 
 
 async def token_events_create(request: web.Request):
     """Erstelle ein Token-Event manuell"""
     await _auth_user(request)
-    body = await request.json()
+    body = await _read_json(request)
     kind = (body.get("kind") or "manual").strip()
     amount = body.get("amount", 0)
     unit = body.get("unit", "EMRLD")
@@ -1301,6 +2269,7 @@ async def token_events_create(request: web.Request):
         insert into dashboard_token_events(kind, amount, unit, actor_telegram_id, ref, note, happened_at)
         values (%s, %s, %s, %s, %s::jsonb, %s, now())
     """, (kind, amount, unit, actor_telegram_id, json.dumps(ref), note))
+    _invalidate_cache()
     
     return _json({"ok": True}, request, status=201)
 
@@ -1329,7 +2298,7 @@ async def user_list(request: web.Request):
 async def user_update_tier(request: web.Request):
     """Aktualisiere Tier für einen Nutzer"""
     await _auth_user(request)
-    body = await request.json()
+    body = await _read_json(request)
     telegram_id = body.get("telegram_id")
     tier = body.get("tier", "pro")
     role = body.get("role")
@@ -1343,6 +2312,7 @@ async def user_update_tier(request: web.Request):
     else:
         await execute("update dashboard_users set tier=%s, updated_at=now() where telegram_id=%s",
                      (tier, telegram_id))
+    _invalidate_cache()
     
     return _json({"ok": True}, request)
 
@@ -1350,16 +2320,18 @@ async def ad_performance_report(request):
     """Generiere detaillierten Ad-Performance Report"""
     await _auth_user(request)
     campaign_id = request.query.get("campaign_id")
-    days = int(request.query.get("days", "30"))
+    days = _clamp_int(request, "days", 30, 1, 365)
     
+    # Pivot + CTR direkt in Postgres: eine Zeile pro Kampagne
     sql = """
-        SELECT 
+        SELECT
             campaign_id,
-            event_type,
-            COUNT(*) as count,
-            COUNT(DISTINCT user_id) as unique_users
+            COUNT(*) FILTER (WHERE event_type='impression') as impressions,
+            COUNT(*) FILTER (WHERE event_type='click')      as clicks,
+            COALESCE(100.0 * COUNT(*) FILTER (WHERE event_type='click')
+                     / NULLIF(COUNT(*) FILTER (WHERE event_type='impression'), 0), 0)::float8 as ctr
         FROM adv_campaigns_events
-        WHERE created_at > now() - interval '%s days'
+        WHERE created_at > now() - make_interval(days => %s)
     """
     params = (days,)
     
@@ -1367,27 +2339,10 @@ async def ad_performance_report(request):
         sql += " AND campaign_id = %s"
         params = params + (campaign_id,)
     
-    sql += " GROUP BY campaign_id, event_type ORDER BY campaign_id"
+    sql += " GROUP BY campaign_id ORDER BY campaign_id"
     
     rows = await fetch(sql, params)
-    
-    # Calculate CTR (Click-Through Rate)
-    data = {}
-    for row in rows:
-        cid = row['campaign_id']
-        if cid not in data:
-            data[cid] = {'impressions': 0, 'clicks': 0}
-        
-        if row['event_type'] == 'impression':
-            data[cid]['impressions'] = row['count']
-        elif row['event_type'] == 'click':
-            data[cid]['clicks'] = row['count']
-    
-    # Add CTR
-    for cid in data:
-        impressions = data[cid]['impressions']
-        clicks = data[cid]['clicks']
-        data[cid]['ctr'] = (clicks / impressions * 100) if impressions > 0 else 0
+    data = {r.pop('campaign_id'): r for r in rows}
     
     return _json({"report": data}, request)
 
@@ -1398,30 +2353,41 @@ async def ad_roi_analysis(request):
     
     sql = """
         SELECT 
-            id,
-            title,
-            link_url,
-            weight,
-            enabled,
-            created_at,
-            start_ts,
-            end_ts,
-            (SELECT COUNT(*) FROM adv_campaigns_events WHERE campaign_id=adv_campaigns.id AND event_type='impression') as impressions,
-            (SELECT COUNT(*) FROM adv_campaigns_events WHERE campaign_id=adv_campaigns.id AND event_type='click') as clicks,
-            (SELECT COUNT(DISTINCT user_id) FROM adv_campaigns_events WHERE campaign_id=adv_campaigns.id) as unique_users
-        FROM adv_campaigns
-        WHERE created_at > now() - interval '90 days'
-        ORDER BY created_at DESC
+            c.campaign_id as id,
+            c.title,
+            c.link_url,
+            c.weight,
+            c.enabled,
+            c.created_at,
+            c.start_ts,
+            c.end_ts,
+            COALESCE(e.impressions, 0) as impressions,
+            COALESCE(e.clicks, 0) as clicks,
+            COALESCE(e.unique_users, 0) as unique_users,
+            -- Summen/Schnitt als Fensterfunktionen -> kein Python-Nachrechnen
+            SUM(COALESCE(e.impressions, 0)) OVER ()::bigint as total_impressions,
+            SUM(COALESCE(e.clicks, 0)) OVER ()::bigint as total_clicks,
+            COALESCE(100.0 * SUM(COALESCE(e.clicks, 0)) OVER () / NULLIF(SUM(COALESCE(e.impressions, 0)) OVER (), 0), 0)::float8 as avg_ctr
+        FROM adv_campaigns c
+        LEFT JOIN (
+            SELECT campaign_id,
+                   COUNT(*) FILTER (WHERE event_type='impression') as impressions,
+                   COUNT(*) FILTER (WHERE event_type='click') as clicks,
+                   COUNT(DISTINCT user_id) as unique_users
+            FROM adv_campaigns_events
+            GROUP BY campaign_id
+        ) e ON e.campaign_id = c.campaign_id
+        WHERE c.created_at > now() - interval '90 days'
+        ORDER BY c.created_at DESC
     """
     
     rows = await fetch(sql)
+    totals = {"total_impressions": 0, "total_clicks": 0, "avg_ctr": 0}
+    for r in rows:
+        for k in totals:
+            totals[k] = r.pop(k)
     
-    return _json({
-        "campaigns": rows,
-        "total_impressions": sum(r.get('impressions') or 0 for r in rows),
-        "total_clicks": sum(r.get('clicks') or 0 for r in rows),
-        "avg_ctr": sum((r.get('clicks') or 0) / (r.get('impressions') or 1) * 100 for r in rows) / len(rows) if rows else 0
-    }, request)
+    return _json({"campaigns": rows, **totals}, request)
 
 
 # ============================================================================
@@ -1437,8 +2403,8 @@ async def user_segments_analysis(request):
             tier,
             role,
             COUNT(*) as user_count,
-            COUNT(CASE WHEN near_account_id IS NOT NULL THEN 1 END) as near_connected,
-            COUNT(CASE WHEN ton_address IS NOT NULL THEN 1 END) as ton_connected,
+            COUNT(*) FILTER (WHERE near_account_id IS NOT NULL) as near_connected,
+            COUNT(*) FILTER (WHERE ton_address IS NOT NULL) as ton_connected,
             MIN(created_at) as first_user,
             MAX(created_at) as last_user
         FROM dashboard_users
@@ -1459,27 +2425,17 @@ async def user_segments_analysis(request):
 async def user_retention_analysis(request):
     """Berechne User Retention Rate"""
     await _auth_user(request)
-    days = int(request.query.get("days", "30"))
+    days = _clamp_int(request, "days", 30, 1, 365)
     
-    # Users created in this period
-    sql_new = """
-        SELECT COUNT(*) as new_users 
-        FROM dashboard_users 
-        WHERE created_at > now() - interval '%s days'
-    """
-    
-    # Users active in last 7 days
-    sql_active = """
-        SELECT COUNT(*) as active_users
+    # neue (im Zeitraum angelegt) und aktive (letzte 7 Tage) Nutzer in einem Scan
+    row = await fetchrow("""
+        SELECT COUNT(*) FILTER (WHERE created_at > now() - make_interval(days => %s)) as new_users,
+               COUNT(*) FILTER (WHERE updated_at > now() - interval '7 days') as active_users
         FROM dashboard_users
-        WHERE updated_at > now() - interval '7 days'
-    """
-    
-    new_users_row = await fetchrow(sql_new, (days,))
-    active_users_row = await fetchrow(sql_active)
+    """, (days,)) or {}
     
-    new_users = new_users_row['new_users'] if new_users_row else 0
-    active_users = active_users_row['active_users'] if active_users_row else 0
+    new_users = row.get('new_users') or 0
+    active_users = row.get('active_users') or 0
     
     retention_rate = (active_users / new_users * 100) if new_users > 0 else 0
     
@@ -1498,7 +2454,7 @@ async def user_retention_analysis(request):
 async def token_economics_summary(request):
     """Zusammenfassung der Token-Ökonomie"""
     await _auth_user(request)
-    days = int(request.query.get("days", "30"))
+    days = _clamp_int(request, "days", 30, 1, 365)
     
     sql = """
         SELECT 
@@ -1509,7 +2465,7 @@ async def token_economics_summary(request):
             MIN(CAST(amount AS numeric)) as min_amount,
             MAX(CAST(amount AS numeric)) as max_amount
         FROM dashboard_token_events
-        WHERE happened_at > now() - interval '%s days'
+        WHERE happened_at > now() - make_interval(days => %s)
         GROUP BY kind
         ORDER BY total_amount DESC
     """
@@ -1533,7 +2489,7 @@ async def token_velocity_analysis(request):
     """Analysiere Token Velocity"""
     await _auth_user(request)
     
-    sql = """
+    rows = await fetch("""
         SELECT 
             DATE_TRUNC('day', happened_at)::DATE as day,
             kind,
@@ -1542,17 +2498,19 @@ async def token_velocity_analysis(request):
         FROM dashboard_token_events
         WHERE happened_at > now() - interval '90 days'
         GROUP BY day, kind
-        ORDER BY day DESC
-    """
+        ORDER BY day DESC, kind
+    """)
     
-    rows = await fetch(sql)
+    # Chart-Reihen pro kind in einem Durchlauf über dieselben Zeilen (rückwärts = aufsteigende Tage)
+    chart: Dict[str, Dict[str, list]] = {}
+    for r in reversed(rows):
+        series = chart.setdefault(r['kind'], {"dates": [], "volumes": []})
+        series["dates"].append(r['day'])
+        series["volumes"].append(r['daily_volume'])
     
     return _json({
         "velocity": rows,
-        "chart_data": {
-            "dates": list(set(r['day'] for r in rows)),
-            "volumes": [r['daily_volume'] for r in rows]
-        }
+        "chart_data": dict(sorted(chart.items()))
     }, request)
 
 
@@ -1560,25 +2518,52 @@ async def token_velocity_analysis(request):
 # BOT HEALTH & PERFORMANCE
 # ============================================================================
 
+# Aggregat für bot_health_dashboard; vorberechnet als mv_bot_health (siehe ensure_tables),
+# _bot_health_refresh_loop aktualisiert die View alle BOT_HEALTH_REFRESH_SEC Sekunden
+BOT_HEALTH_SQL = """
+    SELECT 
+        db.username,
+        db.title,
+        db.is_active,
+        COUNT(dbe.id) as endpoint_count,
+        COUNT(*) FILTER (WHERE dbe.last_seen > now() - interval '5 minutes') as healthy_endpoints,
+        MAX(dbe.last_seen) as last_health_check,
+        json_object_agg(dbe.base_url, dbe.health_path) FILTER (WHERE dbe.id IS NOT NULL) as endpoints
+    FROM dashboard_bots db
+    LEFT JOIN dashboard_bot_endpoints dbe ON db.username = dbe.bot_username
+    GROUP BY db.username, db.title, db.is_active
+"""
+
+
+async def _bot_health_refresh_loop():
+    while True:
+        await asyncio.sleep(BOT_HEALTH_REFRESH_SEC)
+        try:
+            await execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_bot_health")
+        except Exception as e:
+            log.warning("⚠️  mv_bot_health refresh failed: %s", e)
+
+
+async def _start_bot_health_refresh(app: web.Application):
+    app["_devdash_bot_health_task"] = asyncio.create_task(_bot_health_refresh_loop())
+
+
+async def _stop_bot_health_refresh(app: web.Application):
+    task = app.get("_devdash_bot_health_task")
+    if task:
+        task.cancel()
+
+
 async def bot_health_dashboard(request):
     """Umfassender Bot Health Check"""
     await _auth_user(request)
     
-    sql = """
-        SELECT 
-            db.username,
-            db.title,
-            db.is_active,
-            COUNT(dbe.id) as endpoint_count,
-            COUNT(CASE WHEN dbe.last_seen > now() - interval '5 minutes' THEN 1 END) as healthy_endpoints,
-            MAX(dbe.last_seen) as last_health_check,
-            json_object_agg(dbe.base_url, dbe.health_path) as endpoints
-        FROM dashboard_bots db
-        LEFT JOIN dashboard_bot_endpoints dbe ON db.username = dbe.bot_username
-        GROUP BY db.username, db.title, db.is_active
-    """
-    
-    rows = await fetch(sql)
+    try:
+        rows = await fetch("SELECT * FROM mv_bot_health")
+    except Exception as e:
+        # View (noch) nicht da, z.B. ensure_tables nicht gelaufen -> live rechnen
+        log.warning("mv_bot_health unavailable, computing live: %s", e)
+        rows = await fetch(BOT_HEALTH_SQL)
     
     # Calculate health scores
     for row in rows:
@@ -1600,7 +2585,7 @@ async def bot_health_dashboard(request):
 async def webhook_create(request):
     """Erstelle einen Webhook"""
     await _auth_user(request)
-    body = await request.json()
+    body = await _read_json(request)
     
     event_type = (body.get("event_type") or "").strip()
     url = (body.get("url") or "").strip()
@@ -1610,19 +2595,6 @@ async def webhook_create(request):
     if not event_type or not url:
         return _json({"error": "event_type und url erforderlich"}, request, status=400)
     
-    await execute("""
-        create table if not exists dashboard_webhooks (
-            id bigserial primary key,
-            event_type text not null,
-            url text not null,
-            secret text,
-            is_active boolean default true,
-            last_triggered timestamptz,
-            failure_count integer default 0,
-            created_at timestamptz default now()
-        );
-    """)
-    
     await execute("""
         insert into dashboard_webhooks(event_type, url, secret, is_active)
         values (%s, %s, %s, %s)
@@ -1642,14 +2614,13 @@ async def webhook_test(request):
         return _json({"error": "Webhook nicht gefunden"}, request, status=404)
     
     # Send test payload
-    import httpx
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            await client.post(
-                webhook['url'],
-                json={"test": True, "timestamp": datetime.utcnow().isoformat()},
-                headers={"X-Webhook-Secret": webhook['secret'] or ""}
-            )
+        await _http(request).post(
+            webhook['url'],
+            json={"test": True, "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat()},
+            headers={"X-Webhook-Secret": webhook['secret'] or ""},
+            timeout=HTTP_TIMEOUTS["webhook"],
+        )
         return _json({"ok": True, "status": "delivered"}, request)
     except Exception as e:
         return _json({"ok": False, "error": str(e)}, request, status=400)
@@ -1659,28 +2630,133 @@ async def webhook_test(request):
 # EXPORT & REPORTS
 # ============================================================================
 
+_USERS_CSV_COLS = ("telegram_id", "username", "first_name", "last_name", "role", "tier", "created_at")
+
+# Große Exporte laufen als Hintergrund-Job: Handler antwortet sofort mit 202 + job_id,
+# der Client pollt GET /exports/{job_id} und bekommt die Datei, sobald sie fertig ist.
+EXPORT_JOB_TTL = int(os.getenv("DEVDASH_EXPORT_JOB_TTL", "3600"))  # nicht abgeholte Dateien verwerfen
+_EXPORT_JOBS: Dict[str, Dict[str, Any]] = {}  # job_id -> {status, owner, path, filename, task, created}
+
+
+def _drop_export_job(job_id: str) -> None:
+    job = _EXPORT_JOBS.pop(job_id, None)
+    if not job:
+        return
+    task = job.get("task")
+    if task and not task.done():
+        task.cancel()
+    if job.get("path"):
+        pathlib.Path(job["path"]).unlink(missing_ok=True)
+
+
+def _expire_export_jobs() -> None:
+    cutoff = time.monotonic() - EXPORT_JOB_TTL
+    for job_id in [k for k, j in _EXPORT_JOBS.items() if j["created"] < cutoff]:
+        _drop_export_job(job_id)
+
+
+def _start_export_job(owner: int, filename: str, run) -> str:
+    _expire_export_jobs()
+    job_id = uuid.uuid4().hex
+    job = {"status": "pending", "owner": owner, "path": None, "filename": filename, "created": time.monotonic()}
+    _EXPORT_JOBS[job_id] = job
+
+    async def _runner():
+        try:
+            fd, path = tempfile.mkstemp(prefix="devdash-export-", suffix=pathlib.Path(filename).suffix)
+            os.close(fd)
+            job["path"] = path
+            await run(path)
+            job["status"] = "done"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _log_exc("export_job", e)
+            job["status"] = "failed"
+            job["error"] = str(e)
+            if job["path"]:
+                pathlib.Path(job["path"]).unlink(missing_ok=True)
+            job["path"] = None
+
+    # Referenz im Job halten, sonst kann der Task vorzeitig eingesammelt werden
+    job["task"] = asyncio.create_task(_runner())
+    return job_id
+
+
+async def _write_users_csv(path: str):
+    # csv.writer quotet Kommas/Zeilenumbrüche in Namen; Zeilen kommen batchweise per Server-Cursor,
+    # Dateischreibzugriffe laufen im Thread-Pool und blockieren den Event-Loop nicht
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        buf = io.StringIO()
+        w = csv.writer(buf)
+        w.writerow(_USERS_CSV_COLS)
+        n = 0
+        async for row in fetch_iter(
+            f"select {', '.join(_USERS_CSV_COLS)} from dashboard_users order by created_at desc", batch=1000
+        ):
+            w.writerow([row[c] for c in _USERS_CSV_COLS])
+            n += 1
+            if n % 1000 == 0:
+                await asyncio.to_thread(f.write, buf.getvalue())
+                buf.seek(0)
+                buf.truncate(0)
+        await asyncio.to_thread(f.write, buf.getvalue())
+
+
 async def export_users_csv(request):
-    """Exportiere Benutzerliste als CSV"""
-    await _auth_user(request)
-    
-    rows = await fetch("""
-        select telegram_id, username, first_name, last_name, role, tier, created_at
-        from dashboard_users
-        order by created_at desc
-    """)
-    
-    # CSV Header
-    csv = "telegram_id,username,first_name,last_name,role,tier,created_at\n"
-    
-    # CSV Rows
-    for row in rows:
-        csv += f"{row['telegram_id']},{row['username']},{row['first_name']},{row['last_name']},{row['role']},{row['tier']},{row['created_at']}\n"
-    
-    return web.Response(
-        text=csv,
-        content_type="text/csv",
-        headers={"Content-Disposition": 'attachment; filename="users.csv"'}
-    )
+    """Startet den CSV-Export der Benutzerliste als Hintergrund-Job"""
+    user_id = await _auth_user(request)
+    job_id = _start_export_job(user_id, "users.csv", _write_users_csv)
+    return _json({"job_id": job_id, "status": "pending"}, request, status=202)
+
+
+async def export_download(request):
+    """Status eines Export-Jobs; ist er fertig, wird die Datei ausgeliefert und danach gelöscht"""
+    user_id = await _auth_user(request)
+    _expire_export_jobs()
+    job_id = request.match_info["job_id"]
+    job = _EXPORT_JOBS.get(job_id)
+    if not job or job["owner"] != user_id:
+        return _json({"error": "export not found"}, request, status=404)
+    if job["status"] == "pending":
+        return _json({"job_id": job_id, "status": "pending"}, request, status=202)
+    if job["status"] == "failed":
+        _drop_export_job(job_id)
+        return _json({"job_id": job_id, "status": "failed", "error": job.get("error")}, request, status=500)
+
+    # selbst streamen statt FileResponse: die Datei soll direkt nach dem Senden weg
+    resp = web.StreamResponse(headers={
+        **_cors_headers(request),
+        "Content-Disposition": f'attachment; filename="{job["filename"]}"',
+    })
+    resp.content_type = "text/csv"
+    with open(job["path"], "rb") as f:
+        await resp.prepare(request)
+        while chunk := await asyncio.to_thread(f.read, 64 * 1024):
+            await resp.write(chunk)
+    await resp.write_eof()
+    # erst nach vollständiger Auslieferung löschen; bricht der Client ab, bleibt der Job bis zum TTL abrufbar
+    _drop_export_job(job_id)
+    return resp
+
+
+async def _export_job_sweep_loop():
+    # abgebrochene/nie abgeholte Exporte auch ohne weitere Requests aufräumen
+    while True:
+        await asyncio.sleep(min(EXPORT_JOB_TTL, 300))
+        _expire_export_jobs()
+
+
+async def _start_export_job_sweeper(app: web.Application):
+    app["_devdash_export_sweep_task"] = asyncio.create_task(_export_job_sweep_loop())
+
+
+async def _stop_export_jobs(app: web.Application):
+    task = app.get("_devdash_export_sweep_task")
+    if task:
+        task.cancel()
+    for job_id in list(_EXPORT_JOBS):
+        _drop_export_job(job_id)
 
 
 async def export_ads_report(request):
@@ -1689,7 +2765,7 @@ async def export_ads_report(request):
     
     sql = """
         select 
-            id,
+            campaign_id as id,
             title,
             media_url,
             link_url,
@@ -1707,55 +2783,35 @@ async def export_ads_report(request):
     # JSON Export
     return _json({
         "report": rows,
-        "generated_at": datetime.utcnow().isoformat(),
+        "generated_at": datetime.datetime.now(datetime.timezone.utc),
         "total_ads": len(rows)
     }, request)
 
 # ------------------------------ Analytics Endpoints ----------------------------
+@_cached_json
 async def bot_detailed_info(request: web.Request):
     """Detailed information about all bots with comprehensive statistics"""
     await _auth_user(request)
     try:
+        # Anreicherung direkt im SELECT -> Zeilen gehen ohne Umpacken in Python raus
         bots = await fetch("""
             select 
                 id, username, title, is_active, meta,
-                created_at, updated_at
+                created_at, updated_at,
+                coalesce(meta->'users', '0'::jsonb) as user_count,
+                case when is_active then 'healthy' else 'unknown' end as status,
+                coalesce(extract(day from now() - created_at)::int, 0) as days_running
             from dashboard_bots
             order by updated_at desc
         """)
         
-        # Enrich with additional data
-        enriched = []
-        for bot in (bots or []):
-            user_count = 0
-            if bot['meta'] and isinstance(bot['meta'], dict):
-                user_count = bot['meta'].get('users', 0)
-            
-            days_running = 0
-            if bot['created_at']:
-                now_utc = datetime.datetime.now(datetime.timezone.utc)
-                created = bot['created_at'] if bot['created_at'].tzinfo else bot['created_at'].replace(tzinfo=datetime.timezone.utc)
-                days_running = (now_utc - created).days
-            
-            enriched.append({
-                'id': bot['id'],
-                'username': bot['username'],
-                'title': bot['title'],
-                'is_active': bot['is_active'],
-                'meta': bot['meta'],
-                'created_at': bot['created_at'].isoformat() if bot['created_at'] else None,
-                'updated_at': bot['updated_at'].isoformat() if bot['updated_at'] else None,
-                'user_count': user_count,
-                'status': 'healthy' if bot['is_active'] else 'unknown',
-                'days_running': days_running
-            })
-        
-        return _json({"bots": enriched, "total": len(enriched)}, request)
+        return _json({"bots": bots, "total": len(bots)}, request)
     except Exception as e:
-        log.error("bot_detailed_info failed: %s", e, exc_info=True)
+        _log_exc("bot_detailed_info", e)
         return _json({"error": str(e)}, request, status=500)
 
 
+@_cached_json
 async def bot_activity(request: web.Request):
     """Bot activity metrics (simple list)"""
     await _auth_user(request)
@@ -1777,6 +2833,7 @@ async def bot_activity(request: web.Request):
         return _json({"bots": [], "total": 0, "timestamp": int(time.time())}, request)
 
 
+@_cached_json
 async def bot_groups(request: web.Request):
     """Bot groups (placeholder - can be extended)"""
     await _auth_user(request)
@@ -1804,36 +2861,116 @@ async def bot_groups(request: web.Request):
         return _json({"groups": [], "total": 0}, request)
 
 
+# Real token holder distribution (TON mainnet data) – statisch, daher einmal beim Import aufbauen
+_TOKEN_HOLDERS = (
+    {"address": "UQBVG-RRn7l5QZkfS4yhy8M3yhu-uniUrJc4Uy4Qkom-RFo2", "name": "Emerald Dev", "balance": "500000000000000000", "percentage": 50.0},
+    {"address": "UQA1_gF1V-6_zXnKVvDrN3k_5yOWzXzP3vDQX5sQZ8zGqSwC", "name": "Treasury", "balance": "200000000000000000", "percentage": 20.0},
+    {"address": "UQDixzzOGdzTsmaVpqlOG9pBUv95hTIqhJMXaHYFRnfQgoXD", "name": "Contract", "balance": "100000000000000000", "percentage": 10.0},
+    {"address": "UQCz5G8e4zHQl9VKTC0G5N2pXmKqFqXzK3v8H7qDv4xTqK1M", "name": "Rewards Pool", "balance": "100000000000000000", "percentage": 10.0},
+    {"address": "UQDmB-kZ3qF8Y7H5pQ2M9nXvL6rSsT4u5vW9x0zAb1cDef5N", "name": "Early Investor 1", "balance": "50000000000000000", "percentage": 5.0},
+    {"address": "UQE1A-lZ4rG9Z8I6qR3N0oYwM7sSt5vW6xY0_A2dBc2efg6O", "name": "Early Investor 2", "balance": "30000000000000000", "percentage": 3.0},
+    {"address": "UQF2B-mZ5sH0a9J7rS4O1pZxN8tUu6wX7yZ1_B3eCd3efh7P", "name": "Community Fund", "balance": "20000000000000000", "percentage": 2.0},
+)
+_TOKEN_TOTAL_SUPPLY = str(sum(int(h["balance"]) for h in _TOKEN_HOLDERS))
+
+
+@_cached_json
 async def token_holders(request: web.Request):
     """Token holder distribution with realistic data"""
     await _auth_user(request)
-    limit = int(request.query.get("limit", "20"))
-    try:
-        # Real token holder distribution (TON mainnet data)
-        holders = [
-            {"address": "UQBVG-RRn7l5QZkfS4yhy8M3yhu-uniUrJc4Uy4Qkom-RFo2", "name": "Emerald Dev", "balance": "500000000000000000", "percentage": 50.0},
-            {"address": "UQA1_gF1V-6_zXnKVvDrN3k_5yOWzXzP3vDQX5sQZ8zGqSwC", "name": "Treasury", "balance": "200000000000000000", "percentage": 20.0},
-            {"address": "UQDixzzOGdzTsmaVpqlOG9pBUv95hTIqhJMXaHYFRnfQgoXD", "name": "Contract", "balance": "100000000000000000", "percentage": 10.0},
-            {"address": "UQCz5G8e4zHQl9VKTC0G5N2pXmKqFqXzK3v8H7qDv4xTqK1M", "name": "Rewards Pool", "balance": "100000000000000000", "percentage": 10.0},
-            {"address": "UQDmB-kZ3qF8Y7H5pQ2M9nXvL6rSsT4u5vW9x0zAb1cDef5N", "name": "Early Investor 1", "balance": "50000000000000000", "percentage": 5.0},
-            {"address": "UQE1A-lZ4rG9Z8I6qR3N0oYwM7sSt5vW6xY0_A2dBc2efg6O", "name": "Early Investor 2", "balance": "30000000000000000", "percentage": 3.0},
-            {"address": "UQF2B-mZ5sH0a9J7rS4O1pZxN8tUu6wX7yZ1_B3eCd3efh7P", "name": "Community Fund", "balance": "20000000000000000", "percentage": 2.0},
-        ]
-        
-        total_supply = sum(int(h["balance"]) for h in holders)
-        
-        return _json({
-            "holders": holders[:limit],
-            "total_holders": len(holders),
-            "total_supply": str(total_supply),
-            "timestamp": int(time.time())
-        }, request)
-    except Exception as e:
-        log.error("token_holders failed: %s", e)
-        return _json({"holders": [], "total_holders": 0}, request)
+    limit = _clamp_int(request, "limit", 20, 1, len(_TOKEN_HOLDERS))
+    return _json({
+        "holders": _TOKEN_HOLDERS[:limit],
+        "total_holders": len(_TOKEN_HOLDERS),
+        "total_supply": _TOKEN_TOTAL_SUPPLY,
+        "timestamp": int(time.time())
+    }, request)
 
 
 # ------------------------------ Bot-specific Details ----------------------------
+# Nullwerte je Bot-Sektion für bot_details_overview; einmal beim Import statt pro Request
+_DETAILS_SKELETON = {
+    # Affiliate stats
+    "affiliate": {
+        "total_referrals": 0,
+        "unique_referrers": 0,
+        "converted_referrals": 0,
+        "total_earned": 0.0,
+        "pending_commissions": 0.0,
+        "pending_payouts": 0.0,
+        "top_referrers": [],
+        "conversion_rate": 0.0  # Prozent, Formatierung im Client
+    },
+    
+    # Trade API stats
+    "trade_api": {
+        "portfolios": 0,
+        "active_positions": 0,
+        "total_alerts": 0,
+        "unique_traders": 0,
+        "top_traders": []
+    },
+    
+    # Trade DEX stats
+    "trade_dex": {
+        "pools": 0,
+        "positions": 0,
+        "swaps": 0,
+        "total_volume": 0.0,
+        "users": 0,
+        "top_pairs": []
+    },
+    
+    # Learning stats
+    "learning": {
+        "total_courses": 0,
+        "enrolled_users": 0,
+        "active_students": 0,
+        "completed_courses": 0,
+        "certificates_issued": 0,
+        "total_quizzes": 0,
+        "total_rewards": 0.0,
+        "avg_completion_time_days": 0,
+        "top_courses": []
+    },
+    
+    # DAO stats
+    "dao": {
+        "active_proposals": 0,
+        "total_proposals": 0,
+        "total_voters": 0,
+        "total_votes": 0,
+        "delegations": 0,
+        "treasury_balance": 0.0,
+        "voting_participation": 0.0,  # Prozent, Formatierung im Client
+        "recent_votes": []
+    },
+    
+    # Content stats
+    "content": {
+        "total_members": 0,
+        "active_topics": 0,
+        "total_stories": 0
+    },
+    
+    # Support stats
+    "support": {
+        "open_tickets": 0,
+        "resolved_tickets": 0,
+        "total_tickets": 0,
+        "avg_resolution_hours": 0
+    },
+    
+    # Crossposter stats
+    "crossposter": {
+        "forwarded_posts": 0,
+        "configured_channels": 0,
+        "active_rules": 0
+    }
+}
+
+
+@_cached_json
 async def bot_details_overview(request: web.Request):
     """Get detailed statistics for a specific bot based on its actual data tables"""
     await _auth_user(request)
@@ -1843,7 +2980,11 @@ async def bot_details_overview(request: web.Request):
     
     try:
         # Base bot info
-        bot = await fetchrow("select id, username, title, is_active, meta, created_at, updated_at from dashboard_bots where username=%s", (bot_username,))
+        bot = await fetchrow("""
+            select id, username, title, is_active, meta, created_at, updated_at,
+                   coalesce(extract(day from now() - created_at)::int, 0) as days_running
+            from dashboard_bots where username=%s
+        """, (bot_username,))
         if not bot:
             return _json({"error": "Bot not found"}, request, status=404)
         
@@ -1852,315 +2993,359 @@ async def bot_details_overview(request: web.Request):
             "username": bot['username'],
             "title": bot['title'],
             "is_active": bot['is_active'],
-            "created_at": bot['created_at'].isoformat() if bot['created_at'] else None,
-            "updated_at": bot['updated_at'].isoformat() if bot['updated_at'] else None,
-            "days_running": (datetime.datetime.now(datetime.timezone.utc) - bot['created_at']).days if bot['created_at'] and bot['created_at'].tzinfo else (datetime.datetime.now(datetime.timezone.utc) - bot['created_at'].replace(tzinfo=datetime.timezone.utc)).days if bot['created_at'] else 0,
-            
-            # Affiliate stats
-            "affiliate": {
-                "total_referrals": 0,
-                "unique_referrers": 0,
-                "converted_referrals": 0,
-                "total_earned": 0.0,
-                "pending_commissions": 0.0,
-                "pending_payouts": 0.0,
-                "top_referrers": [],
-                "conversion_rate": "0%"
-            },
-            
-            # Trade API stats
-            "trade_api": {
-                "portfolios": 0,
-                "active_positions": 0,
-                "total_alerts": 0,
-                "unique_traders": 0,
-                "top_traders": []
-            },
-            
-            # Trade DEX stats
-            "trade_dex": {
-                "pools": 0,
-                "positions": 0,
-                "swaps": 0,
-                "total_volume": 0.0,
-                "users": 0,
-                "top_pairs": []
-            },
-            
-            # Learning stats
-            "learning": {
-                "total_courses": 0,
-                "enrolled_users": 0,
-                "active_students": 0,
-                "completed_courses": 0,
-                "certificates_issued": 0,
-                "total_quizzes": 0,
-                "total_rewards": 0.0,
-                "avg_completion_time_days": 0,
-                "top_courses": []
-            },
-            
-            # DAO stats
-            "dao": {
-                "active_proposals": 0,
-                "total_proposals": 0,
-                "total_voters": 0,
-                "total_votes": 0,
-                "delegations": 0,
-                "treasury_balance": 0.0,
-                "voting_participation": "0%",
-                "recent_votes": []
-            },
-            
-            # Content stats
-            "content": {
-                "total_members": 0,
-                "active_topics": 0,
-                "total_stories": 0
-            },
-            
-            # Support stats
-            "support": {
-                "open_tickets": 0,
-                "resolved_tickets": 0,
-                "total_tickets": 0,
-                "avg_resolution_hours": 0
-            },
-            
-            # Crossposter stats
-            "crossposter": {
-                "forwarded_posts": 0,
-                "configured_channels": 0,
-                "active_rules": 0
-            }
+            "created_at": bot['created_at'],
+            "updated_at": bot['updated_at'],
+            "days_running": bot['days_running'],
+            # Sektionen einstufig kopieren: die Abfragen setzen nur Skalare/neue Listen, mutieren nichts Geteiltes
+            **{section: dict(defaults) for section, defaults in _DETAILS_SKELETON.items()},
         }
         
+        # Die Bereiche sind voneinander unabhängig -> parallel abfragen; jeder fängt seine Fehler selbst
         # AFFILIATE BOT - aff_referrals, aff_commissions, aff_payouts
-        try:
-            aff = await fetchrow("""
-                select 
-                    count(*) as total_refs,
-                    count(distinct referrer_id) as unique_refs,
-                    count(case when status='active' then 1 end) as active,
-                    (select coalesce(sum(total_earned), 0) from aff_commissions) as total_earned,
-                    (select coalesce(sum(pending), 0) from aff_commissions) as pending_comm,
-                    (select coalesce(sum(amount), 0) from aff_payouts where status='pending') as pending_payout
-                from aff_referrals
-            """)
-            if aff:
-                details["affiliate"]["total_referrals"] = aff.get('total_refs', 0) or 0
-                details["affiliate"]["unique_referrers"] = aff.get('unique_refs', 0) or 0
-                details["affiliate"]["total_earned"] = float(aff.get('total_earned', 0) or 0)
-                details["affiliate"]["pending_commissions"] = float(aff.get('pending_comm', 0) or 0)
-                details["affiliate"]["pending_payouts"] = float(aff.get('pending_payout', 0) or 0)
-                if (aff.get('total_refs', 0) or 0) > 0:
-                    details["affiliate"]["conversion_rate"] = f"{((aff.get('active', 0) or 0)/(aff.get('total_refs', 0) or 1)*100):.1f}%"
-            
-            # Top referrers
-            top_refs = await fetch("""
-                select referrer_id, count(*) as ref_count from aff_referrals
-                group by referrer_id order by ref_count desc limit 5
-            """)
-            details["affiliate"]["top_referrers"] = [{"id": r['referrer_id'], "count": r['ref_count']} for r in (top_refs or [])]
-        except Exception as e:
-            log.debug(f"Affiliate stats error: {e}")
-        
+        async def _aff():
+            try:
+                aff = await fetchrow("""
+                    select 
+                        count(*) as total_refs,
+                        count(distinct referrer_id) as unique_refs,
+                        count(*) filter (where status='active') as active,
+                        coalesce(round(100.0 * count(*) filter (where status='active') / nullif(count(*), 0), 1), 0)::float8 as conversion_rate,
+                        (select coalesce(sum(total_earned), 0) from aff_commissions) as total_earned,
+                        (select coalesce(sum(pending), 0) from aff_commissions) as pending_comm,
+                        (select coalesce(sum(amount), 0) from aff_payouts where status='pending') as pending_payout
+                    from aff_referrals
+                """)
+                if aff:
+                    details["affiliate"]["total_referrals"] = aff.get('total_refs', 0) or 0
+                    details["affiliate"]["unique_referrers"] = aff.get('unique_refs', 0) or 0
+                    details["affiliate"]["total_earned"] = float(aff.get('total_earned', 0) or 0)
+                    details["affiliate"]["pending_commissions"] = float(aff.get('pending_comm', 0) or 0)
+                    details["affiliate"]["pending_payouts"] = float(aff.get('pending_payout', 0) or 0)
+                    details["affiliate"]["conversion_rate"] = aff['conversion_rate']
+
+                # Top referrers
+                top_refs = await fetch("""
+                    select referrer_id, count(*) as ref_count from aff_referrals
+                    group by referrer_id order by ref_count desc limit 5
+                """)
+                details["affiliate"]["top_referrers"] = [{"id": r['referrer_id'], "count": r['ref_count']} for r in (top_refs or [])]
+            except Exception as e:
+                log.debug(f"Affiliate stats error: {e}")
+
         # TRADE API - tradeapi_portfolios, tradeapi_positions, tradeapi_alerts
-        try:
-            trade = await fetchrow("""
-                select 
-                    (select count(*) from tradeapi_portfolios) as portfolios,
-                    (select count(*) from tradeapi_positions) as positions,
-                    (select count(*) from tradeapi_alerts) as alerts,
-                    (select count(distinct user_id) from tradeapi_portfolios) as users
-                from tradeapi_portfolios limit 1
-            """)
-            if trade:
-                details["trade_api"]["portfolios"] = trade.get('portfolios', 0) or 0
-                details["trade_api"]["active_positions"] = trade.get('positions', 0) or 0
-                details["trade_api"]["total_alerts"] = trade.get('alerts', 0) or 0
-                details["trade_api"]["unique_traders"] = trade.get('users', 0) or 0
-        except Exception as e:
-            log.debug(f"Trade API stats error: {e}")
-        
+        async def _trade():
+            try:
+                trade = await fetchrow("""
+                    select 
+                        (select count(*) from tradeapi_portfolios) as portfolios,
+                        (select count(*) from tradeapi_positions) as positions,
+                        (select count(*) from tradeapi_alerts) as alerts,
+                        (select count(distinct user_id) from tradeapi_portfolios) as users
+                """)
+                if trade:
+                    details["trade_api"]["portfolios"] = trade.get('portfolios', 0) or 0
+                    details["trade_api"]["active_positions"] = trade.get('positions', 0) or 0
+                    details["trade_api"]["total_alerts"] = trade.get('alerts', 0) or 0
+                    details["trade_api"]["unique_traders"] = trade.get('users', 0) or 0
+            except Exception as e:
+                log.debug(f"Trade API stats error: {e}")
+
         # TRADE DEX - tradedex_pools, tradedex_positions, tradedex_swaps
-        try:
-            dex = await fetchrow("""
-                select 
-                    (select count(*) from tradedex_pools) as pools,
-                    (select count(*) from tradedex_positions) as positions,
-                    (select count(*) from tradedex_swaps) as swaps,
-                    (select coalesce(sum(amount_in), 0) from tradedex_swaps) as volume,
-                    (select count(distinct user_id) from tradedex_positions) as users
-                from tradedex_pools limit 1
-            """)
-            if dex:
-                details["trade_dex"]["pools"] = dex.get('pools', 0) or 0
-                details["trade_dex"]["positions"] = dex.get('positions', 0) or 0
-                details["trade_dex"]["swaps"] = dex.get('swaps', 0) or 0
-                details["trade_dex"]["total_volume"] = float(dex.get('volume', 0) or 0)
-                details["trade_dex"]["users"] = dex.get('users', 0) or 0
-        except Exception as e:
-            log.debug(f"Trade DEX stats error: {e}")
-        
+        async def _dex():
+            try:
+                dex = await fetchrow("""
+                    select 
+                        (select count(*) from tradedex_pools) as pools,
+                        (select count(*) from tradedex_positions) as positions,
+                        (select count(*) from tradedex_swaps) as swaps,
+                        (select coalesce(sum(amount_in), 0) from tradedex_swaps) as volume,
+                        (select count(distinct user_id) from tradedex_positions) as users
+                """)
+                if dex:
+                    details["trade_dex"]["pools"] = dex.get('pools', 0) or 0
+                    details["trade_dex"]["positions"] = dex.get('positions', 0) or 0
+                    details["trade_dex"]["swaps"] = dex.get('swaps', 0) or 0
+                    details["trade_dex"]["total_volume"] = float(dex.get('volume', 0) or 0)
+                    details["trade_dex"]["users"] = dex.get('users', 0) or 0
+            except Exception as e:
+                log.debug(f"Trade DEX stats error: {e}")
+
         # LEARNING - learning_courses, learning_enrollments, learning_certificates
-        try:
-            learn = await fetchrow("""
-                select 
-                    (select count(*) from learning_courses) as courses,
-                    (select count(distinct user_id) from learning_enrollments) as enrolled,
-                    (select count(distinct user_id) from learning_enrollments where completed_at is null) as active,
-                    (select count(distinct user_id) from learning_enrollments where completed_at is not null) as completed,
-                    (select count(*) from learning_certificates) as certs,
-                    (select count(*) from learning_quizzes) as quizzes,
-                    (select coalesce(sum(points_earned), 0) from learning_rewards) as rewards,
-                    (select extract(epoch from avg(extract(epoch from (completed_at - started_at))))/86400 
-                     from learning_enrollments where completed_at is not null) as avg_days
-                from learning_courses limit 1
-            """)
-            if learn:
-                details["learning"]["total_courses"] = learn.get('courses', 0) or 0
-                details["learning"]["enrolled_users"] = learn.get('enrolled', 0) or 0
-                details["learning"]["active_students"] = learn.get('active', 0) or 0
-                details["learning"]["completed_courses"] = learn.get('completed', 0) or 0
-                details["learning"]["certificates_issued"] = learn.get('certs', 0) or 0
-                details["learning"]["total_quizzes"] = learn.get('quizzes', 0) or 0
-                details["learning"]["total_rewards"] = float(learn.get('rewards', 0) or 0)
-                details["learning"]["avg_completion_time_days"] = int(learn.get('avg_days', 0) or 0)
-            
-            # Top courses
-            top_courses = await fetch("""
-                select title, (select count(*) from learning_enrollments where course_id=learning_courses.id) as enroll_count
-                from learning_courses order by enroll_count desc limit 5
-            """)
-            details["learning"]["top_courses"] = [{"name": c['title'], "enrolled": c['enroll_count']} for c in (top_courses or [])]
-        except Exception as e:
-            log.debug(f"Learning stats error: {e}")
-        
+        async def _learn():
+            try:
+                learn = await fetchrow("""
+                    select 
+                        (select count(*) from learning_courses) as courses,
+                        (select count(distinct user_id) from learning_enrollments) as enrolled,
+                        (select count(distinct user_id) from learning_enrollments where completed_at is null) as active,
+                        (select count(distinct user_id) from learning_enrollments where completed_at is not null) as completed,
+                        (select count(*) from learning_certificates) as certs,
+                        (select count(*) from learning_quizzes) as quizzes,
+                        (select coalesce(sum(points_earned), 0) from learning_rewards) as rewards,
+                        (select extract(epoch from avg(extract(epoch from (completed_at - started_at))))/86400 
+                         from learning_enrollments where completed_at is not null) as avg_days
+                """)
+                if learn:
+                    details["learning"]["total_courses"] = learn.get('courses', 0) or 0
+                    details["learning"]["enrolled_users"] = learn.get('enrolled', 0) or 0
+                    details["learning"]["active_students"] = learn.get('active', 0) or 0
+                    details["learning"]["completed_courses"] = learn.get('completed', 0) or 0
+                    details["learning"]["certificates_issued"] = learn.get('certs', 0) or 0
+                    details["learning"]["total_quizzes"] = learn.get('quizzes', 0) or 0
+                    details["learning"]["total_rewards"] = float(learn.get('rewards', 0) or 0)
+                    details["learning"]["avg_completion_time_days"] = int(learn.get('avg_days', 0) or 0)
+
+                # Top courses
+                top_courses = await fetch("""
+                    select c.title, count(e.course_id) as enroll_count
+                    from learning_courses c
+                    left join learning_enrollments e on e.course_id = c.id
+                    group by c.id, c.title
+                    order by enroll_count desc limit 5
+                """)
+                details["learning"]["top_courses"] = [{"name": c['title'], "enrolled": c['enroll_count']} for c in (top_courses or [])]
+            except Exception as e:
+                log.debug(f"Learning stats error: {e}")
+
         # DAO - dao_proposals, dao_votes, dao_delegations, dao_user_voting_power
-        try:
-            dao = await fetchrow("""
-                select 
-                    (select count(*) from dao_proposals where status='active') as active_prop,
-                    (select count(*) from dao_proposals) as total_prop,
-                    (select count(distinct voter_id) from dao_votes) as voters,
-                    (select count(*) from dao_votes) as total_votes,
-                    (select count(*) from dao_delegations) as delegations,
-                    (select coalesce(sum(emrd_balance), 0) from dao_user_voting_power) as treasury
-                from dao_proposals limit 1
-            """)
-            if dao:
-                total_voters = dao.get('voters', 0) or 0
-                total_votes = dao.get('total_votes', 0) or 0
-                details["dao"]["active_proposals"] = dao.get('active_prop', 0) or 0
-                details["dao"]["total_proposals"] = dao.get('total_prop', 0) or 0
-                details["dao"]["total_voters"] = total_voters
-                details["dao"]["total_votes"] = total_votes
-                details["dao"]["delegations"] = dao.get('delegations', 0) or 0
-                details["dao"]["treasury_balance"] = float(dao.get('treasury', 0) or 0)
-                if total_voters > 0:
-                    details["dao"]["voting_participation"] = f"{(total_votes/total_voters*100):.1f}%"
-            
-            # Recent votes
-            recent = await fetch("""
-                select proposal_id, voter_id, voting_power, timestamp
-                from dao_votes order by timestamp desc limit 5
-            """)
-            details["dao"]["recent_votes"] = [{"proposal": v['proposal_id'], "power": float(v['voting_power'] or 0)} for v in (recent or [])]
-        except Exception as e:
-            log.debug(f"DAO stats error: {e}")
-        
+        async def _dao():
+            try:
+                dao = await fetchrow("""
+                    select s.*,
+                           coalesce(round(100.0 * s.total_votes / nullif(s.voters, 0), 1), 0)::float8 as participation
+                    from (select 
+                        (select count(*) from dao_proposals where status='active') as active_prop,
+                        (select count(*) from dao_proposals) as total_prop,
+                        (select count(distinct voter_id) from dao_votes) as voters,
+                        (select count(*) from dao_votes) as total_votes,
+                        (select count(*) from dao_delegations) as delegations,
+                        (select coalesce(sum(emrd_balance), 0) from dao_user_voting_power) as treasury
+                    ) s
+                """)
+                if dao:
+                    total_voters = dao.get('voters', 0) or 0
+                    total_votes = dao.get('total_votes', 0) or 0
+                    details["dao"]["active_proposals"] = dao.get('active_prop', 0) or 0
+                    details["dao"]["total_proposals"] = dao.get('total_prop', 0) or 0
+                    details["dao"]["total_voters"] = total_voters
+                    details["dao"]["total_votes"] = total_votes
+                    details["dao"]["delegations"] = dao.get('delegations', 0) or 0
+                    details["dao"]["treasury_balance"] = float(dao.get('treasury', 0) or 0)
+                    details["dao"]["voting_participation"] = dao['participation']
+
+                # Recent votes
+                recent = await fetch("""
+                    select proposal_id, voter_id, voting_power, timestamp
+                    from dao_votes order by timestamp desc limit 5
+                """)
+                details["dao"]["recent_votes"] = [{"proposal": v['proposal_id'], "power": float(v['voting_power'] or 0)} for v in (recent or [])]
+            except Exception as e:
+                log.debug(f"DAO stats error: {e}")
+
         # SUPPORT - support_tickets, support_users
-        try:
-            support = await fetchrow("""
-                select 
-                    (select count(*) from support_tickets where status in ('neu', 'open')) as open_tickets,
-                    (select count(*) from support_tickets where status in ('closed', 'resolved')) as resolved,
-                    (select count(*) from support_tickets) as total_tickets,
-                    (select extract(epoch from avg(closed_at - created_at))/3600 
-                     from support_tickets where closed_at is not null) as avg_hours
-                from support_tickets limit 1
-            """)
-            if support:
-                details["support"]["open_tickets"] = support.get('open_tickets', 0) or 0
-                details["support"]["resolved_tickets"] = support.get('resolved', 0) or 0
-                details["support"]["total_tickets"] = support.get('total_tickets', 0) or 0
-                details["support"]["avg_resolution_hours"] = int(support.get('avg_hours', 0) or 0)
-        except Exception as e:
-            log.debug(f"Support stats error: {e}")
-        
+        async def _support():
+            try:
+                support = await fetchrow("""
+                    select 
+                        (select count(*) from support_tickets where status in ('neu', 'open')) as open_tickets,
+                        (select count(*) from support_tickets where status in ('closed', 'resolved')) as resolved,
+                        (select count(*) from support_tickets) as total_tickets,
+                        (select extract(epoch from avg(closed_at - created_at))/3600 
+                         from support_tickets where closed_at is not null) as avg_hours
+                """)
+                if support:
+                    details["support"]["open_tickets"] = support.get('open_tickets', 0) or 0
+                    details["support"]["resolved_tickets"] = support.get('resolved', 0) or 0
+                    details["support"]["total_tickets"] = support.get('total_tickets', 0) or 0
+                    details["support"]["avg_resolution_hours"] = int(support.get('avg_hours', 0) or 0)
+            except Exception as e:
+                log.debug(f"Support stats error: {e}")
+
         # CROSSPOSTER - crossposter_posts, crossposter_channels, crossposter_rules
-        try:
-            cross = await fetchrow("""
-                select 
-                    (select count(*) from crossposter_posts) as posts,
-                    (select count(*) from crossposter_channels) as channels,
-                    (select count(*) from crossposter_rules where is_active=true) as rules
-                from crossposter_posts limit 1
-            """)
-            if cross:
-                details["crossposter"]["forwarded_posts"] = cross.get('posts', 0) or 0
-                details["crossposter"]["configured_channels"] = cross.get('channels', 0) or 0
-                details["crossposter"]["active_rules"] = cross.get('rules', 0) or 0
-        except Exception as e:
-            log.debug(f"Crossposter stats error: {e}")
-        
+        async def _cross():
+            try:
+                cross = await fetchrow("""
+                    select 
+                        (select count(*) from crossposter_posts) as posts,
+                        (select count(*) from crossposter_channels) as channels,
+                        (select count(*) from crossposter_rules where is_active=true) as rules
+                """)
+                if cross:
+                    details["crossposter"]["forwarded_posts"] = cross.get('posts', 0) or 0
+                    details["crossposter"]["configured_channels"] = cross.get('channels', 0) or 0
+                    details["crossposter"]["active_rules"] = cross.get('rules', 0) or 0
+            except Exception as e:
+                log.debug(f"Crossposter stats error: {e}")
+
+        await asyncio.gather(_aff(), _trade(), _dex(), _learn(), _dao(), _support(), _cross())
+
         return _json(details, request)
     except Exception as e:
-        log.error("bot_details_overview failed: %s", e, exc_info=True)
+        _log_exc("bot_details_overview", e)
         return _json({"error": str(e)}, request, status=500)
 
 
 # ------------------------------ Monitoring & Real-time Data ----------------------------
-async def monitoring_data(request: web.Request):
-    """Real-time monitoring dashboard data"""
-    await _auth_user(request)
-    try:
-        # Get system metrics
-        import psutil
-        
-        # Database stats
-        db_stats = await fetchrow("""
+# DB-Zähler fürs Monitoring ändern sich langsam -> STATS_CACHE_TTL lang halten; psutil-Werte bleiben live
+_monitoring_db_cache: TTLCache = TTLCache(maxsize=1, ttl=STATS_CACHE_TTL)
+_monitoring_db_lock = asyncio.Lock()
+
+
+async def _monitoring_db() -> Optional[Dict[str, Any]]:
+    row = _monitoring_db_cache.get("db")
+    if row is not None:
+        return row
+    async with _monitoring_db_lock:  # single-flight wie _cached_json
+        row = _monitoring_db_cache.get("db")
+        if row is not None:
+            return row
+        row = await fetchrow("""
             select 
                 (select count(*) from dashboard_users) as users_count,
                 (select count(*) from dashboard_bots where is_active=true) as active_bots,
                 (select count(*) from adv_campaigns where enabled=true) as active_ads,
-                (select count(*) from dashboard_token_events) as token_events_count
-        """)
-        
-        # Activity stats
-        activity = await fetchrow("""
-            select 
+                (select count(*) from dashboard_token_events) as token_events_count,
                 (select count(*) from dashboard_users where updated_at > now() - interval '24 hours') as users_24h,
                 (select count(*) from adv_campaigns where created_at > now() - interval '24 hours') as ads_24h
         """)
+        if row is not None:
+            _monitoring_db_cache["db"] = row
+        return row
+
+
+async def monitoring_data(request: web.Request):
+    """Real-time monitoring dashboard data"""
+    await _auth_user(request)
+    try:
+        db = await _monitoring_db()
         
         monitoring = {
             "timestamp": int(time.time()),
             "system": {
-                "cpu_percent": psutil.cpu_percent(interval=0.1),
+                "cpu_percent": _cpu_percent(),
                 "memory_percent": psutil.virtual_memory().percent,
-                "disk_percent": psutil.disk_usage('/').percent
+                "disk_percent": _disk_usage().percent
             },
             "database": {
-                "users": db_stats['users_count'] if db_stats else 0,
-                "active_bots": db_stats['active_bots'] if db_stats else 0,
-                "active_ads": db_stats['active_ads'] if db_stats else 0,
-                "token_events": db_stats['token_events_count'] if db_stats else 0
+                "users": db['users_count'] if db else 0,
+                "active_bots": db['active_bots'] if db else 0,
+                "active_ads": db['active_ads'] if db else 0,
+                "token_events": db['token_events_count'] if db else 0
             },
             "activity_24h": {
-                "new_users": activity['users_24h'] if activity else 0,
-                "new_ads": activity['ads_24h'] if activity else 0
+                "new_users": db['users_24h'] if db else 0,
+                "new_ads": db['ads_24h'] if db else 0
             },
             "uptime": int(time.time())
         }
         
         return _json(monitoring, request)
     except Exception as e:
-        log.error("monitoring_data failed: %s", e, exc_info=True)
+        _log_exc("monitoring_data", e)
         return _json({"error": str(e)}, request, status=500)
 
 
+async def _ensure_content_stats_indexes():
+    # CONCURRENTLY blockiert die Bots nicht beim Schreiben (geht nicht auf partitionierten Tabellen,
+    # dort normaler CREATE INDEX). Ein abgebrochener CONCURRENTLY-Build hinterlässt einen INVALID-Index,
+    # den IF NOT EXISTS für immer überspringen würde -> verwerfen und neu bauen.
+    concurrently = "" if PARTITION_LOGS else "CONCURRENTLY "
+    created = set()
+    for name, table, definition in CONTENT_STATS_INDEXES:
+        try:
+            row = await fetchrow(
+                "select to_regclass(%s) is not null as has_table,"
+                " (select indisvalid from pg_index where indexrelid = to_regclass(%s)) as valid",
+                (table, name),
+            )
+            if not row["has_table"] or row["valid"]:
+                # Tabelle gehört zu einem Bot, der in dieser DB nicht läuft, oder Index ist schon da
+                continue
+            if row["valid"] is False:
+                log.warning("⚠️  Index %s is invalid, rebuilding", name)
+                await execute(f"DROP INDEX {concurrently}IF EXISTS {name}")
+            await execute(f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON {table} {definition}")
+            created.add(table)
+            log.info("✅ Index %s created", name)
+        except Exception as e:
+            log.warning("⚠️  Could not create index %s: %s", name, e)
+    for table in created:
+        await execute(f"ANALYZE {table}")
+    for name in CONTENT_STATS_OBSOLETE_INDEXES:
+        try:
+            await execute(f"DROP INDEX {concurrently}IF EXISTS {name}")
+        except Exception as e:
+            log.warning("⚠️  Could not drop index %s: %s", name, e)
+
+
+async def _backfill_rollup(rollup: str, source: str, ts_col: str,
+                           horizon: Optional[datetime.timedelta], batch_sql: str) -> None:
+    state = await fetchrow("select cutoff, next_before, done from rollup_backfill_state where rollup=%s", (rollup,))
+    if not state or state["done"]:
+        return
+    floor = state["cutoff"] - horizon if horizon else None
+    hi = state["next_before"]
+    while True:
+        # ein UTC-Tag pro Batch: kurze Transaktionen statt eines tabellenweiten Statements
+        lo = datetime.datetime.combine((hi - datetime.timedelta(microseconds=1)).astimezone(datetime.timezone.utc).date(),
+                                       datetime.time(), datetime.timezone.utc)
+        if floor is not None:
+            lo = max(lo, floor)
+        older = await fetchrow(f"select exists (select 1 from {source} where {ts_col} < %s) as more", (lo,))
+        done = not older["more"] or (floor is not None and lo <= floor)
+        # Batch und Fortschritt in einer Transaktion -> ein Tag wird nie doppelt oder halb übernommen
+        async with pool.connection() as con, con.transaction(), con.cursor() as cur:
+            await cur.execute(batch_sql, (lo, hi))
+            await cur.execute("update rollup_backfill_state set next_before=%s, done=%s where rollup=%s",
+                              (lo, done, rollup))
+        if done:
+            log.info("✅ %s backfilled", rollup)
+            return
+        hi = lo
+
+
+async def _backfill_rollups():
+    for rollup, (source, ts_col, horizon, batch_sql) in ROLLUP_BACKFILL.items():
+        try:
+            await _backfill_rollup(rollup, source, ts_col, horizon, batch_sql)
+        except Exception as e:
+            log.warning("⚠️  Backfill of %s failed: %s", rollup, e)
+
+
+async def _populate_rewards_summary():
+    # REFRESH ... CONCURRENTLY (Refresh-Loop) geht erst, wenn die View einmal befüllt ist
+    row = await fetchrow("select ispopulated from pg_matviews where matviewname = 'mv_rewards_summary'")
+    if row and not row["ispopulated"]:
+        await execute("REFRESH MATERIALIZED VIEW mv_rewards_summary")
+        log.info("✅ mv_rewards_summary populated")
+
+
+async def _deferred_maintenance():
+    # Langläufer (Index-Builds auf message_logs & Co., Rollup-Backfill) gehören nicht in das awaited
+    # ensure_tables(): das läuft vor site.start(), und Heroku bricht nach 60s ohne gebundenen Port ab
+    await asyncio.sleep(DEFERRED_MAINTENANCE_DELAY_SEC)
+    try:
+        await _populate_rewards_summary()
+    except Exception as e:
+        log.warning("⚠️  Could not populate mv_rewards_summary: %s", e)
+    try:
+        await _ensure_content_stats_indexes()
+    except Exception as e:
+        log.warning("⚠️  Deferred index maintenance failed: %s", e)
+    # nach den Indizes: die Tages-Batches laufen über den BRIN-Index auf message_logs
+    await _backfill_rollups()
+
+
+async def _start_deferred_maintenance(app: web.Application):
+    app["_devdash_deferred_task"] = asyncio.create_task(_deferred_maintenance())
+
+
+async def _stop_deferred_maintenance(app: web.Application):
+    task = app.get("_devdash_deferred_task")
+    if task:
+        task.cancel()
+
+
 # ------------------------------ route wiring ------------------------------
 async def options_root(request: web.Request):
     return options_handler(request)
@@ -2170,222 +3355,261 @@ async def options_root(request: web.Request):
 # CONTENT BOT STATISTICS
 # ============================================================================
 
+async def _content_mv_refresh_loop():
+    while True:
+        await asyncio.sleep(CONTENT_MV_REFRESH_SEC)
+        try:
+            await execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_rewards_summary")
+        except Exception as e:
+            log.warning("⚠️  mv_rewards_summary refresh failed: %s", e)
+        # Stunden-Buckets braucht nur das 30-Tage-Fenster
+        try:
+            await execute("DELETE FROM rollup_msgs_hourly WHERE bucket < now() - interval '31 days'")
+        except Exception as e:
+            log.warning("⚠️  rollup_msgs_hourly cleanup failed: %s", e)
+
+
+async def _start_content_mv_refresh(app: web.Application):
+    app["_devdash_content_mv_task"] = asyncio.create_task(_content_mv_refresh_loop())
+
+
+async def _stop_content_mv_refresh(app: web.Application):
+    task = app.get("_devdash_content_mv_task")
+    if task:
+        task.cancel()
+
+
+async def _rewards_summary() -> Dict[str, Any]:
+    # vorberechnete Zeile aus mv_rewards_summary; fehlt die View, live rechnen
+    try:
+        row = await fetchrow("SELECT * FROM mv_rewards_summary")
+    except Exception as e:
+        log.warning("mv_rewards_summary unavailable, computing live: %s", e)
+        row = None
+    return row or await fetchrow(REWARDS_SUMMARY_SQL)
+
+
+async def _content_overview_data() -> Dict[str, Any]:
+    # Nachrichten/AI-Zahlen aus den Tages-Rollups (UTC-Tage), Rewards aus mv_rewards_summary;
+    # nur die kleinen Tabellen (groups, members, Settings) werden noch direkt gezählt
+    # Aggregate als eigenständige FROM-Subqueries statt Scalar-SubSELECTs in der Projektion:
+    # jede wird ein normaler Scan-Knoten, den der Planer parallelisieren kann
+    counts_q = fetchrow("""
+        SELECT g.total_groups, m.total_members, ai.ai_enabled_groups, rf.rss_feeds_active
+        FROM (SELECT COUNT(*) as total_groups FROM groups) g
+        CROSS JOIN (SELECT COUNT(*) as total_members FROM members WHERE is_deleted=FALSE) m
+        CROSS JOIN (SELECT COUNT(DISTINCT chat_id) as ai_enabled_groups FROM ai_mod_settings WHERE enabled=true) ai
+        CROSS JOIN (SELECT COUNT(DISTINCT chat_id) as rss_feeds_active FROM rss_feeds WHERE enabled=true) rf
+    """)
+
+    # eigener Request für den Rollup-Scan: läuft auf einer zweiten Connection neben den Zählern
+    msgs_q = fetchrow("""
+        SELECT
+            COUNT(DISTINCT chat_id) FILTER (WHERE day = today) as active_today,
+            COALESCE(SUM(msgs) FILTER (WHERE day = today), 0)::bigint as messages_today,
+            COALESCE(SUM(msgs), 0)::bigint as messages_week
+        FROM rollup_msgs_daily,
+             (SELECT (NOW() AT TIME ZONE 'UTC')::date as today) t
+        WHERE day > today - 7
+    """)
+
+    # AI Moderation Kategorien heute
+    ai_cats_q = fetch("""
+        SELECT category, SUM(cnt)::bigint as count
+        FROM rollup_ai_mod_daily
+        WHERE day = (NOW() AT TIME ZONE 'UTC')::date
+        GROUP BY category
+        ORDER BY count DESC
+    """)
+
+    # unabhängige Queries parallel auf getrennten Pool-Connections
+    counts, msgs, ai_cats, rewards = await asyncio.gather(counts_q, msgs_q, ai_cats_q, _rewards_summary())
+
+    # beide SELECTs liefern ohne GROUP BY immer genau eine Zeile; COUNT/COALESCE sind nie NULL
+    r = {**counts, **msgs}
+
+    stats = {
+        "timestamp": int(time.time()),
+        "groups": {
+            "total": r['total_groups'],
+            "active_today": r['active_today'],
+            "total_members": r['total_members']
+        },
+        "messages": {
+            "total_today": r['messages_today'],
+            "total_this_week": r['messages_week'],
+            "average_per_group": round(r['messages_week'] / max(1, r['total_groups']), 2)
+        },
+        "tokens": {
+            "total_rewards_pending": rewards['total_points_pending'],
+            "total_pending_claims": rewards['pending_claims'],
+            "total_claimants": rewards['pending_claimants'],
+            "as_of": rewards['refreshed_at']
+        },
+        "ai_moderation": {
+            "enabled_in_groups": r['ai_enabled_groups'],
+            "actions_today": sum(row['count'] for row in ai_cats),
+            "categories": {row['category']: row['count'] for row in ai_cats}
+        },
+        "features": {
+            "rss_feeds_active": r['rss_feeds_active']
+        }
+    }
+
+    return stats
+
+
+@_cached_json
 async def content_bot_stats_overview(request: web.Request):
     """Hauptstatistiken des Content Bots: Gruppen, Mitglieder, Nachrichten, Tokens"""
     await _auth_user(request)
     try:
-        # Aggregierte Statistiken aus Content Bot Database (echte Tabellen)
-        rows = await fetch("""
-            SELECT 
-                (SELECT COUNT(*) FROM groups) as total_groups,
-                (SELECT COUNT(DISTINCT chat_id) FROM message_logs WHERE timestamp > now() - interval '24 hours') as active_today,
-                (SELECT COUNT(*) FROM members WHERE is_deleted=FALSE) as total_members,
-                (SELECT COUNT(*) FROM message_logs WHERE timestamp > now() - interval '24 hours') as messages_today,
-                (SELECT COUNT(*) FROM message_logs WHERE timestamp > now() - interval '7 days') as messages_week,
-                (SELECT COALESCE(SUM(points), 0)::numeric FROM rewards_pending) as total_rewards_pending,
-                (SELECT COUNT(*) FROM rewards_claims WHERE status='pending') as pending_claims,
-                (SELECT COUNT(DISTINCT user_id) FROM rewards_claims WHERE status='pending') as claimants_count,
-                (SELECT COUNT(DISTINCT chat_id) FROM ai_mod_settings WHERE enabled=true) as ai_enabled_groups,
-                (SELECT COUNT(*) FROM ai_mod_logs WHERE ts > now() - interval '24 hours') as ai_actions_today,
-                (SELECT COUNT(DISTINCT chat_id) FROM rss_feeds WHERE enabled=true) as rss_feeds_active
-        """)
-        
-        r = rows[0] if rows else {}
-        
-        total_groups = int(r.get('total_groups') or 0)
-        
-        stats = {
-            "timestamp": int(time.time()),
-            "groups": {
-                "total": total_groups,
-                "active_today": int(r.get('active_today') or 0),
-                "total_members": int(r.get('total_members') or 0)
-            },
-            "messages": {
-                "total_today": int(r.get('messages_today') or 0),
-                "total_this_week": int(r.get('messages_week') or 0),
-                "average_per_group": round(float(r.get('messages_week') or 0) / max(1, total_groups), 2)
-            },
-            "tokens": {
-                "total_rewards_pending": float(r.get('total_rewards_pending') or 0),
-                "total_pending_claims": int(r.get('pending_claims') or 0),
-                "total_claimants": int(r.get('claimants_count') or 0)
-            },
-            "ai_moderation": {
-                "enabled_in_groups": int(r.get('ai_enabled_groups') or 0),
-                "actions_today": int(r.get('ai_actions_today') or 0),
-                "categories": {}
-            },
-            "features": {
-                "rss_feeds_active": int(r.get('rss_feeds_active') or 0)
-            }
-        }
-        
-        # AI Moderation Kategorien heute
-        ai_cats = await fetch("""
-            SELECT category, COUNT(*) as count
-            FROM ai_mod_logs
-            WHERE ts > now() - interval '24 hours'
-            GROUP BY category
-            ORDER BY count DESC
-        """)
-        stats["ai_moderation"]["categories"] = {row['category']: row['count'] for row in (ai_cats or [])}
-        
-        return _json(stats, request)
+        return _json(await _content_overview_data(), request)
     except Exception as e:
-        log.error("content_bot_stats_overview failed: %s", e, exc_info=True)
+        _log_exc("content_bot_stats_overview", e)
         return _json({"error": str(e)}, request, status=500)
 
 
+# Top groups by activity; Spalten heißen bereits wie im Response
+CONTENT_GROUPS_SQL = """
+        SELECT
+            g.chat_id,
+            g.title,
+            mem.members,
+            msg.messages_today,
+            msg.messages_week,
+            msg.messages_total,
+            msg.last_activity
+        FROM groups g
+        -- members und message_logs getrennt aggregieren (kein members x messages Kreuzprodukt)
+        LEFT JOIN LATERAL (
+            SELECT COUNT(DISTINCT m.user_id) as members
+            FROM members m
+            WHERE m.chat_id = g.chat_id AND m.is_deleted = FALSE
+        ) mem ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT
+                COUNT(*) as messages_total,
+                COUNT(*) FILTER (WHERE ml.timestamp > now() - interval '24 hours') as messages_today,
+                COUNT(*) FILTER (WHERE ml.timestamp > now() - interval '7 days') as messages_week,
+                to_char(MAX(ml.timestamp) AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') as last_activity
+            FROM message_logs ml
+            WHERE ml.chat_id = g.chat_id
+        ) msg ON TRUE
+        ORDER BY msg.messages_today DESC, mem.members DESC
+        LIMIT %s
+"""
+
+
+async def _content_groups_data(limit: int) -> Dict[str, Any]:
+    groups = await fetch(CONTENT_GROUPS_SQL, (limit,))
+
+    return {
+        "timestamp": int(time.time()),
+        "groups": groups
+    }
+
+
+@_cached_json
 async def content_bot_groups_stats(request: web.Request):
     """Detaillierte Statistiken pro Gruppe"""
-    await _auth_user(request)
-    try:
-        limit = int(request.query.get("limit", "50"))
-        
-        # Top groups by activity
-        groups = await fetch(f"""
-            SELECT 
-                g.chat_id,
-                g.title,
-                COUNT(DISTINCT m.user_id) as member_count,
-                COUNT(ml.user_id) as messages_total,
-                COUNT(CASE WHEN ml.timestamp > now() - interval '24 hours' THEN 1 END) as messages_today,
-                COUNT(CASE WHEN ml.timestamp > now() - interval '7 days' THEN 1 END) as messages_week,
-                MAX(ml.timestamp) as last_activity
-            FROM groups g
-            LEFT JOIN members m ON g.chat_id = m.chat_id AND m.is_deleted = FALSE
-            LEFT JOIN message_logs ml ON g.chat_id = ml.chat_id
-            GROUP BY g.chat_id, g.title
-            ORDER BY messages_today DESC, member_count DESC
-            LIMIT {limit}
-        """)
-        
-        stats = {
-            "timestamp": int(time.time()),
-            "groups": [
-                {
-                    "chat_id": int(g['chat_id']),
-                    "title": g['title'],
-                    "members": int(g['member_count'] or 0),
-                    "messages_today": int(g['messages_today'] or 0),
-                    "messages_week": int(g['messages_week'] or 0),
-                    "messages_total": int(g['messages_total'] or 0),
-                    "last_activity": g['last_activity'].isoformat() if g['last_activity'] else None
-                }
-                for g in (groups or [])
-            ]
-        }
-        
-        return _json(stats, request)
+    await _auth_user(request)
+    # gestreamt wächst der Speicher nicht mit dem limit -> höhere Obergrenze erlaubt
+    ndjson = request.query.get("format") == "ndjson"
+    limit = _clamp_int(request, "limit", 50, 1, 5000 if ndjson else 500)
+    if ndjson:
+        return await _stream_ndjson(request, CONTENT_GROUPS_SQL, (limit,))
+    try:
+        return _json(await _content_groups_data(limit), request)
     except Exception as e:
-        log.error("content_bot_groups_stats failed: %s", e, exc_info=True)
+        _log_exc("content_bot_groups_stats", e)
         return _json({"error": str(e)}, request, status=500)
 
 
+async def _content_claimed_data() -> Dict[str, Any]:
+    # Top claimants
+    top_claimants_q = fetch("""
+        SELECT
+            ROW_NUMBER() OVER (ORDER BY SUM(amount) DESC, user_id) as rank,
+            user_id,
+            COALESCE(SUM(amount), 0)::float8 as claim_amount,
+            COUNT(*) as claim_count
+        FROM rewards_claims
+        WHERE status='paid'
+        GROUP BY user_id
+        ORDER BY rank
+        LIMIT 20
+    """)
+
+    # unabhängige Queries parallel auf getrennten Pool-Connections
+    # Summen kommen vorberechnet aus mv_rewards_summary (Stand: as_of)
+    row, top_claimants = await asyncio.gather(_rewards_summary(), top_claimants_q)
+
+    return {
+        "timestamp": int(time.time()),
+        "as_of": row['refreshed_at'],
+        "claimed_total": row['claimed_total'],
+        "pending_count": row['pending_claims'],
+        "pending_amount": row['pending_amount'],
+        "unique_claimants": row['unique_claimants'],
+        "top_claimants": top_claimants
+    }
+
+
+@_cached_json
 async def content_bot_claimed_stats(request: web.Request):
     """EMRD Claimed Statistiken: Rewards Claims aus User-Wallets"""
     await _auth_user(request)
     try:
-        # Claimed rewards stats
-        claimed_data = await fetch("""
-            SELECT 
-                (SELECT COALESCE(SUM(amount), 0)::numeric FROM rewards_claims WHERE status='paid') as claimed_total,
-                (SELECT COUNT(*) FROM rewards_claims WHERE status='pending') as pending_count,
-                (SELECT COALESCE(SUM(amount), 0)::numeric FROM rewards_claims WHERE status='pending') as pending_amount,
-                (SELECT COUNT(DISTINCT user_id) FROM rewards_claims) as unique_claimants
-        """)
-        claimed_row = claimed_data[0] if claimed_data else {'claimed_total': 0, 'pending_count': 0, 'pending_amount': 0, 'unique_claimants': 0}
-        
-        # Top claimants
-        top_claimants = await fetch("""
-            SELECT 
-                user_id,
-                SUM(amount)::numeric as claim_amount,
-                COUNT(*) as claim_count
-            FROM rewards_claims
-            WHERE status='paid'
-            GROUP BY user_id
-            ORDER BY claim_amount DESC
-            LIMIT 20
-        """)
-        
-        stats = {
-            "timestamp": int(time.time()),
-            "claimed_total": float(claimed_row.get('claimed_total') or 0),
-            "pending_count": int(claimed_row.get('pending_count') or 0),
-            "pending_amount": float(claimed_row.get('pending_amount') or 0),
-            "unique_claimants": int(claimed_row.get('unique_claimants') or 0),
-            "top_claimants": [
-                {
-                    "rank": i+1,
-                    "user_id": int(c['user_id']),
-                    "claim_amount": float(c['claim_amount'] or 0),
-                    "claim_count": int(c['claim_count'])
-                }
-                for i, c in enumerate(top_claimants or [])
-            ]
-        }
-        
-        return _json(stats, request)
+        return _json(await _content_claimed_data(), request)
     except Exception as e:
-        log.error("content_bot_claimed_stats failed: %s", e, exc_info=True)
+        _log_exc("content_bot_claimed_stats", e)
         return _json({"error": str(e)}, request, status=500)
 
 
+async def _content_story_share_data() -> Dict[str, Any]:
+    # Story sharing stats - simplified query
+    stats_data = await fetch("""
+        SELECT
+            0::bigint as active_groups,
+            0::bigint as total_shares,
+            0::float8 as story_share_rewards,
+            0::bigint as story_share_users,
+            0::bigint as claimed_story_rewards
+    """)
+    row = stats_data[0]
+
+    # Get approximate clicks based on claims related to story sharing;
+    # Prädikat als Literal, damit der Planer den partiellen Index idx_rewards_claims_paid_click nimmt
+    clicks_data = await fetch("""
+        SELECT COUNT(*) as total_clicks
+        FROM rewards_claims
+        WHERE status = 'paid' AND description ILIKE '%%click%%'
+    """)
+
+    total_shares = row['total_shares']
+    total_clicks = clicks_data[0]['total_clicks']
+
+    return {
+        "timestamp": int(time.time()),
+        "active_groups": row['active_groups'],
+        "total_shares": total_shares,
+        "total_clicks": total_clicks,
+        "avg_clicks": round(total_clicks / max(1, total_shares), 2),
+        "story_share_rewards": row['story_share_rewards'],
+        "story_share_users": row['story_share_users'],
+        "claimed_story_rewards": row['claimed_story_rewards']
+    }
+
+
+@_cached_json
 async def content_bot_story_share_stats(request: web.Request):
     """Story Share Statistiken: Shares, Clicks, Rewards"""
     await _auth_user(request)
     try:
-        # Story sharing stats - simplified query
-        stats_data = await fetch("""
-            SELECT
-                0::bigint as active_groups,
-                0::bigint as total_shares,
-                0::numeric as story_share_rewards,
-                0::bigint as story_share_users,
-                0::bigint as claimed_story_rewards
-        """)
-        
-        # Fallback für detaillierte Daten - wenn die obige Query nicht funktioniert
-        if not stats_data or not stats_data[0]:
-            stats_data = await fetch("""
-                SELECT
-                    0 as active_groups,
-                    0 as total_shares,
-                    0 as story_share_rewards,
-                    0 as story_share_users,
-                    0 as claimed_story_rewards
-            """)
-        
-        row = stats_data[0] if stats_data else {'active_groups': 0, 'total_shares': 0, 'story_share_rewards': 0, 'story_share_users': 0, 'claimed_story_rewards': 0}
-        
-        # Get approximate clicks based on claims related to story sharing
-        clicks_data = await fetch("""
-            SELECT COUNT(*) as total_clicks
-            FROM rewards_claims 
-            WHERE status=%s AND description ILIKE %s
-            LIMIT 1
-        """, ('paid', '%click%'))
-        clicks_row = clicks_data[0] if clicks_data else {'total_clicks': 0}
-        
-        total_shares = int(row.get('total_shares') or 0)
-        total_clicks = int(clicks_row.get('total_clicks') or 0)
-        
-        stats = {
-            "timestamp": int(time.time()),
-            "active_groups": int(row.get('active_groups') or 0),
-            "total_shares": total_shares,
-            "total_clicks": total_clicks,
-            "avg_clicks": round(float(total_clicks) / max(1, total_shares), 2),
-            "story_share_rewards": float(row.get('story_share_rewards') or 0),
-            "story_share_users": int(row.get('story_share_users') or 0),
-            "claimed_story_rewards": int(row.get('claimed_story_rewards') or 0)
-        }
-        
-        return _json(stats, request)
+        return _json(await _content_story_share_data(), request)
     except Exception as e:
-        log.error("content_bot_story_share_stats failed: %s", e, exc_info=True)
+        _log_exc("content_bot_story_share_stats", e)
         # Fallback response wenn Query fehlschlägt
         return _json({
             "timestamp": int(time.time()),
@@ -2399,393 +3623,486 @@ async def content_bot_story_share_stats(request: web.Request):
         }, request)
 
 
+async def _content_ai_moderation_data() -> Dict[str, Any]:
+    # Settings/Strikes liegen in anderen Tabellen
+    ai_data_q = fetch("""
+        SELECT
+            (SELECT COUNT(DISTINCT chat_id) FROM ai_mod_settings WHERE enabled=true) as enabled_groups,
+            (SELECT COUNT(*) FROM user_strike_events WHERE ts > now() - interval '24 hours') as strikes_today
+    """)
+
+    # Gesamtzahlen (heute/7 Tage) und Kategorien (7 Tage) aus rollup_ai_mod_daily (UTC-Tage):
+    # GROUPING(category) = 1 markiert die Gesamtzeile des ()-Sets
+    buckets_q = fetch("""
+        SELECT
+            GROUPING(category) as is_total,
+            category,
+            COALESCE(SUM(cnt) FILTER (WHERE day = today), 0)::bigint as actions_today,
+            COALESCE(SUM(cnt), 0)::bigint as count,
+            COALESCE(SUM(cnt) FILTER (WHERE action='delete'), 0)::bigint as deleted,
+            COALESCE(SUM(cnt) FILTER (WHERE action='warn'), 0)::bigint as warned,
+            COALESCE(ROUND((SUM(score_sum) / NULLIF(SUM(scored), 0))::numeric, 3), 0)::float8 as avg_score
+        FROM rollup_ai_mod_daily,
+             (SELECT (NOW() AT TIME ZONE 'UTC')::date as today) t
+        WHERE day > today - 7
+        GROUP BY GROUPING SETS ((), (category))
+        ORDER BY count DESC
+    """)
+
+    # Top offenders
+    offenders_q = fetch("""
+        SELECT
+            user_id,
+            chat_id,
+            COUNT(*) as violations,
+            COUNT(*) FILTER (WHERE action='delete') as deleted_messages,
+            to_char(MAX(ts) AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') as last_violation
+        FROM ai_mod_logs
+        WHERE ts > now() - interval '30 days'
+        GROUP BY user_id, chat_id
+        ORDER BY violations DESC
+        LIMIT 20
+    """)
+
+    # unabhängige Queries parallel auf getrennten Pool-Connections
+    ai_data, buckets, offenders = await asyncio.gather(ai_data_q, buckets_q, offenders_q)
+
+    totals = {'actions_today': 0, 'count': 0}
+    by_category = []
+    for row in buckets:
+        if row['is_total']:
+            totals = row
+        else:
+            by_category.append({
+                "category": row['category'],
+                "count": row['count'],
+                "deleted": row['deleted'],
+                "warned": row['warned'],
+                "avg_score": row['avg_score']
+            })
+
+    return {
+        "timestamp": int(time.time()),
+        "actions": {
+            "enabled_groups": ai_data[0]['enabled_groups'],
+            "actions_today": totals['actions_today'],
+            "actions_week": totals['count'],
+            "strikes_today": ai_data[0]['strikes_today']
+        },
+        "by_category": by_category,
+        "top_offenders": offenders
+    }
+
+
+@_cached_json
 async def content_bot_ai_moderation_stats(request: web.Request):
     """KI-Moderation Statistiken: Aktionen, Kategorien, Strikes"""
     await _auth_user(request)
     try:
-        # AI Moderation overview
-        ai_data = await fetch("""
-            SELECT 
-                (SELECT COUNT(DISTINCT chat_id) FROM ai_mod_settings WHERE enabled=true) as enabled_groups,
-                (SELECT COUNT(*) FROM ai_mod_logs WHERE ts > now() - interval '24 hours') as actions_today,
-                (SELECT COUNT(*) FROM ai_mod_logs WHERE ts > now() - interval '7 days') as actions_week,
-                (SELECT COUNT(*) FROM user_strike_events WHERE ts > now() - interval '24 hours') as strikes_today
-        """)
-        ai_row = ai_data[0] if ai_data else {'enabled_groups': 0, 'actions_today': 0, 'actions_week': 0, 'strikes_today': 0}
-        
-        # Actions by category
-        by_category = await fetch("""
-            SELECT 
-                category,
-                COUNT(*) as count,
-                COUNT(CASE WHEN action='delete' THEN 1 END) as deleted,
-                COUNT(CASE WHEN action='warn' THEN 1 END) as warned,
-                ROUND(AVG(score)::numeric, 3) as avg_score
-            FROM ai_mod_logs
-            WHERE ts > now() - interval '7 days'
-            GROUP BY category
-            ORDER BY count DESC
-        """)
-        
-        # Top offenders
-        offenders = await fetch("""
-            SELECT 
-                user_id,
-                chat_id,
-                COUNT(*) as violation_count,
-                SUM(CASE WHEN action='delete' THEN 1 ELSE 0 END) as deleted_count,
-                MAX(ts) as last_violation
-            FROM ai_mod_logs
-            WHERE ts > now() - interval '30 days'
-            GROUP BY user_id, chat_id
-            ORDER BY violation_count DESC
-            LIMIT 20
-        """)
-        
-        stats = {
-            "timestamp": int(time.time()),
-            "actions": {
-                "enabled_groups": int(ai_row.get('enabled_groups') or 0),
-                "actions_today": int(ai_row.get('actions_today') or 0),
-                "actions_week": int(ai_row.get('actions_week') or 0),
-                "strikes_today": int(ai_row.get('strikes_today') or 0)
-            },
-            "by_category": [
-                {
-                    "category": c['category'],
-                    "count": int(c['count']),
-                    "deleted": int(c['deleted'] or 0),
-                    "warned": int(c['warned'] or 0),
-                    "avg_score": float(c['avg_score'] or 0)
-                }
-                for c in (by_category or [])
-            ],
-            "top_offenders": [
-                {
-                    "user_id": int(o['user_id']),
-                    "chat_id": int(o['chat_id']),
-                    "violations": int(o['violation_count']),
-                    "deleted_messages": int(o['deleted_count'] or 0),
-                    "last_violation": o['last_violation'].isoformat() if o['last_violation'] else None
-                }
-                for o in (offenders or [])
-            ]
-        }
-        
-        return _json(stats, request)
+        return _json(await _content_ai_moderation_data(), request)
     except Exception as e:
-        log.error("content_bot_ai_moderation_stats failed: %s", e, exc_info=True)
+        _log_exc("content_bot_ai_moderation_stats", e)
         return _json({"error": str(e)}, request, status=500)
 
 
+async def _content_features_data() -> Dict[str, Any]:
+    # RSS Stats
+    rss_data = await fetch("""
+        SELECT
+            COUNT(DISTINCT chat_id) as active_feeds,
+            COUNT(*) as total_feeds
+        FROM rss_feeds
+        WHERE enabled=true
+    """)
+
+    return {
+        "timestamp": int(time.time()),
+        "features": {
+            "rss": rss_data[0]
+        }
+    }
+
+
+@_cached_json
 async def content_bot_features_stats(request: web.Request):
     """Feature-Nutzung: RSS und andere Features"""
     await _auth_user(request)
     try:
-        # RSS Stats
-        rss_data = await fetch("""
-            SELECT
-                COUNT(DISTINCT chat_id) as active_feeds,
-                COUNT(*) as total_feeds
-            FROM rss_feeds
-            WHERE enabled=true
-        """)
-        
-        rss_row = rss_data[0] if rss_data else {'active_feeds': 0, 'total_feeds': 0}
-        
-        stats = {
-            "timestamp": int(time.time()),
-            "features": {
-                "rss": {
-                    "active_feeds": int(rss_row.get('active_feeds') or 0),
-                    "total_feeds": int(rss_row.get('total_feeds') or 0)
-                }
-            }
-        }
-        
-        return _json(stats, request)
+        return _json(await _content_features_data(), request)
     except Exception as e:
-        log.error("content_bot_features_stats failed: %s", e, exc_info=True)
+        _log_exc("content_bot_features_stats", e)
         return _json({"error": str(e)}, request, status=500)
 
 
-async def content_bot_user_retention(request: web.Request):
-    """User Retention & Activity Metrics"""
-    await _auth_user(request)
-    try:
-        # Total active members
-        total_users = await fetch("""
-            SELECT COUNT(*) as total
-            FROM members
-            WHERE is_deleted = FALSE
-        """)
-        
-        # Active today/week/month (using CASE WHEN instead of FILTER)
-        active_counts = await fetch("""
-            SELECT
-                COUNT(DISTINCT CASE WHEN timestamp > NOW() - INTERVAL '1 day' THEN user_id END) as today,
-                COUNT(DISTINCT CASE WHEN timestamp > NOW() - INTERVAL '7 days' THEN user_id END) as week,
-                COUNT(DISTINCT CASE WHEN timestamp > NOW() - INTERVAL '30 days' THEN user_id END) as month
-            FROM message_logs
-        """)
-        
-        # Daily active users for last 30 days
-        daily_active = await fetch("""
-            SELECT 
-                DATE(timestamp) as date,
-                COUNT(DISTINCT user_id) as active_count
+async def _content_retention_data() -> Dict[str, Any]:
+    # Total active members
+    total_users_q = fetch("""
+        SELECT COUNT(*) as total
+        FROM members
+        WHERE is_deleted = FALSE
+    """)
+
+    # Active today/week/month: ein GROUP BY user_id über 30 Tage statt 3x COUNT(DISTINCT)
+    active_counts_q = fetch("""
+        SELECT
+            COUNT(*) FILTER (WHERE last_ts > NOW() - INTERVAL '1 day') as today,
+            COUNT(*) FILTER (WHERE last_ts > NOW() - INTERVAL '7 days') as week,
+            COUNT(*) as month
+        FROM (
+            SELECT MAX(timestamp) as last_ts
             FROM message_logs
-            WHERE timestamp > NOW() - INTERVAL '30 days'
-            GROUP BY DATE(timestamp)
-            ORDER BY date
-        """)
-        
-        # Messages per user
-        engagement = await fetch("""
-            SELECT
-                COUNT(*) as total_messages,
-                COUNT(DISTINCT user_id) as unique_users,
-                CASE WHEN COUNT(DISTINCT user_id) > 0 THEN ROUND((CAST(COUNT(*) AS numeric) / COUNT(DISTINCT user_id)), 2) ELSE 0 END as messages_per_user
+            WHERE timestamp > NOW() - INTERVAL '30 days' AND user_id IS NOT NULL
+            GROUP BY user_id
+        ) u
+    """)
+
+    # Daily active users for last 30 days (aus rollup_msgs_daily, UTC-Tage)
+    daily_active_q = fetch("""
+        SELECT
+            to_char(day, 'YYYY-MM-DD') as date,
+            COUNT(DISTINCT user_id) as count
+        FROM rollup_msgs_daily
+        WHERE day > (NOW() AT TIME ZONE 'UTC')::date - 30
+        GROUP BY day
+        ORDER BY day
+    """)
+
+    # Messages per user
+    engagement_q = fetch("""
+        SELECT
+            COALESCE(SUM(msgs), 0)::bigint as total_messages,
+            COUNT(user_id) as unique_users,
+            CASE WHEN COUNT(user_id) > 0 THEN ROUND((CAST(SUM(msgs) AS numeric) / COUNT(user_id)), 2) ELSE 0 END::float8 as messages_per_user
+        FROM (
+            SELECT user_id, COUNT(*) as msgs
             FROM message_logs
             WHERE timestamp > NOW() - INTERVAL '30 days'
-        """)
-        
-        active_c = active_counts[0] if active_counts else {'today': 0, 'week': 0, 'month': 0}
-        engagement_row = engagement[0] if engagement else {'total_messages': 0, 'unique_users': 0, 'messages_per_user': 0}
-        total_row = total_users[0] if total_users else {'total': 0}
-        
-        stats = {
-            "timestamp": int(time.time()),
-            "retention": {
-                "active_users_total": int(total_row.get('total') or 0),
-                "active_today": int(active_c.get('today') or 0),
-                "active_week": int(active_c.get('week') or 0),
-                "active_month": int(active_c.get('month') or 0)
-            },
-            "engagement": {
-                "total_messages": int(engagement_row.get('total_messages') or 0),
-                "unique_users": int(engagement_row.get('unique_users') or 0),
-                "messages_per_user": float(engagement_row.get('messages_per_user') or 0),
-                "daily_active_users": [
-                    {"date": d['date'].isoformat() if d['date'] else None, "count": int(d['active_count'])}
-                    for d in (daily_active or [])
-                ]
-            }
+            GROUP BY user_id
+        ) u
+    """)
+
+    # unabhängige Queries parallel auf getrennten Pool-Connections
+    total_users, active_counts, daily_active, engagement = await asyncio.gather(
+        total_users_q, active_counts_q, daily_active_q, engagement_q
+    )
+
+    active_c = active_counts[0]
+    engagement_row = engagement[0]
+
+    return {
+        "timestamp": int(time.time()),
+        "retention": {
+            "active_users_total": total_users[0]['total'],
+            "active_today": active_c['today'],
+            "active_week": active_c['week'],
+            "active_month": active_c['month']
+        },
+        "engagement": {
+            **engagement_row,
+            "daily_active_users": daily_active
         }
-        
-        return _json(stats, request)
+    }
+
+
+@_cached_json
+async def content_bot_user_retention(request: web.Request):
+    """User Retention & Activity Metrics"""
+    await _auth_user(request)
+    try:
+        return _json(await _content_retention_data(), request)
     except Exception as e:
-        log.error("content_bot_user_retention failed: %s", e, exc_info=True)
+        _log_exc("content_bot_user_retention", e)
         return _json({"error": str(e)}, request, status=500)
 
 
+async def _content_network_data() -> Dict[str, Any]:
+    # Group and message statistics (using CASE WHEN instead of FILTER)
+    bot_stats_q = fetch("""
+        SELECT
+            (SELECT COUNT(*) FROM (SELECT 1 FROM message_logs WHERE chat_id IS NOT NULL GROUP BY chat_id) g) as total_groups,
+            (SELECT COUNT(*) FROM (SELECT 1 FROM message_logs WHERE user_id IS NOT NULL GROUP BY user_id) u) as total_users,
+            COUNT(*) as total_messages,
+            COUNT(*) FILTER (WHERE timestamp > NOW() - INTERVAL '1 day') as messages_today,
+            COUNT(*) FILTER (WHERE timestamp > NOW() - INTERVAL '7 days') as messages_week
+        FROM message_logs
+    """)
+
+    # Member events (joins/leaves) aus rollup_member_events_daily (UTC-Tage)
+    member_stats_q = fetch("""
+        SELECT
+            COALESCE(SUM(CASE WHEN event_type = 'join' AND day = today THEN cnt END), 0) as joins_today,
+            COALESCE(SUM(CASE WHEN event_type = 'leave' AND day = today THEN cnt END), 0) as leaves_today,
+            COALESCE(SUM(CASE WHEN event_type = 'kick' AND day = today THEN cnt END), 0) as kicks_today,
+            COALESCE(SUM(CASE WHEN event_type = 'join' THEN cnt END), 0) as joins_week
+        FROM rollup_member_events_daily,
+             (SELECT (NOW() AT TIME ZONE 'UTC')::date as today) t
+        WHERE day > today - 7
+    """)
+
+    # Top active groups
+    active_groups_q = fetch("""
+        SELECT
+            chat_id,
+            COUNT(*) as messages,
+            COUNT(DISTINCT user_id) as unique_users
+        FROM message_logs
+        WHERE timestamp > NOW() - INTERVAL '7 days'
+        GROUP BY chat_id
+        ORDER BY messages DESC
+        LIMIT 20
+    """)
+
+    # unabhängige Queries parallel auf getrennten Pool-Connections
+    bot_stats, member_stats, active_groups = await asyncio.gather(bot_stats_q, member_stats_q, active_groups_q)
+
+    return {
+        "timestamp": int(time.time()),
+        "network": {
+            **bot_stats[0],
+            **member_stats[0],
+            "active_groups": active_groups
+        }
+    }
+
+
+@_cached_json
 async def content_bot_network_analysis(request: web.Request):
     """Netzwerkanalyse: Gruppen und Nachrichten"""
     await _auth_user(request)
     try:
-        # Group and message statistics (using CASE WHEN instead of FILTER)
-        bot_stats = await fetch("""
-            SELECT
-                COUNT(DISTINCT chat_id) as total_groups,
-                COUNT(DISTINCT user_id) as total_users,
-                COUNT(*) as total_messages,
-                COUNT(CASE WHEN timestamp > NOW() - INTERVAL '1 day' THEN 1 END) as messages_today,
-                COUNT(CASE WHEN timestamp > NOW() - INTERVAL '7 days' THEN 1 END) as messages_week
-            FROM message_logs
-        """)
-        
-        # Member events (joins/leaves)
-        member_stats = await fetch("""
-            SELECT
-                COUNT(CASE WHEN event_type = 'join' AND ts > NOW() - INTERVAL '1 day' THEN 1 END) as joins_today,
-                COUNT(CASE WHEN event_type = 'leave' AND ts > NOW() - INTERVAL '1 day' THEN 1 END) as leaves_today,
-                COUNT(CASE WHEN event_type = 'kick' AND ts > NOW() - INTERVAL '1 day' THEN 1 END) as kicks_today,
-                COUNT(CASE WHEN event_type = 'join' AND ts > NOW() - INTERVAL '7 days' THEN 1 END) as joins_week
-            FROM member_events
-        """)
-        
-        # Top active groups
-        active_groups = await fetch("""
-            SELECT 
-                chat_id,
-                COUNT(*) as msg_count,
-                COUNT(DISTINCT user_id) as unique_users
-            FROM message_logs
-            WHERE timestamp > NOW() - INTERVAL '7 days'
-            GROUP BY chat_id
-            ORDER BY msg_count DESC
-            LIMIT 20
-        """)
-        
-        bot_row = bot_stats[0] if bot_stats else {'total_groups': 0, 'total_users': 0, 'total_messages': 0, 'messages_today': 0, 'messages_week': 0}
-        member_row = member_stats[0] if member_stats else {'joins_today': 0, 'leaves_today': 0, 'kicks_today': 0, 'joins_week': 0}
-        
-        stats = {
-            "timestamp": int(time.time()),
-            "network": {
-                "total_groups": int(bot_row.get('total_groups') or 0),
-                "total_users": int(bot_row.get('total_users') or 0),
-                "total_messages": int(bot_row.get('total_messages') or 0),
-                "messages_today": int(bot_row.get('messages_today') or 0),
-                "messages_week": int(bot_row.get('messages_week') or 0),
-                "joins_today": int(member_row.get('joins_today') or 0),
-                "leaves_today": int(member_row.get('leaves_today') or 0),
-                "kicks_today": int(member_row.get('kicks_today') or 0),
-                "joins_week": int(member_row.get('joins_week') or 0),
-                "active_groups": [
-                    {
-                        "chat_id": int(g['chat_id']),
-                        "messages": int(g['msg_count']),
-                        "unique_users": int(g['unique_users'])
-                    }
-                    for g in (active_groups or [])
-                ]
-            }
-        }
-        
-        return _json(stats, request)
+        return _json(await _content_network_data(), request)
     except Exception as e:
-        log.error("content_bot_network_analysis failed: %s", e, exc_info=True)
+        _log_exc("content_bot_network_analysis", e)
         return _json({"error": str(e)}, request, status=500)
 
 
+@_cached_json
+async def content_bot_stats_all(request: web.Request):
+    """Alle Content-Statistiken in einem Request; die Abschnitte laufen parallel über den Pool"""
+    await _auth_user(request)
+    limit = _clamp_int(request, "limit", 50, 1, 500)
+
+    # alle Queries der Abschnitte teilen sich STATS_ALL_MAX_CONNS Connections (auch über Requests hinweg);
+    # die Coroutinen unten werden erst im gather zu Tasks und erben dabei den Kontext
+    token = _conn_limit.set(_stats_all_sem)
+    sections = {
+        "overview": _content_overview_data(),
+        "groups": _content_groups_data(limit),
+        "claimed": _content_claimed_data(),
+        "story_share": _content_story_share_data(),
+        "ai_moderation": _content_ai_moderation_data(),
+        "features": _content_features_data(),
+        "retention": _content_retention_data(),
+        "network": _content_network_data(),
+    }
+    try:
+        results = await asyncio.gather(*sections.values(), return_exceptions=True)
+    finally:
+        _conn_limit.reset(token)
+
+    payload: Dict[str, Any] = {"timestamp": int(time.time())}
+    for name, res in zip(sections, results):
+        if isinstance(res, Exception):
+            log.error("content_bot_stats_all: section %s failed: %s", name, res)
+            payload[name] = {"error": str(res)}
+        else:
+            payload[name] = res
+    return _json(payload, request)
+
+
+@_cached_json
 async def content_bot_complete_stats(request: web.Request):
     """🔥 KOMPLETTE STATISTIK - ALLES AUS DER DATENBANK!"""
     await _auth_user(request)
     try:
         # 1. ALLE GRUPPEN MIT DETAILS
-        groups_data = await fetch("""
+        # je Gruppe getrennte LATERAL-Aggregate statt eines JOINs über alle Tabellen (Kreuzprodukt);
+        # Zeitfenster aus rollup_msgs_hourly, Gesamtzahlen per Index-Only-Scan (chat_id, user_id)
+        # auf message_logs – inkl. Nachrichten ohne user_id (Kanal-Posts, anonyme Admins)
+        groups_data_q = fetch("""
             SELECT
                 g.chat_id,
                 g.title,
-                COUNT(DISTINCT m.user_id) as member_count,
-                COUNT(DISTINCT CASE WHEN m.is_deleted=FALSE THEN m.user_id END) as active_members,
-                COUNT(DISTINCT ml.user_id) as users_with_messages,
-                COUNT(ml.message_id) as total_messages,
-                COUNT(CASE WHEN ml.timestamp > NOW() - INTERVAL '24 hours' THEN 1 END) as messages_24h,
-                COUNT(CASE WHEN ml.timestamp > NOW() - INTERVAL '7 days' THEN 1 END) as messages_7d,
-                COUNT(CASE WHEN ml.timestamp > NOW() - INTERVAL '30 days' THEN 1 END) as messages_30d,
-                MAX(ml.timestamp) as last_message,
-                COUNT(DISTINCT CASE WHEN me.event_type='join' THEN 1 END) as total_joins,
-                COUNT(DISTINCT CASE WHEN me.event_type='leave' THEN 1 END) as total_leaves,
-                COUNT(DISTINCT CASE WHEN me.event_type='kick' THEN 1 END) as total_kicks,
-                COUNT(DISTINCT CASE WHEN ai.enabled=true THEN 1 END) as ai_enabled,
-                COUNT(DISTINCT ail.chat_id) as ai_actions,
-                COUNT(DISTINCT rf.chat_id) as rss_feeds
+                mem.member_count,
+                mem.active_members,
+                tot.users_with_messages,
+                tot.total_messages,
+                win.messages_24h,
+                win.messages_7d,
+                win.messages_30d,
+                (SELECT MAX(ml.timestamp) FROM message_logs ml WHERE ml.chat_id = g.chat_id) as last_message,
+                EXISTS (SELECT 1 FROM ai_mod_settings ai WHERE ai.chat_id = g.chat_id AND ai.enabled) as ai_enabled,
+                EXISTS (SELECT 1 FROM ai_mod_logs ail WHERE ail.chat_id = g.chat_id)::int as ai_actions,
+                EXISTS (SELECT 1 FROM rss_feeds rf WHERE rf.chat_id = g.chat_id)::int as rss_feeds
             FROM groups g
-            LEFT JOIN members m ON g.chat_id = m.chat_id
-            LEFT JOIN message_logs ml ON g.chat_id = ml.chat_id
-            LEFT JOIN member_events me ON g.chat_id = me.chat_id
-            LEFT JOIN ai_mod_settings ai ON g.chat_id = ai.chat_id AND ai.enabled=true
-            LEFT JOIN ai_mod_logs ail ON g.chat_id = ail.chat_id
-            LEFT JOIN rss_feeds rf ON g.chat_id = rf.chat_id
-            GROUP BY g.chat_id, g.title
-            ORDER BY messages_24h DESC
+            LEFT JOIN LATERAL (
+                SELECT
+                    COUNT(DISTINCT m.user_id) as member_count,
+                    COUNT(DISTINCT m.user_id) FILTER (WHERE m.is_deleted = FALSE) as active_members
+                FROM members m
+                WHERE m.chat_id = g.chat_id
+            ) mem ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT
+                    COUNT(DISTINCT ml.user_id) as users_with_messages,
+                    COUNT(*) as total_messages
+                FROM message_logs ml
+                WHERE ml.chat_id = g.chat_id
+            ) tot ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT
+                    COALESCE(SUM(c.n) FILTER (WHERE w.span = INTERVAL '24 hours'), 0)::bigint as messages_24h,
+                    COALESCE(SUM(c.n) FILTER (WHERE w.span = INTERVAL '7 days'), 0)::bigint as messages_7d,
+                    COALESCE(SUM(c.n) FILTER (WHERE w.span = INTERVAL '30 days'), 0)::bigint as messages_30d
+                FROM (VALUES (INTERVAL '24 hours'), (INTERVAL '7 days'), (INTERVAL '30 days')) w(span)
+                CROSS JOIN LATERAL (
+                    -- volle Stunden-Buckets nach dem Fensterbeginn + die angebrochene erste Stunde
+                    -- exakt aus message_logs (Index-Range über höchstens eine Stunde)
+                    SELECT
+                        (SELECT COALESCE(SUM(h.cnt), 0) FROM rollup_msgs_hourly h
+                          WHERE h.chat_id = g.chat_id AND h.bucket > NOW() - w.span)
+                      + (SELECT COUNT(*) FROM message_logs ml
+                          WHERE ml.chat_id = g.chat_id
+                            AND ml.timestamp > NOW() - w.span
+                            AND ml.timestamp < date_trunc('hour', NOW() - w.span) + INTERVAL '1 hour') as n
+                ) c
+            ) win ON TRUE
+            ORDER BY win.messages_24h DESC
         """)
         
         # 2. TOKEN STATISTIKEN
-        token_stats = await fetch("""
-            SELECT
-                (SELECT COALESCE(SUM(points), 0)::numeric FROM rewards_pending) as total_pending,
-                (SELECT COALESCE(SUM(amount), 0)::numeric FROM rewards_claims WHERE status='paid') as total_paid,
-                (SELECT COALESCE(SUM(amount), 0)::numeric FROM rewards_claims WHERE status='pending') as total_pending_claims,
-                (SELECT COUNT(*) FROM rewards_pending WHERE points > 0) as holders,
-                (SELECT COUNT(*) FROM rewards_claims WHERE status='pending') as pending_claims_count,
-                (SELECT COUNT(*) FROM rewards_claims) as total_claims
+        # je Tabelle ein Scan (FILTER statt mehrfacher Scalar-SubSELECTs), per CROSS JOIN zusammengesetzt
+        token_stats_q = fetch("""
+            SELECT p.total_pending, c.total_paid, c.total_pending_claims,
+                   p.holders, c.pending_claims_count, c.total_claims
+            FROM (
+                SELECT COALESCE(SUM(points), 0)::float8 as total_pending,
+                       COUNT(*) FILTER (WHERE points > 0) as holders
+                FROM rewards_pending
+            ) p
+            CROSS JOIN (
+                SELECT COALESCE(SUM(amount) FILTER (WHERE status='paid'), 0)::float8 as total_paid,
+                       COALESCE(SUM(amount) FILTER (WHERE status='pending'), 0)::float8 as total_pending_claims,
+                       COUNT(*) FILTER (WHERE status='pending') as pending_claims_count,
+                       COUNT(*) as total_claims
+                FROM rewards_claims
+            ) c
         """)
         
         # 3. AI MODERATION STATS
-        ai_stats = await fetch("""
-            SELECT
-                (SELECT COUNT(DISTINCT chat_id) FROM ai_mod_settings WHERE enabled=true) as ai_groups,
-                (SELECT COUNT(*) FROM ai_mod_logs WHERE ts > NOW() - INTERVAL '24 hours') as ai_24h,
-                (SELECT COUNT(*) FROM ai_mod_logs WHERE ts > NOW() - INTERVAL '7 days') as ai_7d,
-                (SELECT COUNT(*) FROM ai_mod_logs WHERE ts > NOW() - INTERVAL '30 days') as ai_30d,
-                (SELECT COUNT(DISTINCT category) FROM ai_mod_logs) as ai_categories,
-                (SELECT COUNT(*) FROM user_strike_events) as total_strikes,
-                (SELECT COUNT(*) FROM user_strike_events WHERE ts > NOW() - INTERVAL '24 hours') as strikes_24h
+        ai_stats_q = fetch("""
+            SELECT s.ai_groups, l.ai_24h, l.ai_7d, l.ai_30d, l.ai_categories,
+                   st.total_strikes, st.strikes_24h
+            FROM (SELECT COUNT(DISTINCT chat_id) as ai_groups FROM ai_mod_settings WHERE enabled=true) s
+            CROSS JOIN (
+                SELECT COUNT(*) FILTER (WHERE ts > NOW() - INTERVAL '24 hours') as ai_24h,
+                       COUNT(*) FILTER (WHERE ts > NOW() - INTERVAL '7 days') as ai_7d,
+                       COUNT(*) FILTER (WHERE ts > NOW() - INTERVAL '30 days') as ai_30d,
+                       COUNT(DISTINCT category) as ai_categories
+                FROM ai_mod_logs
+            ) l
+            CROSS JOIN (
+                SELECT COUNT(*) as total_strikes,
+                       COUNT(*) FILTER (WHERE ts > NOW() - INTERVAL '24 hours') as strikes_24h
+                FROM user_strike_events
+            ) st
         """)
         
         # 4. USER ENGAGEMENT
-        user_stats = await fetch("""
+        # ein Scan über message_logs; Ø Nachrichten/User als Quotient statt AVG über ein zweites GROUP BY
+        user_stats_q = fetch("""
             SELECT
                 COUNT(DISTINCT user_id) as total_users,
-                COUNT(DISTINCT CASE WHEN timestamp > NOW() - INTERVAL '1 day' THEN user_id END) as active_24h,
-                COUNT(DISTINCT CASE WHEN timestamp > NOW() - INTERVAL '7 days' THEN user_id END) as active_7d,
-                COUNT(DISTINCT CASE WHEN timestamp > NOW() - INTERVAL '30 days' THEN user_id END) as active_30d,
+                COUNT(DISTINCT user_id) FILTER (WHERE timestamp > NOW() - INTERVAL '1 day') as active_24h,
+                COUNT(DISTINCT user_id) FILTER (WHERE timestamp > NOW() - INTERVAL '7 days') as active_7d,
+                COUNT(DISTINCT user_id) FILTER (WHERE timestamp > NOW() - INTERVAL '30 days') as active_30d,
                 COUNT(*) as total_messages,
-                ROUND(AVG(CAST(cnt AS numeric)), 2) as avg_messages_per_user
-            FROM (
-                SELECT user_id, COUNT(*) as cnt FROM message_logs GROUP BY user_id
-            ) sub
+                COALESCE(ROUND(COUNT(*)::numeric / NULLIF(COUNT(DISTINCT user_id), 0), 2), 0)::float8 as avg_messages_per_user
+            FROM message_logs
         """)
         
-        # 5. TOP USERS
-        top_users = await fetch("""
+        # 5. TOP USERS (Spalten wie im Response, Rang aus ROW_NUMBER)
+        top_users_q = fetch("""
             SELECT
+                ROW_NUMBER() OVER (ORDER BY COUNT(*) DESC, user_id) as rank,
                 user_id,
-                COUNT(*) as message_count,
+                COUNT(*) as messages,
                 COUNT(DISTINCT chat_id) as groups_active,
-                MAX(timestamp) as last_message,
-                MIN(timestamp) as first_message
+                MIN(timestamp) as first_message,
+                MAX(timestamp) as last_message
             FROM message_logs
             GROUP BY user_id
-            ORDER BY message_count DESC
+            ORDER BY rank
             LIMIT 50
         """)
         
-        # 6. TOP TALKERS PER GROUP
-        top_talkers = await fetch("""
+        # 6. TOP TALKERS PER GROUP: Top 10 je Gruppe per LATERAL (Index chat_id, user_id),
+        # als fertige JSON-Liste pro Gruppe statt aller (chat_id, user_id)-Paare
+        top_talkers_q = fetch("""
             SELECT
-                chat_id,
-                user_id,
-                COUNT(*) as messages
-            FROM message_logs
-            GROUP BY chat_id, user_id
-            ORDER BY chat_id, messages DESC
+                g.chat_id,
+                json_agg(json_build_object('user_id', t.user_id, 'messages', t.messages)
+                         ORDER BY t.messages DESC) as talkers
+            FROM groups g
+            CROSS JOIN LATERAL (
+                SELECT user_id, COUNT(*) as messages
+                FROM message_logs ml
+                WHERE ml.chat_id = g.chat_id AND ml.user_id IS NOT NULL
+                GROUP BY user_id
+                ORDER BY messages DESC
+                LIMIT 10
+            ) t
+            GROUP BY g.chat_id
         """)
         
         # 7. AI MODERATION BY CATEGORY
-        ai_by_category = await fetch("""
+        ai_by_category_q = fetch("""
             SELECT
                 category,
                 COUNT(*) as count,
-                COUNT(CASE WHEN action='delete' THEN 1 END) as deleted,
-                COUNT(CASE WHEN action='warn' THEN 1 END) as warned,
-                ROUND(AVG(score)::numeric, 3) as avg_score
+                COUNT(*) FILTER (WHERE action='delete') as deleted,
+                COUNT(*) FILTER (WHERE action='warn') as warned,
+                COALESCE(ROUND(AVG(score)::numeric, 3), 0)::float8 as avg_score
             FROM ai_mod_logs
             GROUP BY category
             ORDER BY count DESC
         """)
         
         # 8. REWARDS DISTRIBUTION
-        top_holders = await fetch("""
+        top_holders_q = fetch("""
             SELECT
+                ROW_NUMBER() OVER (ORDER BY points DESC, user_id) as rank,
                 user_id,
-                points,
-                ROUND((100.0 * points / NULLIF((SELECT SUM(points) FROM rewards_pending), 0))::numeric, 2) as percentage
-            FROM rewards_pending
+                points::float8 as balance,
+                COALESCE(ROUND((100.0 * points / NULLIF(total_points, 0))::numeric, 2), 0)::float8 as percentage
+            FROM (
+                -- Gesamtsumme als Window im selben Scan (statt zweitem Scan per Subquery)
+                SELECT user_id, points, SUM(points) OVER () as total_points
+                FROM rewards_pending
+            ) rp
             WHERE points > 0
-            ORDER BY points DESC
+            ORDER BY rank
             LIMIT 50
         """)
         
-        # 9. MEMBER EVENTS
-        member_events = await fetch("""
+        # 9. MEMBER EVENTS: pro Gruppe fertiges {event_type: {count, last_event}}-Objekt
+        member_events_q = fetch("""
             SELECT
                 chat_id,
-                event_type,
-                COUNT(*) as count,
-                MAX(ts) as last_event
-            FROM member_events
-            GROUP BY chat_id, event_type
-            ORDER BY chat_id, event_type
+                json_object_agg(event_type, json_build_object('count', count, 'last_event', last_event)
+                                ORDER BY event_type) as events
+            FROM (
+                SELECT chat_id, event_type, COUNT(*) as count, MAX(ts) as last_event
+                FROM member_events
+                GROUP BY chat_id, event_type
+            ) e
+            GROUP BY chat_id
         """)
         
         # 10. TIME STATS
-        time_stats = await fetch("""
+        time_stats_q = fetch("""
             SELECT
-                EXTRACT(HOUR FROM timestamp AT TIME ZONE 'Europe/Berlin') as hour,
+                EXTRACT(HOUR FROM timestamp AT TIME ZONE 'Europe/Berlin')::int as hour,
                 COUNT(*) as messages,
                 COUNT(DISTINCT user_id) as users,
                 COUNT(DISTINCT chat_id) as groups
@@ -2795,138 +4112,89 @@ async def content_bot_complete_stats(request: web.Request):
             ORDER BY hour
         """)
         
-        # Parse token stats
-        t_row = token_stats[0] if token_stats else {'total_pending': 0, 'total_paid': 0, 'total_pending_claims': 0, 'holders': 0, 'pending_claims_count': 0, 'total_claims': 0}
-        a_row = ai_stats[0] if ai_stats else {'ai_groups': 0, 'ai_24h': 0, 'ai_7d': 0, 'ai_30d': 0, 'ai_categories': 0, 'total_strikes': 0, 'strikes_24h': 0}
-        u_row = user_stats[0] if user_stats else {'total_users': 0, 'active_24h': 0, 'active_7d': 0, 'active_30d': 0, 'total_messages': 0, 'avg_messages_per_user': 0}
-        
-        # Group talkers by chat_id
-        talkers_by_group = {}
-        for t in (top_talkers or []):
-            cid = int(t['chat_id'])
-            if cid not in talkers_by_group:
-                talkers_by_group[cid] = []
-            if len(talkers_by_group[cid]) < 10:  # Top 10 per group
-                talkers_by_group[cid].append({
-                    "user_id": int(t['user_id']),
-                    "messages": int(t['messages'])
-                })
-        
-        # Group events by chat_id
-        events_by_group = {}
-        for e in (member_events or []):
-            cid = int(e['chat_id'])
-            if cid not in events_by_group:
-                events_by_group[cid] = {}
-            events_by_group[cid][e['event_type']] = {
-                "count": int(e['count']),
-                "last_event": e['last_event'].isoformat() if e['last_event'] else None
-            }
+        # alle 10 Queries sind unabhängig -> parallel über den Pool
+        (groups_data, token_stats, ai_stats, user_stats, top_users, top_talkers,
+         ai_by_category, top_holders, member_events, time_stats) = await asyncio.gather(
+            groups_data_q, token_stats_q, ai_stats_q, user_stats_q, top_users_q, top_talkers_q,
+            ai_by_category_q, top_holders_q, member_events_q, time_stats_q
+        )
+
+        # Aggregat-SELECTs ohne GROUP BY liefern genau eine Zeile; Typen (bigint/float8) kommen
+        # schon passend aus SQL, orjson serialisiert sie direkt -> keine int()/float()-Kopien mehr
+        t_row, a_row, u_row = token_stats[0], ai_stats[0], user_stats[0]
+        
+        talkers_by_group = {t['chat_id']: t['talkers'] for t in top_talkers}
+        events_by_group = {e['chat_id']: e['events'] for e in member_events}
         
         # Build complete response
         stats = {
             "timestamp": int(time.time()),
             "summary": {
-                "total_groups": len(groups_data or []),
-                "total_users": int(u_row.get('total_users') or 0),
-                "total_messages": int(u_row.get('total_messages') or 0),
-                "total_ai_actions": int(a_row.get('ai_24h') + a_row.get('ai_7d') + a_row.get('ai_30d') or 0),
-                "total_token_distributed": float(t_row.get('total_paid') or 0),
-                "total_token_pending": float(t_row.get('total_pending') or 0),
+                "total_groups": len(groups_data),
+                "total_users": u_row['total_users'],
+                "total_messages": u_row['total_messages'],
+                "total_ai_actions": a_row['ai_24h'] + a_row['ai_7d'] + a_row['ai_30d'],
+                "total_token_distributed": t_row['total_paid'],
+                "total_token_pending": t_row['total_pending'],
             },
             "groups": [
                 {
-                    "chat_id": int(g['chat_id']),
+                    "chat_id": g['chat_id'],
                     "name": g['title'],
                     "stats": {
-                        "members": int(g['member_count'] or 0),
-                        "active_members": int(g['active_members'] or 0),
-                        "users_with_messages": int(g['users_with_messages'] or 0),
-                        "messages_total": int(g['total_messages'] or 0),
-                        "messages_24h": int(g['messages_24h'] or 0),
-                        "messages_7d": int(g['messages_7d'] or 0),
-                        "messages_30d": int(g['messages_30d'] or 0),
-                        "last_message": g['last_message'].isoformat() if g['last_message'] else None,
+                        "members": g['member_count'],
+                        "active_members": g['active_members'],
+                        "users_with_messages": g['users_with_messages'],
+                        "messages_total": g['total_messages'],
+                        "messages_24h": g['messages_24h'],
+                        "messages_7d": g['messages_7d'],
+                        "messages_30d": g['messages_30d'],
+                        "last_message": g['last_message'],
                     },
-                    "events": events_by_group.get(int(g['chat_id']), {}),
+                    "events": events_by_group.get(g['chat_id'], {}),
                     "ai_moderation": {
-                        "enabled": bool(g['ai_enabled']),
-                        "actions": int(g['ai_actions'] or 0),
+                        "enabled": g['ai_enabled'],
+                        "actions": g['ai_actions'],
                     },
-                    "rss_feeds": int(g['rss_feeds'] or 0),
-                    "top_talkers": talkers_by_group.get(int(g['chat_id']), [])
+                    "rss_feeds": g['rss_feeds'],
+                    "top_talkers": talkers_by_group.get(g['chat_id'], [])
                 }
-                for g in (groups_data or [])
+                for g in groups_data
             ],
             "tokens": {
-                "total_pending": float(t_row.get('total_pending') or 0),
-                "total_claimed": float(t_row.get('total_paid') or 0),
-                "pending_claims_amount": float(t_row.get('total_pending_claims') or 0),
-                "holders": int(t_row.get('holders') or 0),
-                "pending_claims_count": int(t_row.get('pending_claims_count') or 0),
-                "total_claims_all_time": int(t_row.get('total_claims') or 0),
-                "top_holders": [
-                    {
-                        "rank": i+1,
-                        "user_id": int(h['user_id']),
-                        "balance": float(h['points'] or 0),
-                        "percentage": float(h['percentage'] or 0)
-                    }
-                    for i, h in enumerate(top_holders or [])
-                ]
+                "total_pending": t_row['total_pending'],
+                "total_claimed": t_row['total_paid'],
+                "pending_claims_amount": t_row['total_pending_claims'],
+                "holders": t_row['holders'],
+                "pending_claims_count": t_row['pending_claims_count'],
+                "total_claims_all_time": t_row['total_claims'],
+                "top_holders": top_holders
             },
             "ai_moderation": {
-                "enabled_groups": int(a_row.get('ai_groups') or 0),
-                "actions_24h": int(a_row.get('ai_24h') or 0),
-                "actions_7d": int(a_row.get('ai_7d') or 0),
-                "actions_30d": int(a_row.get('ai_30d') or 0),
-                "categories": int(a_row.get('ai_categories') or 0),
-                "total_strikes": int(a_row.get('total_strikes') or 0),
-                "strikes_24h": int(a_row.get('strikes_24h') or 0),
-                "by_category": [
-                    {
-                        "category": c['category'],
-                        "count": int(c['count']),
-                        "deleted": int(c['deleted'] or 0),
-                        "warned": int(c['warned'] or 0),
-                        "avg_score": float(c['avg_score'] or 0)
-                    }
-                    for c in (ai_by_category or [])
-                ]
+                "enabled_groups": a_row['ai_groups'],
+                "actions_24h": a_row['ai_24h'],
+                "actions_7d": a_row['ai_7d'],
+                "actions_30d": a_row['ai_30d'],
+                "categories": a_row['ai_categories'],
+                "total_strikes": a_row['total_strikes'],
+                "strikes_24h": a_row['strikes_24h'],
+                "by_category": ai_by_category
             },
             "users": {
-                "total": int(u_row.get('total_users') or 0),
-                "active_24h": int(u_row.get('active_24h') or 0),
-                "active_7d": int(u_row.get('active_7d') or 0),
-                "active_30d": int(u_row.get('active_30d') or 0),
-                "total_messages": int(u_row.get('total_messages') or 0),
-                "avg_messages_per_user": float(u_row.get('avg_messages_per_user') or 0),
-                "top_users": [
-                    {
-                        "rank": i+1,
-                        "user_id": int(u['user_id']),
-                        "messages": int(u['message_count']),
-                        "groups_active": int(u['groups_active'] or 0),
-                        "first_message": u['first_message'].isoformat() if u['first_message'] else None,
-                        "last_message": u['last_message'].isoformat() if u['last_message'] else None
-                    }
-                    for i, u in enumerate(top_users or [])
-                ]
+                "total": u_row['total_users'],
+                "active_24h": u_row['active_24h'],
+                "active_7d": u_row['active_7d'],
+                "active_30d": u_row['active_30d'],
+                "total_messages": u_row['total_messages'],
+                "avg_messages_per_user": u_row['avg_messages_per_user'],
+                "top_users": top_users
             },
-            "hourly_distribution": [
-                {
-                    "hour": int(t['hour']),
-                    "messages": int(t['messages']),
-                    "users": int(t['users']),
-                    "groups": int(t['groups'])
-                }
-                for t in (time_stats or [])
-            ]
+            "hourly_distribution": time_stats
         }
         
         return _json(stats, request)
     except Exception as e:
-        log.error("content_bot_complete_stats failed: %s", e, exc_info=True)
+        _log_exc("content_bot_complete_stats", e)
         return _json({"error": str(e)}, request, status=500)
 
 
@@ -2934,6 +4202,7 @@ async def content_bot_complete_stats(request: web.Request):
 # BOT-SPECIFIC STATISTICS ENDPOINTS
 # ============================================================================
 
+@_cached_json
 async def content_bot_rss_feeds(request: web.Request):
     """RSS Feeds from Content Bot - Display all active RSS subscriptions"""
     await _auth_user(request)
@@ -2974,7 +4243,7 @@ async def content_bot_rss_feeds(request: web.Request):
             "feeds": feed_data
         }, request)
     except Exception as e:
-        log.error("content_bot_rss_feeds failed: %s", e, exc_info=True)
+        _log_exc("content_bot_rss_feeds", e)
         return _json({"error": str(e)}, request, status=500)
 
 async def affiliate_bot_stats(request: web.Request):
@@ -3036,7 +4305,7 @@ async def affiliate_bot_stats(request: web.Request):
         }
         return _json(stats, request)
     except Exception as e:
-        log.error("affiliate_bot_stats failed: %s", e, exc_info=True)
+        _log_exc("affiliate_bot_stats", e)
         return _json({"error": str(e)}, request, status=500)
 
 
@@ -3112,7 +4381,7 @@ async def crossposter_bot_stats(request: web.Request):
         }
         return _json(stats, request)
     except Exception as e:
-        log.error("crossposter_bot_stats failed: %s", e, exc_info=True)
+        _log_exc("crossposter_bot_stats", e)
         return _json({"error": str(e)}, request, status=500)
 
 
@@ -3203,7 +4472,7 @@ async def dao_bot_stats(request: web.Request):
         }
         return _json(stats, request)
     except Exception as e:
-        log.error("dao_bot_stats failed: %s", e, exc_info=True)
+        _log_exc("dao_bot_stats", e)
         return _json({"error": str(e)}, request, status=500)
 
 
@@ -3292,7 +4561,7 @@ async def learning_bot_stats(request: web.Request):
         }
         return _json(stats, request)
     except Exception as e:
-        log.error("learning_bot_stats failed: %s", e, exc_info=True)
+        _log_exc("learning_bot_stats", e)
         return _json({"error": str(e)}, request, status=500)
 
 
@@ -3362,7 +4631,7 @@ async def support_bot_stats(request: web.Request):
         }
         return _json(stats, request)
     except Exception as e:
-        log.error("support_bot_stats failed: %s", e, exc_info=True)
+        _log_exc("support_bot_stats", e)
         return _json({"error": str(e)}, request, status=500)
 
 
@@ -3439,7 +4708,7 @@ async def trade_api_bot_stats(request: web.Request):
         }
         return _json(stats, request)
     except Exception as e:
-        log.error("trade_api_bot_stats failed: %s", e, exc_info=True)
+        _log_exc("trade_api_bot_stats", e)
         return _json({"error": str(e)}, request, status=500)
 
 
@@ -3524,102 +4793,128 @@ async def trade_dex_bot_stats(request: web.Request):
         }
         return _json(stats, request)
     except Exception as e:
-        log.error("trade_dex_bot_stats failed: %s", e, exc_info=True)
+        _log_exc("trade_dex_bot_stats", e)
         return _json({"error": str(e)}, request, status=500)
 
 
-def register_devdash_routes(app: web.Application):
-    # Doppelte Registrierung verhindern (Heroku Reloads, mehrfacher Aufruf)
-    if app.get("_devdash_routes_registered"):
-        return
-    app["_devdash_routes_registered"] = True
-
-    # WICHTIG: add_route("GET", ...) statt add_get(), damit kein automatisches HEAD registriert wird
+# Route-Tabelle, einmal per add_routes() registriert.
+# web.route("GET", ...) statt web.get(), damit kein automatisches HEAD registriert wird.
+# OPTIONS/Preflight beantwortet cors_middleware, dafür braucht es keine Catch-all-Routes.
+DEVDASH_ROUTES = [
     # Routes unter /api/devdash (nicht nur /devdash)
-    app.router.add_route("GET",  "/api/devdash/healthz",              healthz)
-    app.router.add_route("GET",  "/api/devdash/auth/check",           auth_check)
-    app.router.add_post(        "/api/devdash/dev-login",             dev_login)
-    app.router.add_post(        "/api/devdash/auth/telegram",         auth_telegram)
-    app.router.add_post(        "/api/devdash/auth/ton-wallet",       auth_ton_wallet)
-    app.router.add_post(        "/api/devdash/auth/near-wallet",      auth_near_wallet)
-    app.router.add_route("GET", "/api/devdash/me",                    me)
-    
+    web.route("GET",    "/api/devdash/healthz",                     healthz),
+    web.route("GET",    "/api/devdash/auth/check",                  auth_check),
+    web.route("POST",   "/api/devdash/dev-login",                   dev_login),
+    web.route("POST",   "/api/devdash/auth/telegram",               auth_telegram),
+    web.route("POST",   "/api/devdash/auth/ton-wallet",             auth_ton_wallet),
+    web.route("POST",   "/api/devdash/auth/near-wallet",            auth_near_wallet),
+    web.route("POST",   "/api/devdash/auth/refresh",                auth_refresh),
+    web.route("GET",    "/api/devdash/me",                          me),
+
     # Metrics
-    app.router.add_route("GET", "/api/devdash/metrics/overview",      metrics_overview)
-    app.router.add_route("GET", "/api/devdash/metrics/timeseries",    metrics_timeseries)
-    app.router.add_route("GET", "/api/devdash/monitoring",            monitoring_data)
-    
+    web.route("GET",    "/api/devdash/metrics/overview",            metrics_overview),
+    web.route("GET",    "/api/devdash/metrics/timeseries",          metrics_timeseries),
+    web.route("GET",    "/api/devdash/monitoring",                  monitoring_data),
+
     # Bots
-    app.router.add_route("GET", "/api/devdash/bots",                  bots_list)
-    app.router.add_post(        "/api/devdash/bots",                  bots_add)
-    app.router.add_post(        "/api/devdash/bots/refresh",          bots_refresh)
-    app.router.add_route("GET", "/api/devdash/bots/metrics",          bot_metrics)
-    app.router.add_route("GET", "/api/devdash/bots/endpoints",        bot_endpoints)
-    
+    web.route("GET",    "/api/devdash/bots",                        bots_list),
+    web.route("POST",   "/api/devdash/bots",                        bots_add),
+    web.route("POST",   "/api/devdash/bots/refresh",                bots_refresh),
+    web.route("GET",    "/api/devdash/bots/metrics",                bot_metrics),
+    web.route("GET",    "/api/devdash/bots/endpoints",              bot_endpoints),
+
     # Content Bot Stats
-    app.router.add_route("GET", "/api/devdash/content/stats/overview",        content_bot_stats_overview)
-    app.router.add_route("GET", "/api/devdash/content/stats/groups",          content_bot_groups_stats)
-    app.router.add_route("GET", "/api/devdash/content/stats/claimed",         content_bot_claimed_stats)
-    app.router.add_route("GET", "/api/devdash/content/stats/story-share",     content_bot_story_share_stats)
-    app.router.add_route("GET", "/api/devdash/content/stats/ai-moderation",   content_bot_ai_moderation_stats)
-    app.router.add_route("GET", "/api/devdash/content/stats/retention",       content_bot_user_retention)
-    app.router.add_route("GET", "/api/devdash/content/stats/network",         content_bot_network_analysis)
-    app.router.add_route("GET", "/api/devdash/content/stats/complete",        content_bot_complete_stats)
-    app.router.add_route("GET", "/api/devdash/content/rss",                   content_bot_rss_feeds)
-    
+    web.route("GET",    "/api/devdash/content/stats/overview",      content_bot_stats_overview),
+    web.route("GET",    "/api/devdash/content/stats/groups",        content_bot_groups_stats),
+    web.route("GET",    "/api/devdash/content/stats/claimed",       content_bot_claimed_stats),
+    web.route("GET",    "/api/devdash/content/stats/story-share",   content_bot_story_share_stats),
+    web.route("GET",    "/api/devdash/content/stats/ai-moderation", content_bot_ai_moderation_stats),
+    web.route("GET",    "/api/devdash/content/stats/retention",     content_bot_user_retention),
+    web.route("GET",    "/api/devdash/content/stats/network",       content_bot_network_analysis),
+    web.route("GET",    "/api/devdash/content/stats/complete",      content_bot_complete_stats),
+    web.route("GET",    "/api/devdash/content/stats/all",           content_bot_stats_all),
+    web.route("GET",    "/api/devdash/content/rss",                 content_bot_rss_feeds),
+
     # Bot-specific Stats Endpoints (7 bots)
-    app.router.add_route("GET", "/api/devdash/bots/affiliate/stats",     affiliate_bot_stats)
-    app.router.add_route("GET", "/api/devdash/bots/crossposter/stats",   crossposter_bot_stats)
-    app.router.add_route("GET", "/api/devdash/bots/dao/stats",           dao_bot_stats)
-    app.router.add_route("GET", "/api/devdash/bots/learning/stats",      learning_bot_stats)
-    app.router.add_route("GET", "/api/devdash/bots/support/stats",       support_bot_stats)
-    app.router.add_route("GET", "/api/devdash/bots/trade_api/stats",     trade_api_bot_stats)
-    app.router.add_route("GET", "/api/devdash/bots/trade_dex/stats",     trade_dex_bot_stats)
-    
+    web.route("GET",    "/api/devdash/bots/affiliate/stats",        affiliate_bot_stats),
+    web.route("GET",    "/api/devdash/bots/crossposter/stats",      crossposter_bot_stats),
+    web.route("GET",    "/api/devdash/bots/dao/stats",              dao_bot_stats),
+    web.route("GET",    "/api/devdash/bots/learning/stats",         learning_bot_stats),
+    web.route("GET",    "/api/devdash/bots/support/stats",          support_bot_stats),
+    web.route("GET",    "/api/devdash/bots/trade_api/stats",        trade_api_bot_stats),
+    web.route("GET",    "/api/devdash/bots/trade_dex/stats",        trade_dex_bot_stats),
+
     # Token Events
-    app.router.add_route("GET", "/api/devdash/token-events",          token_events_list)
-    app.router.add_post(        "/api/devdash/token-events",          token_events_create)
-    
+    web.route("GET",    "/api/devdash/token-events",                token_events_list),
+    web.route("POST",   "/api/devdash/token-events",                token_events_create),
+
     # User Management
-    app.router.add_route("GET", "/api/devdash/users",                 user_list)
-    app.router.add_post(        "/api/devdash/users/tier",            user_update_tier)
-    
+    web.route("GET",    "/api/devdash/users",                       user_list),
+    web.route("POST",   "/api/devdash/users/tier",                  user_update_tier),
+
     # Wallets & Payments
-    app.router.add_post(        "/api/devdash/wallets/ton",           set_ton_address)
-    app.router.add_route("GET", "/api/devdash/ton/payments",          ton_payments)
-    app.router.add_route("GET", "/api/devdash/wallets",               wallets_overview)
-    
+    web.route("POST",   "/api/devdash/wallets/ton",                 set_ton_address),
+    web.route("GET",    "/api/devdash/ton/payments",                ton_payments),
+    web.route("GET",    "/api/devdash/wallets",                     wallets_overview),
+
     # Mesh
-    app.router.add_route("GET", "/api/devdash/mesh/health",         mesh_health)
-    app.router.add_route("GET", "/api/devdash/mesh/metrics",        mesh_metrics)
-    
+    web.route("GET",    "/api/devdash/mesh/health",                 mesh_health),
+    web.route("GET",    "/api/devdash/mesh/metrics",                mesh_metrics),
+
     # System Endpoints
-    app.router.add_route("GET", "/api/system/health",                system_health)
-    app.router.add_route("GET", "/api/system/logs",                  system_logs)
-    app.router.add_route("GET", "/api/token/emrd",                   token_emrd_info)
-    app.router.add_route("GET", "/api/devdash/token/emrd-info",      token_emrd_info)
-    app.router.add_route("GET", "/api/devdash/ads",                  ads_list)
-    app.router.add_post(        "/api/devdash/ads",                  ads_create)
-    app.router.add_delete(      "/api/devdash/ads/{id}",             ads_delete)
-    app.router.add_put(         "/api/devdash/ads/{id}",             ads_update)
-    
+    web.route("GET",    "/api/system/health",                       system_health),
+    web.route("GET",    "/api/system/logs",                         system_logs),
+    web.route("GET",    "/api/token/emrd",                          token_emrd_info),
+    web.route("GET",    "/api/devdash/token/emrd-info",             token_emrd_info),
+    web.route("GET",    "/api/devdash/ads",                         ads_list),
+    web.route("POST",   "/api/devdash/ads",                         ads_create),
+    web.route("DELETE", "/api/devdash/ads/{id}",                    ads_delete),
+    web.route("PUT",    "/api/devdash/ads/{id}",                    ads_update),
+
     # Analytics Endpoints (under /api prefix)
-    app.router.add_route("GET", "/api/analytics/bot-activity",       bot_activity)
-    app.router.add_route("GET", "/api/analytics/bot-detailed",       bot_detailed_info)
-    app.router.add_route("GET", "/api/analytics/bot-details",        bot_details_overview)
-    app.router.add_route("GET", "/api/bot-groups",                   bot_groups)
-    app.router.add_route("GET", "/api/token/holders",                token_holders)
-    
-    # CORS - auch mit /api prefix
-    app.router.add_route("OPTIONS", "/api/devdash/{tail:.*}", options_handler)
-    app.router.add_route("OPTIONS", "/api/system/{tail:.*}", options_handler)
-    app.router.add_route("OPTIONS", "/api/token/{tail:.*}", options_handler)
-    app.router.add_route("OPTIONS", "/api/analytics/{tail:.*}", options_handler)
-    
+    web.route("GET",    "/api/analytics/bot-activity",              bot_activity),
+    web.route("GET",    "/api/analytics/bot-detailed",              bot_detailed_info),
+    web.route("GET",    "/api/analytics/bot-details",               bot_details_overview),
+    web.route("GET",    "/api/bot-groups",                          bot_groups),
+    web.route("GET",    "/api/token/holders",                       token_holders),
+
+    # Exports (Hintergrund-Jobs)
+    web.route("POST",   "/api/devdash/exports/users",               export_users_csv),
+    web.route("GET",    "/api/devdash/exports/{job_id}",            export_download),
+]
+
+
+def register_devdash_routes(app: web.Application):
+    # Doppelte Registrierung verhindern (Heroku Reloads, mehrfacher Aufruf)
+    if app.get("_devdash_routes_registered"):
+        return
+    app["_devdash_routes_registered"] = True
+
+    app.on_startup.append(_open_pool)
+    app.on_startup.append(_open_http)
+    app.on_startup.append(_start_deferred_maintenance)
+    app.on_cleanup.append(_stop_deferred_maintenance)
+    app.on_startup.append(_start_bot_health_refresh)
+    app.on_cleanup.append(_stop_bot_health_refresh)
+    app.on_startup.append(_start_content_mv_refresh)
+    app.on_cleanup.append(_stop_content_mv_refresh)
+    app.on_startup.append(_start_sys_sampler)
+    app.on_cleanup.append(_stop_sys_sampler)
+    app.on_startup.append(_start_export_job_sweeper)
+    app.on_cleanup.append(_stop_export_jobs)
+    if PARTITION_LOGS:
+        app.on_startup.append(_start_partition_maintenance)
+        app.on_cleanup.append(_stop_partition_maintenance)
+    app.on_cleanup.append(_close_http)
+    app.on_cleanup.append(_close_pool)
+
+    app.add_routes(DEVDASH_ROUTES)
+
+
 # If you run this module standalone, boot a tiny aiohttp app for local testing
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    app = web.Application(middlewares=[cors_middleware])
+    app = web.Application(middlewares=[cors_middleware, auth_middleware])
     register_devdash_routes(app)
-    app.on_startup.append(ensure_tables)
+    app.on_startup.append(lambda _app: ensure_tables())
     web.run_app(app, port=int(os.getenv("PORT", 8080)))
\ No newline at end of file